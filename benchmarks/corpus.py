@@ -0,0 +1,112 @@
+# benchmarks/corpus.py
+"""
+基准测试谜题集，覆盖经典、困难、杀手、温度计和非连续数独以及不同尺寸的棋盘。
+"""
+
+from typing import Callable, NamedTuple
+from sudoku import *
+from utils import *
+
+
+class Benchmark(NamedTuple):
+    """一个基准测试谜题"""
+
+    name: str
+    # 紧凑格式的谜题字符串（0表示空格）
+    puzzle: str
+    # 创建规则列表的函数，每次运行都创建新的规则实例
+    rules: Callable[[], list[Rule]]
+    # 要测试的求解器配置，名称见CONFIGS
+    configs: tuple[str, ...] = ("backtracking",)
+
+
+def classic_rules() -> list[Rule]:
+    """经典数独规则"""
+    return [RowRule(), ColumnRule(), Normal9x9BlockRule()]
+
+
+def block_rules(box_rows: int, box_cols: int) -> Callable[[], list[Rule]]:
+    """任意矩形宫数独规则"""
+    return lambda: [RowRule(), ColumnRule(), BlockRule(box_rows, box_cols)]
+
+
+def latin_rules() -> list[Rule]:
+    """拉丁方规则（只有行列约束，支持任意尺寸）"""
+    return [RowRule(), ColumnRule()]
+
+
+def killer_rule() -> KillerRule:
+    """main.py中的杀手数独笼子"""
+    killer = KillerRule()
+    for cage_sum, cage in [
+        (30, [(0, 0), (0, 1), (1, 0), (1, 1), (1, 2), (2, 0)]), (6, [(0, 2), (0, 3)]), (3, [(0, 4)]),
+        (6, [(0, 5), (0, 6)]), (16, [(0, 7), (0, 8)]), (20, [(1, 3), (1, 4), (2, 4)]),
+        (18, [(1, 5), (1, 6), (2, 5), (2, 6)]), (9, [(1, 7), (2, 7)]), (10, [(1, 8), (2, 8)]),
+        (10, [(2, 1), (2, 2)]), (15, [(2, 3), (3, 3)]), (30, [(3, 0), (3, 1), (3, 2), (4, 0), (4, 1)]),
+        (23, [(3, 4), (4, 3), (4, 4), (4, 5)]), (4, [(3, 5), (3, 6)]), (9, [(3, 7), (3, 8)]),
+        (4, [(4, 2), (5, 2)]), (15, [(4, 6), (4, 7), (4, 8)]), (4, [(5, 0)]), (21, [(5, 1), (6, 1), (6, 2)]),
+        (7, [(5, 3), (5, 4)]), (21, [(5, 5), (5, 6), (6, 5)]), (13, [(5, 7), (5, 8), (6, 8)]),
+        (8, [(6, 0), (7, 0)]), (13, [(6, 3), (7, 3)]), (3, [(6, 4), (7, 4)]), (10, [(6, 6), (6, 7)]),
+        (6, [(7, 1), (7, 2)]), (11, [(7, 5), (7, 6)]), (13, [(7, 7), (8, 7)]), (11, [(7, 8), (8, 8)]),
+        (10, [(8, 0), (8, 1)]), (21, [(8, 2), (8, 3), (8, 4)]), (5, [(8, 5), (8, 6)]),
+    ]:
+        killer.set(cage_sum, cage)
+    return killer
+
+
+def thermometer_rule() -> ThermometerRule:
+    """main.py中的温度计"""
+    thermometer = ThermometerRule()
+    for thermometer_str in ["C1B1A1", "C2B2A2", "B8A8A9B9", "C9D9E9F9", "D4E4F4", "D5E5F5", "E7D7D8E8",
+                            "I8H8G8", "I9H9G9", "I3I2I1", "H4H3H2", "G3G2G1", "G3G4G5G6", "H4H5H6H7"]:
+        thermometer.set(parse_compact_thermometer(thermometer_str))
+    return thermometer
+
+
+# 求解器配置名称 -> 传给Solver的参数；plain配置关闭约束传播，用于衡量搜索与规则检查本身的速度
+CONFIGS = {
+    "backtracking": {},
+    "dlx": {"engine": "dlx"},
+    "cdcl": {"engine": "cdcl"},
+    "mrv-plain": {"propagation": False},
+    "first-empty-plain": {"propagation": False, "strategy": FirstEmptyStrategy},
+}
+
+EMPTY_9X9 = "0" * 81
+
+BENCHMARKS = [
+    Benchmark("classic-easy",
+              "530070000600195000098000060800060003400801006060000000000419005000080079000000000",
+              classic_rules, ("backtracking", "dlx")),
+    # 17个提示数的谜题
+    Benchmark("classic-17-clue",
+              "000000010400000000020000000000050407008000300001090000300400200050100000000806000",
+              classic_rules, ("backtracking", "dlx", "mrv-plain")),
+    Benchmark("classic-inkala",
+              "800000000003600000070090200050007000000045700000100030001000068008500010090000400",
+              classic_rules, ("backtracking", "dlx", "cdcl", "mrv-plain", "first-empty-plain")),
+    # 专门针对按顺序回溯构造的谜题，第一行的解为987654321
+    Benchmark("classic-anti-backtracking",
+              "000000000000003085001020000000507000004000100090000000500000073002010000000040009",
+              classic_rules, ("backtracking", "dlx", "cdcl", "mrv-plain")),
+    Benchmark("killer-main",
+              "000102070034090100009000508020070340800309026070050090008007010340015087000000000",
+              lambda: classic_rules() + [killer_rule()], ("backtracking", "cdcl", "mrv-plain")),
+    Benchmark("killer-no-givens", EMPTY_9X9, lambda: classic_rules() + [killer_rule()], ("backtracking", "cdcl")),
+    Benchmark("thermometer-non-consecutive", EMPTY_9X9,
+              lambda: classic_rules() + [NonConsecutiveRule(), thermometer_rule()], ("backtracking", "cdcl")),
+    # 只有温度计或只有非连续约束、带提示数的谜题，解唯一
+    Benchmark("thermometer-clued",
+              "000000805000000006000000000000008030000000000000000000000000009400000000000800000",
+              lambda: classic_rules() + [thermometer_rule()], ("backtracking", "cdcl")),
+    Benchmark("non-consecutive-clued",
+              "000000009000400700000000000000006000000000000000000000000500000900000000700000000",
+              lambda: classic_rules() + [NonConsecutiveRule()], ("backtracking", "cdcl")),
+    Benchmark("blocks-6x6", "0" * 36, block_rules(2, 3), ("backtracking", "dlx")),
+    Benchmark("blocks-12x12", "0" * 144, block_rules(3, 4), ("backtracking", "dlx")),
+    Benchmark("blocks-16x16", "0" * 256, block_rules(4, 4), ("backtracking", "dlx")),
+    Benchmark("blocks-25x25", "0" * 625, block_rules(5, 5), ("backtracking", "dlx")),
+    Benchmark("latin-4x4", "1000000000000000", latin_rules, ("backtracking", "dlx")),
+    Benchmark("latin-16x16", "0" * 256, latin_rules, ("backtracking", "dlx")),
+    Benchmark("latin-25x25", "0" * 625, latin_rules, ("backtracking",)),
+]
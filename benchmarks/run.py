@@ -0,0 +1,210 @@
+# benchmarks/run.py
+"""
+基准测试运行器：对每个谜题和求解器配置统计步数、每秒步数、耗时和峰值内存，
+结果写入JSON文件，并与保存的基线比较：求解结果或步数退化时以非零状态退出。
+耗时和峰值内存受机器和负载影响，只作为提示输出；在生成基线的同一台机器上比较时可以加--strict-timing。
+
+用法（在仓库根目录运行）：
+    python benchmarks/run.py                     # 运行并与baseline.json比较
+    python benchmarks/run.py --update-baseline   # 运行并更新基线
+    python benchmarks/run.py --filter killer     # 只运行名称包含killer的谜题
+    python benchmarks/run.py --strict-timing     # 耗时和峰值内存退化也视为失败
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Optional
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCHMARK_DIR), "src"))
+sys.path.insert(0, BENCHMARK_DIR)
+
+from sudoku import Board, Solver
+from utils import parse_compact_puzzle
+from corpus import BENCHMARKS, CONFIGS, Benchmark
+
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCHMARK_DIR, "results.json")
+
+
+def solve_once(benchmark: Benchmark, config: str) -> tuple[Solver, bool, float]:
+    """
+    求解一次谜题并计时（规则与棋盘的构建也计入耗时）
+
+    Args:
+        benchmark: 基准测试谜题
+        config: 求解器配置名称
+
+    Returns:
+        (求解器, 是否有解, 耗时秒数)
+    """
+    start = time.perf_counter()
+    puzzle = parse_compact_puzzle(benchmark.puzzle)
+    board = Board(int(len(puzzle) ** 0.5))
+    board.load_puzzle(puzzle)
+    options = dict(CONFIGS[config])
+    if "strategy" in options:
+        options["strategy"] = options["strategy"]()
+    solver = Solver(board, *benchmark.rules(), **options)
+    solved = solver.solve()
+    return solver, solved, time.perf_counter() - start
+
+
+def run_benchmark(benchmark: Benchmark, config: str, repeat: int) -> dict:
+    """
+    运行一个基准测试：耗时取repeat次中的最小值，峰值内存在单独一次运行中用tracemalloc测量
+
+    Args:
+        benchmark: 基准测试谜题
+        config: 求解器配置名称
+        repeat: 计时重复次数
+
+    Returns:
+        结果字典
+    """
+    wall = float("inf")
+    for _ in range(repeat):
+        solver, solved, elapsed = solve_once(benchmark, config)
+        wall = min(wall, elapsed)
+
+    # tracemalloc会显著减慢运行，因此不与计时混在一起
+    tracemalloc.start()
+    solve_once(benchmark, config)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "solved": solved,
+        "steps": solver.steps,
+        "wall_time": wall,
+        "steps_per_sec": solver.steps / wall if wall > 0 else 0.0,
+        "peak_memory_kib": peak / 1024,
+    }
+
+
+# 确定性指标：与机器无关，退化时判定失败
+GATED_METRICS = ("steps",)
+# 与机器和负载相关的指标：默认只作为提示
+ADVISORY_METRICS = ("wall_time", "peak_memory_kib")
+
+
+def _growth(key: str, metric: str, old: float, new: float, threshold: float) -> Optional[str]:
+    """
+    检查一项指标是否比基线增加超过threshold比例
+
+    Args:
+        key: 基准测试名称
+        metric: 指标名称
+        old: 基线值
+        new: 本次值
+        threshold: 允许的增长比例
+
+    Returns:
+        退化描述，没有退化时为None
+    """
+    if new > old * (1 + threshold) and new - old > 1e-3:
+        growth = f"+{(new / old - 1) * 100:.1f}%" if old else "新增"
+        return f"{key}: {metric}从{old:.4g}增加到{new:.4g}（{growth}）"
+    return None
+
+
+def compare(results: dict, baseline: dict, threshold: float, time_threshold: float,
+            strict_timing: bool = False) -> tuple[list[str], list[str]]:
+    """
+    与基线比较：求解结果不同或步数增加超过threshold比例视为退化；
+    耗时或峰值内存增加超过time_threshold比例只作为提示，strict_timing为True时也视为退化
+
+    Args:
+        results: 本次结果
+        baseline: 基线结果
+        threshold: 步数允许的增长比例，例如0.25表示25%
+        time_threshold: 耗时和峰值内存允许的增长比例
+        strict_timing: 耗时和峰值内存的退化是否视为失败
+
+    Returns:
+        (退化描述列表, 提示描述列表)，没有时为空
+    """
+    regressions = []
+    warnings = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if result["solved"] != base["solved"]:
+            regressions.append(f"{key}: 求解结果从{base['solved']}变为{result['solved']}")
+        for metric in GATED_METRICS:
+            message = _growth(key, metric, base[metric], result[metric], threshold)
+            if message is not None:
+                regressions.append(message)
+        for metric in ADVISORY_METRICS:
+            message = _growth(key, metric, base[metric], result[metric], time_threshold)
+            if message is not None:
+                (regressions if strict_timing else warnings).append(message)
+    return regressions, warnings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="数独求解器基准测试")
+    parser.add_argument("--filter", default="", help="只运行名称包含该字符串的谜题")
+    parser.add_argument("--repeat", type=int, default=5, help="计时重复次数，取最小值")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="结果JSON文件路径")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基线JSON文件路径")
+    parser.add_argument("--threshold", type=float, default=0.25, help="步数允许的增长比例")
+    parser.add_argument("--time-threshold", type=float, default=0.25, help="耗时和峰值内存允许的增长比例")
+    parser.add_argument("--strict-timing", action="store_true",
+                        help="耗时和峰值内存的退化也视为失败（只在生成基线的同一台机器上使用）")
+    parser.add_argument("--update-baseline", action="store_true", help="用本次结果覆盖基线")
+    args = parser.parse_args()
+
+    results = {}
+    for benchmark in BENCHMARKS:
+        if args.filter not in benchmark.name:
+            continue
+        for config in benchmark.configs:
+            key = f"{benchmark.name}/{config}"
+            result = run_benchmark(benchmark, config, args.repeat)
+            results[key] = result
+            print(f"{key:45s} 步数={result['steps']:>8d} 耗时={result['wall_time'] * 1000:9.2f}ms "
+                  f"速率={result['steps_per_sec']:>10.0f}步/秒 峰值内存={result['peak_memory_kib']:9.1f}KiB")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n基线已更新: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n未找到基线文件: {args.baseline}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions, warnings = compare(results, baseline, args.threshold, args.time_threshold, args.strict_timing)
+    if warnings:
+        print("\n耗时或内存高于基线（受机器和负载影响，仅供参考）:")
+        for warning in warnings:
+            print(f"  {warning}")
+    if regressions:
+        print("\n发现性能退化:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("\n没有发现性能退化")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
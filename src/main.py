@@ -3,6 +3,7 @@
 数独求解器使用示例
 """
 
+from importlib.util import find_spec
 from sudoku import *
 from utils import *
 
@@ -94,8 +95,9 @@ def main():
     for therm_str in thermometer_strings:
         thermometer_rule.set(parse_compact_thermometer(therm_str))
 
-    # solver = Solver(board, row_rule, col_rule, block_rule, non_consecutive_rule, thermometer_rule)
-    solver = Solver(board, row_rule, col_rule, block_rule, killer_rule)
+    # 安装了tqdm时显示进度条，否则使用默认的静默报告
+    progress = TqdmReporter() if find_spec("tqdm") else None
+    solver = Solver(board, row_rule, col_rule, block_rule, killer_rule, progress=progress)
     print("\n开始求解...")
 
     solution = solver.get_solution()
@@ -1,22 +1,83 @@
 # src/sudoku/__init__.py
 """
 Sudoku Solver - 一个基于回溯算法的数独求解器
+
+公开接口在首次访问时才导入所在的模块（PEP 562），
+例如只使用Solver时不会导入批量求解依赖的进程池和异步求解依赖的asyncio
 """
 
-from .exceptions import SudokuError
-from .board import Board
-from .rules import *
-from .solver import Solver
-
-__all__ = [
-    'SudokuError',
-    'Board',
-    'Rule',
-    'Solver',
-    'RowRule',
-    'ColumnRule',
-    'Normal9x9BlockRule',
-    'NonConsecutiveRule',
-    'ThermometerRule',
-    'KillerRule',
-]
\ No newline at end of file
+from importlib import import_module
+
+# 公开名称 -> 所在模块
+_EXPORTS = {
+    'SudokuError': '.exceptions',
+    'Board': '.board',
+    'CandidateState': '.candidates',
+    'Rule': '.rules',
+    'Solver': '.solver',
+    'SolverStats': '.stats',
+    'RuleStats': '.stats',
+    'TranspositionTable': '.transposition',
+    'BatchResult': '.batch',
+    'solve_many': '.batch',
+    'ParallelResult': '.parallel',
+    'search_parallel': '.parallel',
+    'solve_parallel': '.parallel',
+    'count_solutions_parallel': '.parallel',
+    'SolutionCache': '.cache',
+    'Bundle': '.bundle',
+    'BundleFile': '.bundle',
+    'pack_bundles': '.bundle',
+    'write_bundles': '.bundle',
+    'SolveResult': '.aio',
+    'solve_async': '.aio',
+    'ProgressReporter': '.progress',
+    'TqdmReporter': '.progress',
+    'CallbackReporter': '.progress',
+    'BranchingStrategy': '.strategies',
+    'FirstEmptyStrategy': '.strategies',
+    'MRVStrategy': '.strategies',
+    'UnitTable': '.units',
+    'UnitRule': '.rules',
+    'RowRule': '.rules',
+    'ColumnRule': '.rules',
+    'BlockRule': '.rules',
+    'Normal9x9BlockRule': '.rules',
+    'RegionRule': '.rules',
+    'NonConsecutiveRule': '.rules',
+    'ThermometerRule': '.rules',
+    'KillerRule': '.rules',
+}
+
+# 在模块中的名称与公开名称不同的接口
+_RENAMED = {
+    'solve_async': 'solve',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """
+    首次访问公开接口时导入所在的模块，并缓存到包的命名空间中
+
+    Args:
+        name: 接口名称
+
+    Returns:
+        接口对象
+
+    Raises:
+        AttributeError: 如果名称不是公开接口
+    """
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), _RENAMED.get(name, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """返回包的属性和尚未导入的公开接口"""
+    return sorted(set(globals()) | set(__all__))
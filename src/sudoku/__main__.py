@@ -0,0 +1,10 @@
+# src/sudoku/__main__.py
+"""
+命令行入口：python -m sudoku solve ...
+"""
+
+import sys
+from .cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
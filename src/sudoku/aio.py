@@ -0,0 +1,255 @@
+# src/sudoku/aio.py
+"""
+异步求解模块，在线程池或进程池中分段运行搜索，支持asyncio取消、超时和步数上限，并合并同一谜题的并发请求。
+"""
+
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import NamedTuple, Optional
+from .board import Board
+from .rules import Rule
+from .solver import Solver
+
+# 每段搜索最多尝试放置的次数，决定检查超时和取消的粒度
+SLICE_STEPS = 256
+
+TIMEOUT = "timeout"
+MAX_STEPS = "max_steps"
+
+
+class SolveResult(NamedTuple):
+    """异步求解结果"""
+
+    # 求解后的棋盘，无解或放弃时为None
+    solution: Optional[Board]
+    steps: int
+    elapsed: float
+    # 因超时放弃为"timeout"，因步数达到上限放弃为"max_steps"，搜索正常结束为None
+    gave_up: Optional[str] = None
+
+
+def _give_up_reason(solver: Solver, deadline: Optional[float], max_steps: Optional[int]) -> Optional[str]:
+    """
+    检查是否达到限制
+
+    Args:
+        solver: 求解器
+        deadline: time.perf_counter()的截止时间，None表示不限制
+        max_steps: 最多尝试放置的次数，None表示不限制
+
+    Returns:
+        放弃的原因，未达到限制时返回None
+    """
+    if max_steps is not None and solver.steps >= max_steps:
+        return MAX_STEPS
+    if deadline is not None and time.perf_counter() >= deadline:
+        return TIMEOUT
+    return None
+
+
+def _slice_budget(solver: Solver, max_steps: Optional[int], slice_steps: int) -> int:
+    """
+    计算下一段搜索的预算，不超过剩余的步数
+
+    Args:
+        solver: 求解器
+        max_steps: 最多尝试放置的次数，None表示不限制
+        slice_steps: 每段搜索最多尝试放置的次数
+
+    Returns:
+        本段最多尝试放置的次数
+    """
+    if max_steps is None:
+        return slice_steps
+    return min(slice_steps, max_steps - solver.steps)
+
+
+def _result(solver: Solver, outcome: Optional[bool], start: float, gave_up: Optional[str] = None) -> SolveResult:
+    """
+    构造求解结果
+
+    Args:
+        solver: 求解器
+        outcome: 搜索结果
+        start: 开始时的time.perf_counter()
+        gave_up: 放弃的原因
+
+    Returns:
+        求解结果
+    """
+    solution = solver.board.copy() if outcome else None
+    return SolveResult(solution, solver.steps, time.perf_counter() - start, gave_up)
+
+
+def _solve_limited(board: Board, rules: tuple, options: dict, timeout: Optional[float],
+                   max_steps: Optional[int], slice_steps: int) -> SolveResult:
+    """
+    在进程池的工作进程中分段求解，每段之间检查限制
+
+    Args:
+        board: 要求解的棋盘
+        rules: 规则
+        options: 传给Solver的其他参数
+        timeout: 超时秒数，从工作进程开始求解时计时
+        max_steps: 最多尝试放置的次数
+        slice_steps: 每段搜索最多尝试放置的次数
+
+    Returns:
+        求解结果
+    """
+    start = time.perf_counter()
+    deadline = None if timeout is None else start + timeout
+    solver = Solver(board, *rules, **options)
+    while True:
+        gave_up = _give_up_reason(solver, deadline, max_steps)
+        if gave_up is not None:
+            return _result(solver, None, start, gave_up)
+        outcome = solver.run(_slice_budget(solver, max_steps, slice_steps))
+        if outcome is not None:
+            return _result(solver, outcome, start)
+
+
+async def _solve(board: Board, rules: tuple, options: dict, timeout: Optional[float], max_steps: Optional[int],
+                 executor: Optional[Executor], slice_steps: int) -> SolveResult:
+    """
+    求解单个谜题，不合并请求
+
+    使用线程池时求解器保存在当前进程中，每段搜索之间回到事件循环检查限制，取消时不再提交下一段；
+    使用进程池时整个求解在工作进程中完成，限制由工作进程检查
+
+    Args:
+        board: 要求解的棋盘
+        rules: 规则
+        options: 传给Solver的其他参数
+        timeout: 超时秒数
+        max_steps: 最多尝试放置的次数
+        executor: 执行器，None表示事件循环默认的线程池
+        slice_steps: 每段搜索最多尝试放置的次数
+
+    Returns:
+        求解结果
+    """
+    loop = asyncio.get_running_loop()
+    if isinstance(executor, ProcessPoolExecutor):
+        return await loop.run_in_executor(
+            executor, _solve_limited, board, rules, options, timeout, max_steps, slice_steps)
+
+    start = time.perf_counter()
+    deadline = None if timeout is None else start + timeout
+    solver = await loop.run_in_executor(executor, partial(Solver, board, *rules, **options))
+    while True:
+        gave_up = _give_up_reason(solver, deadline, max_steps)
+        if gave_up is not None:
+            return _result(solver, None, start, gave_up)
+        outcome = await loop.run_in_executor(executor, solver.run, _slice_budget(solver, max_steps, slice_steps))
+        if outcome is not None:
+            return _result(solver, outcome, start)
+
+
+class _Shared:
+    """正在进行的一次求解及等待它的请求数"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+# (事件循环, 执行器, 请求键) -> 正在进行的求解
+_inflight: dict[tuple, _Shared] = {}
+
+
+def _forget(key: tuple, shared: _Shared, *_) -> None:
+    """
+    求解结束或被取消时移除记录（只移除仍指向该次求解的记录）
+
+    Args:
+        key: (事件循环, 执行器, 请求键)
+        shared: 要移除的求解
+    """
+    if _inflight.get(key) is shared:
+        del _inflight[key]
+
+
+def _request_key(board: Board, rules: tuple, options: dict, timeout: Optional[float],
+                 max_steps: Optional[int]) -> Optional[tuple]:
+    """
+    计算用于合并并发请求的键
+
+    Args:
+        board: 要求解的棋盘
+        rules: 规则
+        options: 传给Solver的其他参数
+        timeout: 超时秒数
+        max_steps: 最多尝试放置的次数
+
+    Returns:
+        请求键，规则没有cache_key或参数不可哈希时返回None（不合并）
+    """
+    rule_keys = tuple(rule.cache_key() for rule in rules)
+    if None in rule_keys:
+        return None
+    option_items = tuple(sorted(options.items()))
+    try:
+        hash(option_items)
+    except TypeError:
+        return None
+    return board.size, board.to_bytes(), rule_keys, option_items, timeout, max_steps
+
+
+async def solve(board: Board, *rules: Rule, timeout: Optional[float] = None, max_steps: Optional[int] = None,
+                executor: Optional[Executor] = None, slice_steps: int = SLICE_STEPS, **options) -> SolveResult:
+    """
+    异步求解谜题
+
+    达到超时或步数上限时返回gave_up不为None的结果，而不是抛出异常。
+    相同谜题、规则和参数且使用同一执行器的并发请求合并为一次求解；某个请求被取消不影响其他请求，
+    所有请求都取消后停止求解。使用线程池时至多再运行一段搜索；使用进程池时正在运行的求解只在达到自身限制时停止，
+    因此应同时指定timeout或max_steps。
+    DLX引擎一次运行到结束，不受超时和步数上限约束
+
+    Args:
+        board: 要求解的棋盘
+        *rules: 规则
+        timeout: 超时秒数，None表示不限制
+        max_steps: 最多尝试放置的次数，None表示不限制
+        executor: 线程池或进程池，默认使用事件循环的默认线程池
+        slice_steps: 每段搜索最多尝试放置的次数，决定检查超时和取消的粒度
+        **options: 传给Solver的其他参数
+
+    Returns:
+        求解结果
+
+    Raises:
+        SudokuError: 如果棋盘与任何规则不兼容
+        asyncio.CancelledError: 如果本请求被取消
+    """
+    # 求解器在执行器中创建，先复制棋盘以免调用方在此期间修改
+    board = board.copy()
+    request = _request_key(board, rules, options, timeout, max_steps)
+    if request is None:
+        return await _solve(board, rules, options, timeout, max_steps, executor, slice_steps)
+
+    # 不同执行器的请求不合并：调用方指定执行器可能是为了隔离负载，合并后会在另一个执行器中运行
+    key = (asyncio.get_running_loop(), executor, request)
+    shared = _inflight.get(key)
+    if shared is None:
+        task = asyncio.ensure_future(_solve(board, rules, options, timeout, max_steps, executor, slice_steps))
+        shared = _inflight[key] = _Shared(task)
+        task.add_done_callback(partial(_forget, key, shared))
+
+    shared.waiters += 1
+    try:
+        result = await asyncio.shield(shared.task)
+    finally:
+        shared.waiters -= 1
+        if shared.waiters == 0 and not shared.task.done():
+            # 所有等待的请求都已取消，之后的相同请求重新开始求解
+            _forget(key, shared)
+            shared.task.cancel()
+
+    # 每个请求得到各自的棋盘副本
+    if result.solution is not None:
+        result = result._replace(solution=result.solution.copy())
+    return result
@@ -0,0 +1,191 @@
+# src/sudoku/batch.py
+"""
+批量求解模块，使用进程池并行求解大量谜题。
+"""
+
+import os
+import pickle
+import time
+from collections import deque
+from itertools import islice
+from math import isqrt
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
+from .board import Board
+from .rules import Rule
+from .solver import Solver
+
+# 设置超时时每段搜索最多尝试放置的次数，段与段之间检查是否超时
+_TIMEOUT_SLICE = 256
+
+
+class BatchResult(NamedTuple):
+    """单个谜题的批量求解结果"""
+
+    index: int
+    solution: Optional[Board]
+    steps: int
+    elapsed: float
+    # 因超时放弃求解为True，此时solution为None
+    timed_out: bool = False
+
+
+# 工作进程中反序列化后的规则和求解器参数，每个进程只反序列化一次
+_worker_rules: tuple = ()
+_worker_options: dict = {}
+
+
+def _init_worker(payload: bytes) -> None:
+    """
+    工作进程初始化：反序列化规则配置
+
+    Args:
+        payload: pickle序列化后的(规则元组, 求解器参数)
+    """
+    global _worker_rules, _worker_options
+    _worker_rules, _worker_options = pickle.loads(payload)
+
+
+def _pack(puzzle: Union[Board, list[int], bytes]) -> Union[Board, list[int], bytes]:
+    """
+    把整数列表形式的谜题压缩为每格一个字节的bytes，减少排队和进程间传输的内存
+
+    Args:
+        puzzle: 谜题
+
+    Returns:
+        压缩后的谜题，无法压缩（数字超过255）时原样返回
+    """
+    if isinstance(puzzle, list):
+        try:
+            return bytes(puzzle)
+        except ValueError:
+            pass
+    return puzzle
+
+
+def _to_board(puzzle: Union[Board, list[int], bytes]) -> Board:
+    """
+    把谜题转换为棋盘
+
+    Args:
+        puzzle: 棋盘、表示初始局面的整数列表（使用0表示空格），或每格一个字节的bytes
+
+    Returns:
+        棋盘
+    """
+    if isinstance(puzzle, Board):
+        return puzzle
+    if isinstance(puzzle, (bytes, bytearray, memoryview)):
+        return Board.from_bytes(puzzle)
+    board = Board(isqrt(len(puzzle)))
+    board.load_puzzle(puzzle)
+    return board
+
+
+def _solve_one(index: int, puzzle: Union[Board, list[int], bytes], rules: tuple, options: dict,
+               timeout: Optional[float] = None) -> BatchResult:
+    """
+    求解单个谜题并计时
+
+    Args:
+        index: 谜题在输入中的下标
+        puzzle: 谜题
+        rules: 规则元组
+        options: 求解器参数
+        timeout: 超时秒数，None表示不限制
+
+    Returns:
+        求解结果
+    """
+    start = time.perf_counter()
+    solver = Solver(_to_board(puzzle), *rules, **options)
+    if timeout is None:
+        outcome = solver.run()
+    else:
+        deadline = start + timeout
+        outcome = solver.run(_TIMEOUT_SLICE)
+        while outcome is None and time.perf_counter() < deadline:
+            outcome = solver.run(_TIMEOUT_SLICE)
+    solution = solver.board.copy() if outcome else None
+    return BatchResult(index, solution, solver.steps, time.perf_counter() - start, outcome is None)
+
+
+def _solve_chunk(chunk: list[tuple[int, Union[Board, list[int], bytes]]],
+                 timeout: Optional[float]) -> list[BatchResult]:
+    """
+    在工作进程中求解一批谜题
+
+    Args:
+        chunk: (下标, 谜题)列表
+        timeout: 每个谜题的超时秒数
+
+    Returns:
+        求解结果列表
+    """
+    return [_solve_one(index, puzzle, _worker_rules, _worker_options, timeout) for index, puzzle in chunk]
+
+
+def solve_many(puzzles: Iterable[Union[Board, list[int], bytes]], rules: Iterable[Rule], workers: Optional[int] = None,
+               chunksize: int = 64, ordered: bool = True, timeout: Optional[float] = None,
+               **options) -> Iterator[BatchResult]:
+    """
+    使用进程池批量求解谜题，结果边求解边返回
+
+    规则配置只在每个工作进程初始化时反序列化一次；输入按chunksize分批提交，
+    同时在途的批次数量有上限，因此输入可以是很长的生成器
+
+    Args:
+        puzzles: 谜题序列，每个元素为棋盘、表示初始局面的整数列表或每格一个字节的bytes
+        rules: 所有谜题共用的规则
+        workers: 进程数，默认使用CPU核数；小于等于1时在当前进程中顺序求解
+        chunksize: 每批提交的谜题数量
+        ordered: 为True时按输入顺序返回结果，否则按完成顺序返回
+        timeout: 每个谜题的超时秒数（从开始求解该谜题时计时），None表示不限制；DLX引擎不受限制
+        **options: 传给Solver的其他参数，例如engine、strategy
+
+    Returns:
+        BatchResult迭代器，每个结果带有输入下标、解、步数和耗时
+    """
+    rules = tuple(rules)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1:
+        for index, puzzle in enumerate(puzzles):
+            yield _solve_one(index, puzzle, rules, options, timeout)
+        return
+
+    # 只有并行求解需要进程池，顺序求解时不导入
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    payload = pickle.dumps((rules, options))
+    items = enumerate(puzzles)
+    max_pending = workers * 4
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(payload,)) as executor:
+        pending = deque()
+
+        def submit() -> bool:
+            chunk = [(index, _pack(puzzle)) for index, puzzle in islice(items, chunksize)]
+            if not chunk:
+                return False
+            pending.append(executor.submit(_solve_chunk, chunk, timeout))
+            return True
+
+        exhausted = False
+        while len(pending) < max_pending and not exhausted:
+            exhausted = not submit()
+
+        while pending:
+            if ordered:
+                # 按提交顺序等待最早的批次
+                yield from pending.popleft().result()
+                if not exhausted:
+                    exhausted = not submit()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield from future.result()
+                    if not exhausted:
+                        exhausted = not submit()
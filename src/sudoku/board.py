@@ -3,11 +3,32 @@
 数独棋盘模块，定义Board类用于管理棋盘状态。
 """
 
-from typing import Optional
+from array import array
+from math import isqrt
+from typing import Optional, Union
+
+
+def _typecode(size: int) -> str:
+    """
+    根据棋盘尺寸选择数组元素类型：数字不超过255时每格1字节，否则每格2字节
+
+    Args:
+        size: 棋盘尺寸
+
+    Returns:
+        array类型码
+    """
+    return "B" if size <= 0xFF else "H"
 
 
 class Board:
-    """数独棋盘类"""
+    """
+    数独棋盘类
+
+    单元格按行优先顺序保存在扁平的array中（下标为row * size + col），复制和导出只需复制一次缓冲区
+    """
+
+    __slots__ = ("size", "data")
 
     def __init__(self, size: int):
         """
@@ -17,29 +38,52 @@ class Board:
             size: 棋盘尺寸（必须指定），必须是正整数
         """
         self.size = size
-        self.cells = [[0 for _ in range(size)] for _ in range(size)]
+        self.data = array(_typecode(size), [0]) * (size * size)
 
     def __str__(self):
         """可视化棋盘状态"""
         result = []
-        for i in range(self.size):
-            row_str = []
-            for j in range(self.size):
-                digit = self.cells[i][j]
-                row_str.append(str(digit) if digit != 0 else ".")
-            result.append(" ".join(row_str))
+        size = self.size
+        for i in range(size):
+            row = self.data[i * size:(i + 1) * size]
+            result.append(" ".join(str(digit) if digit != 0 else "." for digit in row))
         return "\n".join(result)
 
-    def load_puzzle(self, puzzle_data: list[int]) -> None:
+    @property
+    def cells(self) -> tuple[tuple[int, ...], ...]:
+        """
+        按行返回棋盘数字的只读快照
+
+        棋盘数字保存在扁平的data中，cells不再是可以原地修改的属性；返回元组使board.cells[row][col] = digit
+        这样的旧写法抛出TypeError，而不是悄悄修改一个随即丢弃的副本。写入单元格请使用set_digit或remove_digit
+
+        Returns:
+            size×size的数字元组
+        """
+        size = self.size
+        return tuple(tuple(self.data[i * size:(i + 1) * size]) for i in range(size))
+
+    def load_puzzle(self, puzzle_data: Union[list[int], bytes, bytearray, memoryview, array]) -> None:
         """
         加载棋盘的初始局面
 
         Args:
-            puzzle_data: 表示初始局面的整数列表，使用0表示空格
+            puzzle_data: 表示初始局面的整数列表（使用0表示空格），也可以是每格一个字节的bytes、memoryview或array
+
+        Raises:
+            ValueError: 如果数据长度小于size * size
         """
-        for i in range(self.size):
-            for j in range(self.size):
-                self.cells[i][j] = puzzle_data[i * self.size + j]
+        count = self.size * self.size
+        typecode = self.data.typecode
+        if isinstance(puzzle_data, (bytes, bytearray, memoryview)) and typecode == "B":
+            # 字节数据直接复制缓冲区，不创建逐格的整数对象
+            data = array("B")
+            data.frombytes(puzzle_data[:count])
+        else:
+            data = array(typecode, puzzle_data[:count])
+        if len(data) != count:
+            raise ValueError(f"初始局面需要{count}个数字，实际为{len(data)}个")
+        self.data = data
 
     def get_digit(self, row: int, col: int) -> int:
         """
@@ -52,7 +96,7 @@ class Board:
         Returns:
             指定位置的数字
         """
-        return self.cells[row][col]
+        return self.data[row * self.size + col]
 
     def set_digit(self, row: int, col: int, digit: int) -> None:
         """
@@ -63,7 +107,7 @@ class Board:
             col: 列索引（0-based）
             digit: 要放置的数字
         """
-        self.cells[row][col] = digit
+        self.data[row * self.size + col] = digit
 
     def remove_digit(self, row: int, col: int) -> None:
         """
@@ -73,7 +117,7 @@ class Board:
             row: 行索引（0-based）
             col: 列索引（0-based）
         """
-        self.cells[row][col] = 0
+        self.data[row * self.size + col] = 0
 
     def find_empty_cell(self) -> Optional[tuple[int, int]]:
         """
@@ -82,20 +126,62 @@ class Board:
         Returns:
             返回(row, col)元组，如果找不到空格则返回None
         """
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.cells[i][j] == 0:
-                    return i, j
-        return None
+        try:
+            return divmod(self.data.index(0), self.size)
+        except ValueError:
+            return None
 
     def copy(self) -> 'Board':
         """
-        创建当前棋盘的深拷贝
+        创建当前棋盘的深拷贝（复制一次缓冲区）
 
         Returns:
             返回一个新的Board实例
         """
-        new_board = Board(self.size)
-        for i in range(self.size):
-            new_board.cells[i] = self.cells[i].copy()
+        new_board = Board.__new__(Board)
+        new_board.size = self.size
+        new_board.data = self.data[:]
         return new_board
+
+    def to_bytes(self) -> bytes:
+        """
+        导出棋盘数据，每格占用array元素大小的字节（尺寸不超过255时为1字节）
+
+        Returns:
+            行优先顺序的棋盘数据
+        """
+        return self.data.tobytes()
+
+    def view(self) -> memoryview:
+        """
+        获取棋盘缓冲区的只读视图，不复制数据
+
+        Returns:
+            行优先顺序的memoryview
+        """
+        return memoryview(self.data).toreadonly()
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, bytearray, memoryview], size: Optional[int] = None) -> 'Board':
+        """
+        从to_bytes导出的数据创建棋盘
+
+        Args:
+            data: 行优先顺序的棋盘数据
+            size: 棋盘尺寸，默认按每格1字节由数据长度推算
+
+        Returns:
+            新的Board实例
+
+        Raises:
+            ValueError: 如果数据长度与棋盘尺寸不符
+        """
+        if size is None:
+            size = isqrt(len(data))
+        board = cls.__new__(cls)
+        board.size = size
+        board.data = array(_typecode(size))
+        board.data.frombytes(data)
+        if len(board.data) != size * size:
+            raise ValueError(f"{size}×{size}棋盘需要{size * size}个数字，实际为{len(board.data)}个")
+        return board
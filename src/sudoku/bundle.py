@@ -0,0 +1,399 @@
+# src/sudoku/bundle.py
+"""
+捆绑包模块，把谜题的初始局面和规则几何结构保存为带版本号的紧凑二进制格式，
+读取时直接从memoryview构建棋盘和规则对象，多个进程可以通过内存映射共享同一个文件。
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator, NamedTuple, Optional, Sequence, Union
+from .board import Board
+from .exceptions import SudokuError
+from .rules import (BlockRule, ColumnRule, KillerRule, Normal9x9BlockRule, NonConsecutiveRule, RegionRule, Rule,
+                    RowRule, ThermometerRule)
+
+BUNDLE_MAGIC = b"SDKB"
+BUNDLE_VERSION = 2
+
+# 文件头：魔数、版本号、保留、谜题个数、规则块个数
+_HEADER = struct.Struct("<4sHHII")
+# 谜题表的每一项：初始局面的偏移、棋盘尺寸、规则块下标
+_PUZZLE = struct.Struct("<QII")
+# 规则块表的每一项：规则块的偏移
+_RULES_OFFSET = struct.Struct("<Q")
+# 规则块头：棋盘尺寸、保留、规则记录个数；之后按规则的顺序每条规则一条记录
+_RULES = struct.Struct("<HHI")
+# 规则记录头：规则类型、保留、两个与类型有关的参数；之后是该记录的小端序uint32数组，
+# 单元格为扁平下标（row * size + col）
+# - 行、列、非连续：参数为0，没有数组
+# - 宫：参数为构造时指定的宫的行数和列数（未指定为0），没有数组
+# - 不规则区域：参数为0，数组为每个单元格的区域编号（按首次出现的顺序编号）
+# - 温度计：参数为温度计个数和单元格总数，数组依次为每个温度计的结束位置、单元格
+# - 杀手：参数为笼子个数和单元格总数，数组依次为笼子和值、每个笼子的结束位置、单元格
+_RECORD = struct.Struct("<HHII")
+
+# 规则记录的类型
+_ROWS = 1
+_COLUMNS = 2
+_BLOCKS = 3
+_NORMAL_BLOCKS = 4
+_REGIONS = 5
+_NON_CONSECUTIVE = 6
+_THERMOMETERS = 7
+_KILLER = 8
+
+# 没有参数和数组的规则 -> 记录类型
+_SIMPLE_KINDS = {RowRule: _ROWS, ColumnRule: _COLUMNS, NonConsecutiveRule: _NON_CONSECUTIVE}
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+class Bundle(NamedTuple):
+    """一个谜题及其规则"""
+
+    board: Board
+    rules: tuple[Rule, ...]
+
+
+def _uint32s(view: memoryview, offset: int, count: int) -> Sequence[int]:
+    """
+    读取小端序uint32数组，小端序平台上直接转换视图，不复制数据
+
+    Args:
+        view: 文件的字节视图
+        offset: 数组的偏移
+        count: 元素个数
+
+    Returns:
+        整数序列
+    """
+    data = view[offset:offset + 4 * count]
+    if _LITTLE_ENDIAN:
+        return data.cast("I")
+    values = array("I", data)
+    values.byteswap()
+    return values
+
+
+def _pack_uint32s(values: Sequence[int]) -> bytes:
+    """
+    把整数序列打包为小端序uint32数组
+
+    Args:
+        values: 整数序列
+
+    Returns:
+        打包后的字节串
+    """
+    values = array("I", values)
+    if not _LITTLE_ENDIAN:
+        values.byteswap()
+    return values.tobytes()
+
+
+def _pack_rule(rule: Rule, size: int) -> bytes:
+    """
+    把一条规则打包为规则记录
+
+    Args:
+        rule: 规则
+        size: 棋盘尺寸
+
+    Returns:
+        规则记录
+
+    Raises:
+        SudokuError: 如果规则不能写入捆绑包
+    """
+    kind = type(rule)
+    if kind in _SIMPLE_KINDS:
+        return _RECORD.pack(_SIMPLE_KINDS[kind], 0, 0, 0)
+    if kind is Normal9x9BlockRule:
+        return _RECORD.pack(_NORMAL_BLOCKS, 0, 0, 0)
+    if kind is BlockRule:
+        # 保留构造参数，未指定的形状记为0
+        return _RECORD.pack(_BLOCKS, 0, rule.box_rows or 0, rule.box_cols or 0)
+    if kind is RegionRule:
+        regions = [0] * (size * size)
+        for index, unit in enumerate(rule.unit_table(size).units):
+            for cell in unit:
+                regions[cell] = index
+        return _RECORD.pack(_REGIONS, 0, 0, 0) + _pack_uint32s(regions)
+    if kind is ThermometerRule:
+        ends = []
+        cells = []
+        for thermometer in rule.thermometers:
+            cells.extend(row * size + col for row, col in thermometer)
+            ends.append(len(cells))
+        return _RECORD.pack(_THERMOMETERS, 0, len(ends), len(cells)) + _pack_uint32s(ends + cells)
+    if kind is KillerRule:
+        ends = []
+        cells = []
+        for cage in rule.cages:
+            cells.extend(row * size + col for row, col in cage)
+            ends.append(len(cells))
+        return _RECORD.pack(_KILLER, 0, len(ends), len(cells)) + _pack_uint32s(list(rule.cage_sums) + ends + cells)
+    raise SudokuError(rule.rule_name, "捆绑包不支持该规则")
+
+
+def _pack_rules(board: Board, rules: Sequence[Rule]) -> bytes:
+    """
+    把规则打包为规则块，每条规则一条记录，保持规则的顺序
+
+    Args:
+        board: 谜题的棋盘
+        rules: 规则
+
+    Returns:
+        规则块
+
+    Raises:
+        SudokuError: 如果棋盘与规则不兼容，或规则不能写入捆绑包
+    """
+    records = []
+    for rule in rules:
+        rule.validate_compatibility(board)
+        records.append(_pack_rule(rule, board.size))
+    return _RULES.pack(board.size, 0, len(records)) + b"".join(records)
+
+
+def pack_bundles(bundles: Iterable[tuple[Board, Sequence[Rule]]]) -> bytes:
+    """
+    把谜题和规则打包为捆绑包文件的内容；规则几何结构相同的谜题共享同一个规则块
+
+    Args:
+        bundles: (棋盘, 规则)序列
+
+    Returns:
+        捆绑包文件的内容
+
+    Raises:
+        SudokuError: 如果棋盘与规则不兼容，或规则不能写入捆绑包
+    """
+    puzzles = []
+    # 规则块 -> 规则块下标
+    blocks = {}
+    for board, rules in bundles:
+        block = _pack_rules(board, rules)
+        givens = board.data[:]
+        if givens.itemsize > 1 and not _LITTLE_ENDIAN:
+            givens.byteswap()
+        puzzles.append((givens.tobytes(), board.size, blocks.setdefault(block, len(blocks))))
+
+    offset = _HEADER.size + _PUZZLE.size * len(puzzles) + _RULES_OFFSET.size * len(blocks)
+    table = []
+    sections = []
+    for givens, size, rules_index in puzzles:
+        table.append(_PUZZLE.pack(offset, size, rules_index))
+        # 每段按4字节对齐，使uint32数组可以直接转换视图
+        padding = -len(givens) % 4
+        sections.append(givens + bytes(padding))
+        offset += len(givens) + padding
+    for block in blocks:
+        table.append(_RULES_OFFSET.pack(offset))
+        sections.append(block)
+        offset += len(block)
+
+    header = _HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, 0, len(puzzles), len(blocks))
+    return b"".join([header] + table + sections)
+
+
+def write_bundles(path: str, bundles: Iterable[tuple[Board, Sequence[Rule]]]) -> int:
+    """
+    把谜题和规则写入捆绑包文件
+
+    Args:
+        path: 文件路径
+        bundles: (棋盘, 规则)序列
+
+    Returns:
+        写入的谜题个数
+
+    Raises:
+        SudokuError: 如果棋盘与规则不兼容，或规则不能写入捆绑包
+    """
+    data = pack_bundles(bundles)
+    with open(path, "wb") as file:
+        file.write(data)
+    return _HEADER.unpack_from(data)[3]
+
+
+class BundleFile:
+    """
+    捆绑包文件读取器
+
+    从路径打开时以只读方式内存映射文件，多个进程映射同一个文件时共享操作系统的页缓存，不复制语料。
+    读取器可以pickle：传给进程池的工作进程时只传递路径，工作进程重新映射文件，例如
+    ProcessPoolExecutor(initializer=init, initargs=(BundleFile.open(path),))。
+    同一个规则块的规则对象只构建一次并在谜题之间共享，规则编译的缓存因此也能命中
+    """
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview, mmap.mmap], path: Optional[str] = None):
+        """
+        从缓冲区创建读取器
+
+        Args:
+            buffer: 捆绑包文件的内容
+            path: 缓冲区对应的文件路径，用于pickle
+
+        Raises:
+            ValueError: 如果魔数或版本号不符
+        """
+        self.path = path
+        self.buffer = buffer
+        self.view = memoryview(buffer).cast("B")
+        if len(self.view) < _HEADER.size:
+            raise ValueError("捆绑包文件过短")
+        magic, version, _, self.count, self.rules_count = _HEADER.unpack_from(self.view)
+        if magic != BUNDLE_MAGIC:
+            raise ValueError(f"不是捆绑包文件: 魔数为{magic!r}")
+        if version != BUNDLE_VERSION:
+            raise ValueError(f"不支持的捆绑包版本{version}，当前版本为{BUNDLE_VERSION}")
+        self.rules_table = _HEADER.size + _PUZZLE.size * self.count
+        # 规则块下标 -> 规则对象
+        self.rules_cache: dict[int, tuple[Rule, ...]] = {}
+
+    @classmethod
+    def open(cls, path: str) -> 'BundleFile':
+        """
+        以只读内存映射方式打开捆绑包文件
+
+        Args:
+            path: 文件路径
+
+        Returns:
+            读取器
+
+        Raises:
+            ValueError: 如果文件为空、魔数或版本号不符
+        """
+        with open(path, "rb") as file:
+            # 空文件无法映射
+            if file.seek(0, 2) == 0:
+                raise ValueError("捆绑包文件过短")
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, path)
+
+    def __len__(self) -> int:
+        """返回谜题个数"""
+        return self.count
+
+    def __getitem__(self, index: int) -> Bundle:
+        """
+        读取一个谜题
+
+        Args:
+            index: 谜题下标
+
+        Returns:
+            新建的棋盘和共享的规则对象
+
+        Raises:
+            IndexError: 如果下标超出范围
+        """
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(f"谜题下标{index}超出范围(0-{self.count - 1})")
+        offset, size, rules_index = _PUZZLE.unpack_from(self.view, _HEADER.size + _PUZZLE.size * index)
+        # 与Board的数组类型一致：尺寸不超过255时每格1字节，否则2字节
+        length = size * size * (1 if size <= 0xFF else 2)
+        board = Board.from_bytes(self.view[offset:offset + length], size)
+        if board.data.itemsize > 1 and not _LITTLE_ENDIAN:
+            board.data.byteswap()
+        return Bundle(board, self.rules(rules_index))
+
+    def rules(self, rules_index: int) -> tuple[Rule, ...]:
+        """
+        构建规则块中的规则对象（每个规则块只构建一次）
+
+        Args:
+            rules_index: 规则块下标
+
+        Returns:
+            规则对象
+        """
+        rules = self.rules_cache.get(rules_index)
+        if rules is not None:
+            return rules
+
+        view = self.view
+        (offset,) = _RULES_OFFSET.unpack_from(view, self.rules_table + _RULES_OFFSET.size * rules_index)
+        size, _, record_count = _RULES.unpack_from(view, offset)
+        offset += _RULES.size
+
+        rules = []
+        for _ in range(record_count):
+            kind, _, first, second = _RECORD.unpack_from(view, offset)
+            offset += _RECORD.size
+            if kind == _ROWS:
+                rules.append(RowRule())
+            elif kind == _COLUMNS:
+                rules.append(ColumnRule())
+            elif kind == _NON_CONSECUTIVE:
+                rules.append(NonConsecutiveRule())
+            elif kind == _NORMAL_BLOCKS:
+                rules.append(Normal9x9BlockRule())
+            elif kind == _BLOCKS:
+                rules.append(BlockRule(first or None, second or None))
+            elif kind == _REGIONS:
+                regions = _uint32s(view, offset, size * size)
+                offset += 4 * size * size
+                rules.append(RegionRule([regions[row * size:(row + 1) * size] for row in range(size)]))
+            elif kind == _THERMOMETERS:
+                ends = _uint32s(view, offset, first)
+                cells = _uint32s(view, offset + 4 * first, second)
+                offset += 4 * (first + second)
+                thermometer_rule = ThermometerRule()
+                start = 0
+                for end in ends:
+                    thermometer_rule.set([divmod(cell, size) for cell in cells[start:end]])
+                    start = end
+                rules.append(thermometer_rule)
+            elif kind == _KILLER:
+                sums = _uint32s(view, offset, first)
+                ends = _uint32s(view, offset + 4 * first, first)
+                cells = _uint32s(view, offset + 8 * first, second)
+                offset += 4 * (2 * first + second)
+                killer_rule = KillerRule()
+                start = 0
+                for cage_sum, end in zip(sums, ends):
+                    killer_rule.set(cage_sum, [divmod(cell, size) for cell in cells[start:end]])
+                    start = end
+                killer_rule.build_combinations(size)
+                rules.append(killer_rule)
+            else:
+                raise ValueError(f"规则块{rules_index}中有未知的规则类型{kind}")
+
+        rules = self.rules_cache[rules_index] = tuple(rules)
+        return rules
+
+    def __iter__(self) -> Iterator[Bundle]:
+        """按顺序读取所有谜题"""
+        for index in range(self.count):
+            yield self[index]
+
+    def close(self) -> None:
+        """释放视图，从路径打开时关闭内存映射"""
+        self.view.release()
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+    def __enter__(self) -> 'BundleFile':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __reduce__(self):
+        """
+        pickle时只保存路径，反序列化时重新映射文件
+
+        Raises:
+            TypeError: 如果读取器不是从路径打开的
+        """
+        if self.path is None:
+            raise TypeError("只有从路径打开的BundleFile可以pickle")
+        return self.open, (self.path,)
@@ -0,0 +1,364 @@
+# src/sudoku/cache.py
+"""
+解缓存模块，按规范形式缓存谜题的解，支持内存LRU和可选的sqlite持久化存储。
+"""
+
+import sqlite3
+from array import array
+from collections import OrderedDict
+from typing import Iterable, NamedTuple, Optional
+from .board import Board, _typecode
+from .rules import Rule
+from .solver import Solver
+from .units import block_shape
+
+# 行、列规则的键；与一条宫规则组合时使用规范形式
+_LINE_KEYS = frozenset({("RowRule",), ("ColumnRule",)})
+
+# 缓存中表示“无解”的值
+_NO_SOLUTION = b""
+
+
+class _Transform(NamedTuple):
+    """从原始谜题到规范形式的变换"""
+
+    # 是否先转置
+    transposed: bool
+    # 规范形式第i行对应（转置后）原始棋盘的第rows[i]行
+    rows: tuple[int, ...]
+    # 规范形式第j列对应（转置后）原始棋盘的第cols[j]列
+    cols: tuple[int, ...]
+    # 原始数字 -> 规范数字，下标0固定为0
+    digits: tuple[int, ...]
+
+
+def _pack(values: Iterable[int], size: int) -> bytes:
+    """
+    按棋盘数组的元素类型打包数字：尺寸不超过255时每格1字节，否则每格2字节
+
+    Args:
+        values: 数字
+        size: 棋盘尺寸
+
+    Returns:
+        打包后的字节串
+    """
+    return array(_typecode(size), values).tobytes()
+
+
+def _block_shape(size: int, rule_keys: list[tuple]) -> Optional[tuple[int, int]]:
+    """
+    判断规则是否为行、列加一条宫规则的组合，并返回宫的形状
+
+    Args:
+        size: 棋盘尺寸
+        rule_keys: 所有规则的cache_key
+
+    Returns:
+        (宫的行数, 宫的列数)，不是这种组合时返回None
+    """
+    keys = set(rule_keys)
+    if not _LINE_KEYS <= keys or len(keys) != 3:
+        return None
+    (block_key,) = keys - _LINE_KEYS
+    if block_key == ("Normal9x9BlockRule",):
+        return (3, 3) if size == 9 else None
+    if block_key[0] == "BlockRule":
+        return block_shape(size, *block_key[1:])
+    return None
+
+
+def _line_order(grid: list[int], size: int, box: int, by_row: bool) -> list[int]:
+    """
+    计算行（或列）的排列：宫内的行按签名排序，再按签名排序整条带
+
+    签名只依赖已填格子的位置，不受数字重新编号影响；签名相同的行保持原顺序，
+    因此等价谜题不一定得到相同的规范形式，但变换始终是合法的对称变换
+
+    Args:
+        grid: 扁平棋盘数字
+        size: 棋盘尺寸
+        box: 每条带（栈）包含的行（列）数
+        by_row: True计算行排列，False计算列排列
+
+    Returns:
+        排列后的行（或列）下标
+    """
+    if by_row:
+        lines = [[grid[line * size + k] != 0 for k in range(size)] for line in range(size)]
+    else:
+        lines = [[grid[k * size + line] != 0 for k in range(size)] for line in range(size)]
+    cross = [sum(line[k] for line in lines) for k in range(size)]
+    keys = [(sum(line), sorted(cross[k] for k in range(size) if line[k])) for line in lines]
+
+    bands = []
+    for band in range(size // box):
+        members = sorted(range(band * box, band * box + box), key=keys.__getitem__)
+        bands.append(([keys[line] for line in members], members))
+    bands.sort(key=lambda band: band[0])
+    return [line for _, members in bands for line in members]
+
+
+def _canonical_form(values: list[int], size: int, box_rows: int, box_cols: int) -> tuple[bytes, _Transform]:
+    """
+    计算经典数独谜题的规范形式：尝试原始与转置两种方向（只有正方形宫可以转置），
+    行列按签名排列后按首次出现顺序重新编号数字，取字典序较小的结果
+
+    Args:
+        values: 扁平谜题数字（0表示空格）
+        size: 棋盘尺寸
+        box_rows: 宫的行数
+        box_cols: 宫的列数
+
+    Returns:
+        (规范形式, 变换)
+    """
+    best = None
+    for transposed in (False, True) if box_rows == box_cols else (False,):
+        if transposed:
+            grid = [values[col * size + row] for row in range(size) for col in range(size)]
+        else:
+            grid = values
+        rows = _line_order(grid, size, box_rows, by_row=True)
+        cols = _line_order(grid, size, box_cols, by_row=False)
+        permuted = [grid[row * size + col] for row in rows for col in cols]
+
+        # 按首次出现顺序编号，未出现的数字按原顺序编在最后
+        digits = [0] * (size + 1)
+        label = 0
+        for digit in permuted:
+            if digit and not digits[digit]:
+                label += 1
+                digits[digit] = label
+        for digit in range(1, size + 1):
+            if not digits[digit]:
+                label += 1
+                digits[digit] = label
+
+        form = [digits[digit] for digit in permuted]
+        if best is None or form < best[0]:
+            best = (form, _Transform(transposed, tuple(rows), tuple(cols), tuple(digits)))
+    return _pack(best[0], size), best[1]
+
+
+def _identity_transform(size: int) -> _Transform:
+    """
+    获取不改变谜题的变换，用于变体规则
+
+    Args:
+        size: 棋盘尺寸
+
+    Returns:
+        恒等变换
+    """
+    return _Transform(False, tuple(range(size)), tuple(range(size)), tuple(range(size + 1)))
+
+
+class SolutionCache:
+    """
+    谜题解缓存
+
+    经典数独（行、列加一条宫规则）先转换为规范形式：转置、带与栈的排列、带内行与栈内列的排列以及数字重新编号
+    得到的等价谜题共享同一个缓存项，命中时通过逆变换还原为原谜题的解。
+    变体规则按cache_key描述的几何结构和原始谜题精确匹配；任何规则没有cache_key时不使用缓存
+    """
+
+    def __init__(self, capacity: int = 1024, path: Optional[str] = None):
+        """
+        初始化缓存
+
+        Args:
+            capacity: 内存中最多保存的解个数，超出时淘汰最久未使用的项
+            path: sqlite数据库文件路径，为None时只使用内存缓存
+        """
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+        self.connection = None
+        if path is not None:
+            self.connection = sqlite3.connect(path)
+            self.connection.execute("CREATE TABLE IF NOT EXISTS solutions (key BLOB PRIMARY KEY, solution BLOB)")
+            self.connection.commit()
+
+    def close(self) -> None:
+        """关闭持久化存储"""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def __enter__(self) -> "SolutionCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def clear(self) -> None:
+        """清空内存缓存和持久化存储"""
+        self.entries.clear()
+        if self.connection is not None:
+            self.connection.execute("DELETE FROM solutions")
+            self.connection.commit()
+
+    def make_key(self, board: Board, rules: Iterable[Rule]) -> Optional[tuple[bytes, _Transform]]:
+        """
+        计算谜题的缓存键和到缓存形式的变换
+
+        Args:
+            board: 谜题棋盘
+            rules: 规则
+
+        Returns:
+            (缓存键, 变换)，不能安全缓存时返回None
+        """
+        rule_keys = []
+        for rule in rules:
+            rule_key = rule.cache_key()
+            if rule_key is None:
+                return None
+            rule_keys.append(rule_key)
+
+        size = board.size
+        values = board.data.tolist()
+        shape = _block_shape(size, rule_keys)
+        if shape is not None:
+            form, transform = _canonical_form(values, size, *shape)
+            prefix = f"blocks{shape[0]}x{shape[1]}"
+        else:
+            form, transform = _pack(values, size), _identity_transform(size)
+            prefix = repr(sorted(set(map(repr, rule_keys))))
+        return f"{size}|{prefix}|".encode() + form, transform
+
+    def _lookup(self, key: bytes) -> Optional[bytes]:
+        """
+        依次在内存和持久化存储中查找缓存项，持久化存储命中时放入内存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存形式的解，没有缓存项时返回None
+        """
+        solution = self.entries.get(key)
+        if solution is not None:
+            self.entries.move_to_end(key)
+            return solution
+
+        if self.connection is not None:
+            row = self.connection.execute("SELECT solution FROM solutions WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._remember(key, row[0])
+                return row[0]
+        return None
+
+    def _remember(self, key: bytes, solution: bytes) -> None:
+        """
+        放入内存缓存，超出容量时淘汰最久未使用的项
+
+        Args:
+            key: 缓存键
+            solution: 缓存形式的解
+        """
+        self.entries[key] = solution
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def _store(self, key: bytes, solution: bytes) -> None:
+        """
+        写入内存缓存和持久化存储
+
+        Args:
+            key: 缓存键
+            solution: 缓存形式的解
+        """
+        self._remember(key, solution)
+        if self.connection is not None:
+            self.connection.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?)", (key, solution))
+            self.connection.commit()
+
+    @staticmethod
+    def _to_form(board: Board, transform: _Transform) -> bytes:
+        """
+        把原始棋盘转换为缓存形式
+
+        Args:
+            board: 原始棋盘
+            transform: 变换
+
+        Returns:
+            缓存形式的棋盘数字
+        """
+        digits = transform.digits
+        data = board.data
+        size = board.size
+        if transform.transposed:
+            return _pack((digits[data[col * size + row]] for row in transform.rows for col in transform.cols), size)
+        return _pack((digits[data[row * size + col]] for row in transform.rows for col in transform.cols), size)
+
+    @staticmethod
+    def _from_form(form: bytes, size: int, transform: _Transform) -> Board:
+        """
+        通过逆变换把缓存形式还原为原始棋盘
+
+        Args:
+            form: 缓存形式的棋盘数字
+            size: 棋盘尺寸
+            transform: 变换
+
+        Returns:
+            原始棋盘
+        """
+        inverse = [0] * (size + 1)
+        for digit, label in enumerate(transform.digits):
+            inverse[label] = digit
+        labels = array(_typecode(size), form)
+
+        values = [0] * (size * size)
+        for i, row in enumerate(transform.rows):
+            for j, col in enumerate(transform.cols):
+                cell = col * size + row if transform.transposed else row * size + col
+                values[cell] = inverse[labels[i * size + j]]
+
+        board = Board(size)
+        board.load_puzzle(values)
+        return board
+
+    def solve(self, board: Board, *rules: Rule, **options) -> Optional[Board]:
+        """
+        求解谜题，优先使用缓存的解；未命中时使用Solver求解并写入缓存
+
+        Args:
+            board: 要求解的棋盘
+            *rules: 规则
+            **options: 传给Solver的其他参数
+
+        Returns:
+            求解后的棋盘，如果无解则返回None
+
+        Raises:
+            SudokuError: 如果棋盘与任何规则不兼容
+        """
+        entry = self.make_key(board, rules)
+        if entry is None:
+            self.bypassed += 1
+            solver = Solver(board, *rules, **options)
+            return solver.board.copy() if solver.solve() else None
+
+        key, transform = entry
+        solution = self._lookup(key)
+        if solution is not None:
+            self.hits += 1
+            if solution == _NO_SOLUTION:
+                return None
+            return self._from_form(solution, board.size, transform)
+
+        self.misses += 1
+        solver = Solver(board, *rules, **options)
+        if not solver.solve():
+            self._store(key, _NO_SOLUTION)
+            return None
+        self._store(key, self._to_form(solver.board, transform))
+        return solver.board.copy()
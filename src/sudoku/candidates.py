@@ -0,0 +1,120 @@
+# src/sudoku/candidates.py
+"""
+候选数状态模块，使用位掩码记录每个单元已使用的数字和每个单元格的候选数。
+"""
+
+from typing import Union
+from .board import Board
+from .units import UnitTable
+
+
+class CandidateState:
+    """
+    候选数状态
+
+    单元（unit）是一组数字不能重复的单元格，例如行、列、宫。数字digit对应位掩码中的第digit位，
+    每个单元维护一个已使用数字的掩码，单元格的候选数为其所属单元掩码的补集再去掉已排除的数字。
+    放置数字与排除候选数都会记录在trail中，回溯时按相反顺序精确还原。
+    """
+
+    def __init__(self, board: Board, units: Union[UnitTable, list[list[tuple[int, int]]]]):
+        """
+        初始化候选数状态，并载入棋盘上已有的数字
+
+        Args:
+            board: 数独棋盘
+            units: 单元表，或单元列表（每个单元是一组不能出现重复数字的单元格坐标）
+        """
+        size = board.size
+        self.size = size
+        self.full_mask = ((1 << size) - 1) << 1
+
+        if not isinstance(units, UnitTable):
+            units = UnitTable(size, [[row * size + col for row, col in unit] for unit in units])
+        # 单元表可能被多个求解器共享，只读
+        self.table = units
+        self.units = units.units
+        self.cell_units = units.cell_units
+        # 与单元格至少共享一个单元的其他单元格
+        self.peers = units.peers
+
+        self.unit_masks = [0] * len(self.units)
+        self.values = [0] * (size * size)
+        self.eliminated = [0] * (size * size)
+
+        # 回溯记录：放置数字记为(cell, -1)，排除候选数记为(cell, 排除前的掩码)
+        self.trail = []
+        # 传播队列：上次约束传播以来放置数字或排除候选数的单元格，约束传播器绑定为列表后才记录
+        self.queue = None
+        # 上次调用规则传播钩子以来放置数字的单元格，由约束传播器维护；None表示未知，钩子需要检查所有单元格
+        self.placed = None
+
+        for cell, digit in enumerate(board.data):
+            if digit != 0:
+                self.place(cell, digit)
+
+        # 初始局面不需要回溯
+        self.trail.clear()
+
+    def candidates(self, cell: int) -> int:
+        """
+        获取单元格的候选数掩码
+
+        Args:
+            cell: 单元格下标（row * size + col）
+
+        Returns:
+            候选数掩码，第digit位为1表示digit可以放置
+        """
+        used = self.eliminated[cell]
+        for index in self.cell_units[cell]:
+            used |= self.unit_masks[index]
+        return self.full_mask & ~used
+
+    def place(self, cell: int, digit: int) -> None:
+        """
+        在单元格放置数字并更新所属单元的掩码
+
+        Args:
+            cell: 单元格下标（row * size + col）
+            digit: 要放置的数字
+        """
+        bit = 1 << digit
+        self.values[cell] = digit
+        for index in self.cell_units[cell]:
+            self.unit_masks[index] |= bit
+        self.trail.append((cell, -1))
+        if self.queue is not None:
+            self.queue.append(cell)
+
+    def remove(self, cell: int) -> None:
+        """
+        移除单元格上的数字并还原所属单元的掩码
+
+        Args:
+            cell: 单元格下标（row * size + col）
+        """
+        bit = 1 << self.values[cell]
+        self.values[cell] = 0
+        for index in self.cell_units[cell]:
+            self.unit_masks[index] &= ~bit
+
+    def eliminate(self, cell: int, mask: int) -> bool:
+        """
+        从空格的候选数中排除数字
+
+        Args:
+            cell: 单元格下标（row * size + col）
+            mask: 要排除的数字掩码
+
+        Returns:
+            如果候选数发生变化返回True，否则返回False
+        """
+        previous = self.eliminated[cell]
+        if self.values[cell] != 0 or not self.candidates(cell) & mask:
+            return False
+        self.trail.append((cell, previous))
+        self.eliminated[cell] = previous | mask
+        if self.queue is not None:
+            self.queue.append(cell)
+        return True
@@ -0,0 +1,527 @@
+# src/sudoku/cdcl.py
+"""
+冲突驱动子句学习（CDCL）模块，把棋盘和规则编码为布尔子句，用带学习、非时序回跳和重启的搜索求解。
+"""
+
+from typing import Iterable, Iterator, Optional, Sequence
+from .board import Board
+from .candidates import CandidateState
+from .exceptions import SudokuError
+from .rules import Rule
+
+# 子句中变量活跃度每次冲突后的衰减系数
+_ACTIVITY_DECAY = 0.95
+
+# Luby重启序列的单位冲突次数
+_RESTART_BASE = 64
+
+# 学习子句数量的初始上限，每次清理后增长
+_LEARNT_LIMIT = 2000
+
+
+def _luby(index: int) -> int:
+    """
+    计算Luby序列（1, 1, 2, 1, 1, 2, 4, ...）的第index项（从0开始）
+
+    Args:
+        index: 序列下标
+
+    Returns:
+        序列值
+    """
+    size, power = 1, 0
+    while size < index + 1:
+        power += 1
+        size = 2 * size + 1
+    while size - 1 != index:
+        size = (size - 1) >> 1
+        power -= 1
+        index %= size
+    return 1 << power
+
+
+class CDCLEngine:
+    """
+    冲突驱动子句学习求解器
+
+    变量x(cell, digit)表示单元格cell填digit，编号为cell * size + digit（从1开始，与DIMACS格式一致），
+    规则可以申请额外的辅助变量。对外的文字用带符号的整数表示，内部编码为2 * (变量 - 1) + 是否取反，
+    取反只需异或1。二元子句保存在蕴含表中，更长的子句使用双文字监视。
+    决策总是在剩余候选数最少的单元格上放置最小的候选数字，同样少时优先选择最近冲突中活跃的单元格
+    """
+
+    def __init__(self, state: CandidateState, board: Board, rules: Iterable[Rule]):
+        """
+        把候选数状态中的单元和不能用单元描述的规则编码为子句
+
+        Args:
+            state: 求解器的候选数状态，提供单元和初始局面
+            board: 求解器的棋盘
+            rules: 不能用单元描述的规则，每条都必须实现encode
+
+        Raises:
+            SudokuError: 如果某条规则不能编码为子句
+        """
+        size = state.size
+        self.size = size
+        self.cell_count = size * size
+        self.variable_count = 0
+
+        # 以内部文字为下标：1为真，-1为假，0为未赋值
+        self.value = []
+        # 以变量为下标
+        self.level = []
+        self.reason = []
+        self.activity = []
+        self.cell_activity = [0.0] * self.cell_count
+        self.increment = 1.0
+
+        # 蕴含表：文字为假时必须为真的文字；监视表：监视该文字的长子句
+        self.implications = []
+        self.watches = []
+        self.learnts = []
+        # id(学习子句) -> LBD（子句中文字涉及的不同决策层数）
+        self.lbd = {}
+        self.learnt_limit = _LEARNT_LIMIT
+
+        self.trail = []
+        self.trail_limits = []
+        self.head = 0
+        # 在第0层已经发现矛盾，没有（更多）解
+        self.unsatisfiable = False
+
+        self.decisions = 0
+        self.conflicts = 0
+        self.restarts = 0
+        self.next_restart = _RESTART_BASE * _luby(0)
+
+        self.new_variables(self.cell_count * size)
+        self._encode_cells()
+        self._encode_units(state)
+
+        for rule in rules:
+            if not rule.encode(board, self):
+                raise SudokuError(rule.rule_name, "CDCL引擎只支持可由单元描述或实现了encode的规则")
+
+        # 初始局面：已填数字和已排除的候选数作为第0层的事实
+        for cell, digit in enumerate(state.values):
+            if digit != 0:
+                self.add_clause([self.variable(cell, digit)])
+            else:
+                excluded = state.full_mask & ~state.candidates(cell)
+                for digit in range(1, size + 1):
+                    if excluded >> digit & 1:
+                        self.add_clause([-self.variable(cell, digit)])
+
+    def new_variables(self, count: int) -> int:
+        """
+        申请新的变量
+
+        Args:
+            count: 变量个数
+
+        Returns:
+            第一个新变量的编号（从1开始）
+        """
+        first = self.variable_count + 1
+        self.variable_count += count
+        self.value.extend([0] * (2 * count))
+        self.level.extend([0] * count)
+        self.reason.extend([None] * count)
+        self.activity.extend([0.0] * count)
+        self.implications.extend([] for _ in range(2 * count))
+        self.watches.extend([] for _ in range(2 * count))
+        return first
+
+    def new_variable(self) -> int:
+        """
+        申请一个新的辅助变量，例如表示杀手笼子选择了哪个数字组合
+
+        Returns:
+            变量编号（从1开始）
+        """
+        return self.new_variables(1)
+
+    def variable(self, cell: int, digit: int) -> int:
+        """
+        获取“单元格填该数字”的变量编号
+
+        Args:
+            cell: 单元格下标（row * size + col）
+            digit: 数字
+
+        Returns:
+            变量编号（从1开始），取负数表示“不填该数字”
+        """
+        return cell * self.size + digit
+
+    def add_clause(self, literals: Sequence[int]) -> None:
+        """
+        添加一条子句：其中至少一个文字为真。只能在搜索开始前或回退到第0层后调用
+
+        Args:
+            literals: 带符号的变量编号，负数表示取反；空子句表示问题无解
+        """
+        clause = [2 * (abs(literal) - 1) + (literal < 0) for literal in dict.fromkeys(literals)]
+        if not clause:
+            self.unsatisfiable = True
+        elif len(clause) == 1:
+            literal = clause[0]
+            if self.value[literal] == -1:
+                self.unsatisfiable = True
+            elif self.value[literal] == 0:
+                self._assign(literal, None)
+        elif len(clause) == 2:
+            self.implications[clause[0]].append(clause[1])
+            self.implications[clause[1]].append(clause[0])
+        else:
+            self.watches[clause[0]].append(clause)
+            self.watches[clause[1]].append(clause)
+
+    def _encode_cells(self) -> None:
+        """每个单元格恰好填一个数字"""
+        size = self.size
+        for cell in range(self.cell_count):
+            literals = [self.variable(cell, digit) for digit in range(1, size + 1)]
+            self.add_clause(literals)
+            for i, a in enumerate(literals):
+                for b in literals[i + 1:]:
+                    self.add_clause([-a, -b])
+
+    def _encode_units(self, state: CandidateState) -> None:
+        """
+        单元内数字不能重复；包含全部数字的单元中每个数字都必须出现
+
+        Args:
+            state: 候选数状态
+        """
+        size = self.size
+        for unit in state.units:
+            for digit in range(1, size + 1):
+                literals = [self.variable(cell, digit) for cell in unit]
+                for i, a in enumerate(literals):
+                    for b in literals[i + 1:]:
+                        self.add_clause([-a, -b])
+                if len(unit) == size:
+                    self.add_clause(literals)
+
+    def _assign(self, literal: int, reason) -> None:
+        """
+        把文字设为真
+
+        Args:
+            literal: 内部文字
+            reason: 推出该文字的子句，二元子句为(该文字, 另一个文字)，决策和第0层事实为None
+        """
+        self.value[literal] = 1
+        self.value[literal ^ 1] = -1
+        variable = literal >> 1
+        self.level[variable] = len(self.trail_limits)
+        self.reason[variable] = reason
+        self.trail.append(literal)
+
+    def propagate(self) -> Optional[Sequence[int]]:
+        """
+        单元传播直到不动点
+
+        Returns:
+            发现矛盾时返回所有文字都为假的子句，否则返回None
+        """
+        value = self.value
+        level = self.level
+        reason = self.reason
+        trail = self.trail
+        implications = self.implications
+        watches = self.watches
+        current = len(self.trail_limits)
+
+        while self.head < len(trail):
+            false_literal = trail[self.head] ^ 1
+            self.head += 1
+
+            for literal in implications[false_literal]:
+                state = value[literal]
+                if state == 1:
+                    continue
+                if state == -1:
+                    return literal, false_literal
+                value[literal] = 1
+                value[literal ^ 1] = -1
+                level[literal >> 1] = current
+                reason[literal >> 1] = (literal, false_literal)
+                trail.append(literal)
+
+            watching = watches[false_literal]
+            kept = 0
+            index = 0
+            count = len(watching)
+            while index < count:
+                clause = watching[index]
+                index += 1
+                # 保证刚变为假的监视文字位于第1位
+                if clause[0] == false_literal:
+                    clause[0] = clause[1]
+                    clause[1] = false_literal
+                first = clause[0]
+                if value[first] == 1:
+                    watching[kept] = clause
+                    kept += 1
+                    continue
+
+                for position in range(2, len(clause)):
+                    literal = clause[position]
+                    if value[literal] != -1:
+                        clause[1] = literal
+                        clause[position] = false_literal
+                        watches[literal].append(clause)
+                        break
+                else:
+                    watching[kept] = clause
+                    kept += 1
+                    if value[first] == -1:
+                        while index < count:
+                            watching[kept] = watching[index]
+                            kept += 1
+                            index += 1
+                        del watching[kept:]
+                        return clause
+                    value[first] = 1
+                    value[first ^ 1] = -1
+                    level[first >> 1] = current
+                    reason[first >> 1] = clause
+                    trail.append(first)
+            del watching[kept:]
+        return None
+
+    def _bump(self, variable: int) -> None:
+        """
+        提高参与冲突的变量及其单元格的活跃度
+
+        Args:
+            variable: 内部变量下标（从0开始）
+        """
+        self.activity[variable] += self.increment
+        if variable < self.cell_count * self.size:
+            self.cell_activity[variable // self.size] += self.increment
+        if self.activity[variable] > 1e100:
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.cell_activity = [activity * 1e-100 for activity in self.cell_activity]
+            self.increment *= 1e-100
+
+    def analyze(self, conflict: Sequence[int]) -> tuple[list[int], int]:
+        """
+        从矛盾子句推导第一唯一蕴含点（1-UIP）学习子句
+
+        Args:
+            conflict: 所有文字都为假的子句
+
+        Returns:
+            (学习子句（第0位是回跳后被推出的文字，第1位是回跳层的文字）, 回跳层)
+        """
+        level = self.level
+        reason = self.reason
+        trail = self.trail
+        current = len(self.trail_limits)
+        seen = set()
+        learnt = [0]
+        pending = 0
+        index = len(trail) - 1
+        literal = -1
+        literals = conflict
+
+        while True:
+            for other in literals:
+                variable = other >> 1
+                if other == literal or variable in seen or level[variable] == 0:
+                    continue
+                seen.add(variable)
+                self._bump(variable)
+                if level[variable] == current:
+                    pending += 1
+                else:
+                    learnt.append(other)
+
+            # 沿trail向前找到下一个需要展开的当前层文字
+            while trail[index] >> 1 not in seen:
+                index -= 1
+            literal = trail[index]
+            index -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            literals = reason[literal >> 1]
+        learnt[0] = literal ^ 1
+
+        # 删除推出原因全部已在子句中的文字
+        kept = [learnt[0]]
+        for other in learnt[1:]:
+            cause = reason[other >> 1]
+            if cause is None or any(q != other ^ 1 and q >> 1 not in seen and level[q >> 1] > 0 for q in cause):
+                kept.append(other)
+        learnt = kept
+
+        if len(learnt) == 1:
+            return learnt, 0
+        deepest = max(range(1, len(learnt)), key=lambda i: level[learnt[i] >> 1])
+        learnt[1], learnt[deepest] = learnt[deepest], learnt[1]
+        return learnt, level[learnt[1] >> 1]
+
+    def backtrack(self, target: int) -> None:
+        """
+        撤销target层之后的所有赋值
+
+        Args:
+            target: 回退到的决策层
+        """
+        if len(self.trail_limits) <= target:
+            return
+        mark = self.trail_limits[target]
+        value = self.value
+        reason = self.reason
+        for literal in self.trail[mark:]:
+            value[literal] = 0
+            value[literal ^ 1] = 0
+            reason[literal >> 1] = None
+        del self.trail[mark:]
+        del self.trail_limits[target:]
+        self.head = mark
+
+    def learn(self, learnt: list[int]) -> None:
+        """
+        加入学习子句并推出其第0位文字（调用前已回跳到回跳层）
+
+        Args:
+            learnt: analyze返回的学习子句
+        """
+        literal = learnt[0]
+        if len(learnt) == 1:
+            self._assign(literal, None)
+        elif len(learnt) == 2:
+            self.implications[learnt[0]].append(learnt[1])
+            self.implications[learnt[1]].append(learnt[0])
+            self._assign(literal, (literal, learnt[1]))
+        else:
+            self.watches[learnt[0]].append(learnt)
+            self.watches[learnt[1]].append(learnt)
+            self.learnts.append(learnt)
+            self.lbd[id(learnt)] = len({self.level[other >> 1] for other in learnt})
+            self._assign(literal, learnt)
+
+    def reduce(self) -> None:
+        """删除一半LBD较大的学习子句，正在作为推出原因的子句和LBD不超过2的子句保留"""
+        lbd = self.lbd
+        self.learnts.sort(key=lambda clause: lbd[id(clause)])
+        keep = len(self.learnts) // 2
+        kept = self.learnts[:keep]
+        for clause in self.learnts[keep:]:
+            first = clause[0]
+            if lbd[id(clause)] <= 2 or (self.value[first] == 1 and self.reason[first >> 1] is clause):
+                kept.append(clause)
+                continue
+            self.watches[clause[0]].remove(clause)
+            self.watches[clause[1]].remove(clause)
+            del lbd[id(clause)]
+        self.learnts = kept
+        self.learnt_limit += self.learnt_limit // 10
+
+    def select_cell(self) -> Optional[int]:
+        """
+        选择剩余候选数最少的空格，同样少时选择活跃度最高的单元格
+
+        Returns:
+            单元格下标，所有单元格都已填好时返回None
+        """
+        value = self.value
+        size = self.size
+        best = None
+        best_key = None
+        for cell in range(self.cell_count):
+            base = 2 * cell * size
+            remaining = 0
+            for literal in range(base, base + 2 * size, 2):
+                state = value[literal]
+                if state == 1:
+                    break
+                if state == 0:
+                    remaining += 1
+            else:
+                key = (remaining, -self.cell_activity[cell])
+                if best_key is None or key < best_key:
+                    best = cell
+                    best_key = key
+                    if remaining <= 1:
+                        break
+        return best
+
+    def search(self, budget: Optional[int] = None) -> Optional[bool]:
+        """
+        搜索一个满足所有子句的赋值，状态保存在对象中，可以随时继续
+
+        Args:
+            budget: 本次最多做出的决策次数，None表示不限制
+
+        Returns:
+            找到解返回True，确定无解返回False，因预算用完而暂停返回None
+        """
+        if self.unsatisfiable:
+            return False
+        limit = None if budget is None else self.decisions + budget
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if not self.trail_limits:
+                    self.unsatisfiable = True
+                    return False
+                learnt, target = self.analyze(conflict)
+                self.backtrack(target)
+                self.learn(learnt)
+                self.increment /= _ACTIVITY_DECAY
+                continue
+
+            if self.conflicts >= self.next_restart:
+                self.restarts += 1
+                self.next_restart = self.conflicts + _RESTART_BASE * _luby(self.restarts)
+                self.backtrack(0)
+            if len(self.learnts) > self.learnt_limit:
+                self.reduce()
+
+            cell = self.select_cell()
+            if cell is None:
+                return True
+            if limit is not None and self.decisions >= limit:
+                return None
+
+            # 在新的决策层放置最小的候选数字
+            base = 2 * cell * self.size
+            literal = base
+            while self.value[literal] != 0:
+                literal += 2
+            self.decisions += 1
+            self.trail_limits.append(len(self.trail))
+            self._assign(literal, None)
+
+    def solution(self) -> Iterator[tuple[int, int]]:
+        """
+        读取找到的解
+
+        Yields:
+            (单元格下标, 数字)
+        """
+        size = self.size
+        for cell in range(self.cell_count):
+            base = 2 * cell * size
+            for digit in range(size):
+                if self.value[base + 2 * digit] == 1:
+                    yield cell, digit + 1
+                    break
+
+    def block_solution(self) -> None:
+        """禁止当前找到的解：加入一条要求至少一个非第0层单元格换一个数字的子句，回退到第0层"""
+        literals = []
+        for cell, digit in self.solution():
+            variable = self.variable(cell, digit)
+            if self.level[variable - 1] > 0:
+                literals.append(-variable)
+        self.backtrack(0)
+        self.add_clause(literals)
@@ -0,0 +1,354 @@
+# src/sudoku/cli.py
+"""
+命令行模块，批量求解或校验文件与标准输入中的谜题，每个谜题的结果输出为一行JSON。
+
+用法（在src目录运行）：
+    python -m sudoku solve puzzles.txt                          # 标准数独，每行一个谜题
+    python -m sudoku solve --rules killer.json --jobs 4 a.txt b.txt
+    cat puzzles.txt | python -m sudoku solve --timeout 2        # 不指定文件或指定"-"时读取标准输入
+    python -m sudoku solve --validate-only puzzles.txt          # 只检查谜题能否解析、与规则是否兼容
+
+谜题文件每行一个谜题，支持utils.parser的紧凑格式和分隔格式，跳过空行和以'#'开头的注释行；
+文件以内存映射方式流式读取。结果按输入顺序输出，解与该行谜题的格式相同（紧凑格式无法表示大于9的数字，
+尺寸超过9时总是输出分隔格式）。
+
+规则文件是一个JSON对象，所有字段都可以省略（省略时为行、列、正方形宫规则）：
+    "block": 宫的[行数, 列数]，null表示不使用宫规则
+    "non_consecutive": 为true时加入非连续规则
+    "thermometers": 温度计列表，每个温度计是从灯泡开始的坐标字符串，例如"C1B1A1"
+    "killer": 笼子列表，每个笼子是{"sum": 和值, "cells": 坐标字符串}
+坐标用字母表示行、数字表示列；字符串中含空格时按分隔格式解析，例如"B8 B9 B10"。
+"""
+
+import argparse
+import json
+import sys
+from math import isqrt
+from typing import Iterable, Iterator, Optional, TextIO
+from utils import (is_spaced_line, parse_compact_thermometer, parse_puzzle_line, parse_spaced_thermometer,
+                   read_puzzle_lines)
+from .board import Board
+from .exceptions import SudokuError
+from .rules import BlockRule, ColumnRule, KillerRule, NonConsecutiveRule, Rule, RowRule, ThermometerRule
+from .solver import Solver
+
+# 结果中的状态
+SOLVED = "solved"
+UNSOLVABLE = "unsolvable"
+TIMEOUT = "timeout"
+VALID = "valid"
+INVALID = "invalid"
+ERROR = "error"
+
+
+def _parse_cells(text: str) -> list[tuple[int, int]]:
+    """
+    解析坐标字符串
+
+    Args:
+        text: 紧凑格式如"A1B1"，或分隔格式如"B8 B9 B10"
+
+    Returns:
+        坐标列表
+    """
+    if any(character.isspace() for character in text.strip()):
+        return parse_spaced_thermometer(text)
+    return parse_compact_thermometer(text.strip())
+
+
+def load_rules(path: Optional[str]) -> list[Rule]:
+    """
+    读取规则文件
+
+    Args:
+        path: 规则文件路径，None表示标准数独规则
+
+    Returns:
+        规则列表
+
+    Raises:
+        OSError: 如果无法读取文件
+        ValueError: 如果文件内容不是合法的规则描述
+    """
+    spec = {}
+    if path is not None:
+        with open(path, encoding="utf-8") as file:
+            spec = json.load(file)
+        if not isinstance(spec, dict):
+            raise ValueError("规则文件必须是JSON对象")
+        unknown = spec.keys() - {"block", "non_consecutive", "thermometers", "killer"}
+        if unknown:
+            raise ValueError(f"未知的规则字段: {', '.join(sorted(unknown))}")
+
+    rules = [RowRule(), ColumnRule()]
+    if "block" not in spec:
+        rules.append(BlockRule())
+    elif spec["block"] is not None:
+        try:
+            box_rows, box_cols = spec["block"]
+        except (TypeError, ValueError):
+            raise ValueError(f"block必须是[行数, 列数]或null: {spec['block']!r}") from None
+        rules.append(BlockRule(box_rows, box_cols))
+
+    if spec.get("non_consecutive"):
+        rules.append(NonConsecutiveRule())
+
+    try:
+        if spec.get("thermometers"):
+            thermometer_rule = ThermometerRule()
+            for thermometer in spec["thermometers"]:
+                thermometer_rule.set(_parse_cells(thermometer))
+            rules.append(thermometer_rule)
+
+        if spec.get("killer"):
+            killer_rule = KillerRule()
+            for cage in spec["killer"]:
+                killer_rule.set(int(cage["sum"]), _parse_cells(cage["cells"]))
+            rules.append(killer_rule)
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError) as error:
+        raise ValueError(f"无法解析的温度计或笼子: {error!r}") from None
+
+    return rules
+
+
+def _read_lines(paths: Iterable[str]) -> Iterator[tuple[str, int, bytes]]:
+    """
+    逐行读取谜题文件，跳过空行和注释行；文件用utils.reader以内存映射方式流式读取
+
+    Args:
+        paths: 文件路径，"-"表示标准输入
+
+    Returns:
+        (来源, 行号, 去掉首尾空白的行)迭代器
+    """
+    for path in paths:
+        if path == "-":
+            yield from _numbered_lines("<stdin>", sys.stdin.buffer)
+        else:
+            for number, line in read_puzzle_lines(path):
+                yield path, number, line
+
+
+def _numbered_lines(source: str, file) -> Iterator[tuple[str, int, bytes]]:
+    """
+    为标准输入中的有效行编号（标准输入不能内存映射）
+
+    Args:
+        source: 来源名称
+        file: 二进制文件对象
+
+    Returns:
+        (来源, 行号, 去掉首尾空白的行)迭代器
+    """
+    for number, line in enumerate(file, 1):
+        line = line.strip()
+        if line and not line.startswith(b"#"):
+            yield source, number, line
+
+
+def _load_board(line: bytes, spaced: Optional[bool], rules: list[Rule]) -> tuple[Board, bool]:
+    """
+    解析一行谜题并检查与规则是否兼容
+
+    Args:
+        line: 一行谜题
+        spaced: True为分隔格式，False为紧凑格式，None时自动判断
+        rules: 规则
+
+    Returns:
+        (棋盘, 该行是否为分隔格式)
+
+    Raises:
+        ValueError: 如果无法解析，或格数不是平方数、数字超出范围
+        SudokuError: 如果棋盘与某条规则不兼容
+    """
+    if spaced is None:
+        spaced = is_spaced_line(line)
+    puzzle = parse_puzzle_line(line, spaced)
+    size = isqrt(len(puzzle))
+    if size == 0 or size * size != len(puzzle):
+        raise ValueError(f"谜题有{len(puzzle)}格，不是平方数")
+    if max(puzzle) > size:
+        raise ValueError(f"数字{max(puzzle)}超出1-{size}的范围")
+    board = Board(size)
+    board.load_puzzle(puzzle)
+    for rule in rules:
+        rule.validate_compatibility(board)
+    return board, spaced
+
+
+def _solution_text(board: Board, spaced: bool) -> str:
+    """
+    把解格式化为与输入相同的格式；紧凑格式无法表示大于9的数字，尺寸超过9时总是使用空格分隔格式
+
+    Args:
+        board: 求解后的棋盘
+        spaced: 输入是否为分隔格式
+
+    Returns:
+        解的字符串
+    """
+    if spaced or board.size > 9:
+        return " ".join(map(str, board.data))
+    return "".join(map(str, board.data))
+
+
+def _write(output: TextIO, record: dict) -> None:
+    """
+    输出一行JSON并立即刷新，使下游可以边求解边读取
+
+    Args:
+        output: 输出流
+        record: 结果
+    """
+    output.write(json.dumps(record, ensure_ascii=False) + "\n")
+    output.flush()
+
+
+def solve_command(args: argparse.Namespace, rules: list[Rule], output: TextIO) -> int:
+    """
+    求解所有谜题；结果按输入顺序输出，不能解析或与规则不兼容的谜题输出错误记录，
+    排在前面的谜题的结果输出之前先缓存
+
+    Args:
+        args: 命令行参数
+        rules: 规则
+        output: 输出流
+
+    Returns:
+        退出状态：所有谜题都能解析且与规则兼容时为0，否则为1
+    """
+    # solve_many中的下标 -> (输入序号, 来源, 行号, 是否为分隔格式)
+    locations = {}
+    # 输入序号 -> 等待前面的结果输出的记录
+    buffered = {}
+    next_sequence = 0
+    errors = 0
+
+    def emit(sequence: int, record: dict) -> None:
+        nonlocal next_sequence
+        buffered[sequence] = record
+        while next_sequence in buffered:
+            _write(output, buffered.pop(next_sequence))
+            next_sequence += 1
+
+    def puzzles() -> Iterator[Board]:
+        nonlocal errors
+        index = 0
+        for sequence, (source, number, line) in enumerate(_read_lines(args.inputs)):
+            try:
+                board, spaced = _load_board(line, args.spaced, rules)
+            except (ValueError, SudokuError) as error:
+                errors += 1
+                emit(sequence, {"source": source, "line": number, "status": ERROR, "error": str(error)})
+                continue
+            locations[index] = (sequence, source, number, spaced)
+            index += 1
+            yield board
+
+    # 批量求解模块只在求解时导入，校验模式不需要
+    from .batch import solve_many
+
+    for result in solve_many(puzzles(), rules, workers=args.jobs, chunksize=args.chunksize, timeout=args.timeout,
+                             engine=args.engine):
+        sequence, source, number, spaced = locations.pop(result.index)
+        if result.solution is not None:
+            status = SOLVED
+        elif result.timed_out:
+            status = TIMEOUT
+        else:
+            status = UNSOLVABLE
+        record = {"source": source, "line": number, "status": status, "steps": result.steps,
+                  "elapsed": round(result.elapsed, 6)}
+        if result.solution is not None:
+            record["solution"] = _solution_text(result.solution, spaced)
+        emit(sequence, record)
+    return 1 if errors else 0
+
+
+def validate_command(args: argparse.Namespace, rules: list[Rule], output: TextIO) -> int:
+    """
+    只检查谜题：能否解析、与规则是否兼容、已填数字是否违反规则，不求解
+
+    Args:
+        args: 命令行参数
+        rules: 规则
+        output: 输出流
+
+    Returns:
+        退出状态：所有谜题都有效时为0，否则为1
+    """
+    failures = 0
+    for source, number, line in _read_lines(args.inputs):
+        record = {"source": source, "line": number}
+        try:
+            board, _ = _load_board(line, args.spaced, rules)
+        except (ValueError, SudokuError) as error:
+            record.update(status=ERROR, error=str(error))
+        else:
+            record["status"] = VALID if Solver(board, *rules).is_valid() else INVALID
+        if record["status"] != VALID:
+            failures += 1
+        _write(output, record)
+    return 1 if failures else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    构建命令行参数解析器
+
+    Returns:
+        参数解析器
+    """
+    parser = argparse.ArgumentParser(prog="python -m sudoku", description="数独求解器命令行")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solve = commands.add_parser("solve", help="求解文件或标准输入中的谜题，每个谜题输出一行JSON")
+    solve.add_argument("inputs", nargs="*", default=["-"], help="谜题文件，每行一个谜题；省略或为-时读取标准输入")
+    solve.add_argument("--rules", help="规则文件（JSON），默认为标准数独规则")
+    solve.add_argument("--jobs", "-j", type=int, default=1, help="并行求解的进程数，默认为1（在当前进程中求解）")
+    solve.add_argument("--timeout", type=float, help="每个谜题的超时秒数（DLX引擎不受限制）")
+    solve.add_argument("--engine", choices=Solver.ENGINES, default="backtracking", help="求解引擎")
+    solve.add_argument("--chunksize", type=int, default=64, help="并行求解时每批提交的谜题数")
+    solve.add_argument("--output", "-o", help="结果文件，默认输出到标准输出")
+    solve.add_argument("--validate-only", action="store_true", help="只检查谜题能否解析、与规则是否兼容，不求解")
+    puzzle_format = solve.add_mutually_exclusive_group()
+    puzzle_format.add_argument("--compact", dest="spaced", action="store_false", default=None,
+                               help="谜题为紧凑格式（默认逐行自动判断）")
+    puzzle_format.add_argument("--spaced", dest="spaced", action="store_true", help="谜题为分隔格式")
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    命令行入口
+
+    Args:
+        argv: 命令行参数，默认为sys.argv[1:]
+
+    Returns:
+        退出状态
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs必须是正整数")
+    if args.timeout is not None and args.timeout <= 0:
+        parser.error("--timeout必须是正数")
+
+    try:
+        rules = load_rules(args.rules)
+    except (OSError, ValueError) as error:
+        parser.error(f"无法读取规则文件: {error}")
+
+    output = sys.stdout if args.output is None else open(args.output, "w", encoding="utf-8")
+    try:
+        if args.validate_only:
+            return validate_command(args, rules, output)
+        return solve_command(args, rules, output)
+    except OSError as error:
+        print(f"{parser.prog}: 错误: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
@@ -0,0 +1,530 @@
+# src/sudoku/compiler.py
+"""
+规则编译模块，把所有规则降为一个共享的约束图：全不同组、和组、有序链和两两差值约束，
+合并重叠的约束，并按规则的几何结构缓存供相同规则的谜题复用；每个求解器用各自的检查器按历史拒绝率排列检查顺序。
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Optional, Sequence
+from .board import Board
+from .units import UnitTable, merge_tables
+
+# 最多缓存的约束图个数
+_CACHE_SIZE = 64
+
+# (棋盘尺寸, 规则cache_key元组) -> 约束图
+_compiled: OrderedDict = OrderedDict()
+# 保护_compiled，异步求解时多个线程同时创建求解器
+_compiled_lock = threading.Lock()
+
+
+class _SumGroup:
+    """和组：一组互不相同的单元格所填数字的集合必须包含于某个允许的数字组合"""
+
+    def __init__(self, cells: tuple[int, ...], total: int, combinations: frozenset[int]):
+        """
+        Args:
+            cells: 单元格下标
+            total: 和值
+            combinations: 允许的数字组合掩码
+        """
+        self.cells = cells
+        self.total = total
+        self.combinations = combinations
+        # 已填数字掩码 -> 是否仍可能满足；只添加不修改，多个线程写入的总是相同的值
+        self.options = {}
+
+    def check(self, data: Sequence[int], cell: int, digit: int) -> bool:
+        """
+        检查已填数字是否仍属于某个允许的组合（数字不重复由全不同组保证）
+
+        Args:
+            data: 棋盘数据
+            cell: 刚放置数字的单元格
+            digit: 刚放置的数字
+
+        Returns:
+            如果满足约束返回True，否则返回False
+        """
+        used = 0
+        for other in self.cells:
+            used |= 1 << data[other]
+        # 空格对应第0位
+        used &= ~1
+        valid = self.options.get(used)
+        if valid is None:
+            valid = self.options[used] = any(combination & used == used for combination in self.combinations)
+        return valid
+
+    def is_valid(self, data: Sequence[int]) -> bool:
+        """
+        整组检查
+
+        Args:
+            data: 棋盘数据
+
+        Returns:
+            如果满足约束返回True，否则返回False
+        """
+        return self.check(data, self.cells[0], data[self.cells[0]])
+
+
+class _Chain:
+    """有序链：沿链的数字严格递增"""
+
+    def __init__(self, size: int, cells: tuple[int, ...]):
+        """
+        Args:
+            size: 棋盘尺寸
+            cells: 从最小端开始的单元格下标
+        """
+        self.size = size
+        self.cells = cells
+        # 单元格 -> 在链上的位置
+        self.positions = {}
+        for position, cell in enumerate(cells):
+            self.positions.setdefault(cell, []).append(position)
+
+    def check(self, data: Sequence[int], cell: int, digit: int) -> bool:
+        """
+        新数字须在静态取值范围内，且与两个方向上最近的已填数字之差不小于两者的距离
+
+        Args:
+            data: 棋盘数据
+            cell: 刚放置数字的单元格
+            digit: 刚放置的数字
+
+        Returns:
+            如果满足约束返回True，否则返回False
+        """
+        cells = self.cells
+        length = len(cells)
+        for position in self.positions[cell]:
+            if digit <= position or digit > self.size - (length - 1 - position):
+                return False
+
+            for distance in range(1, position + 1):
+                previous_digit = data[cells[position - distance]]
+                if previous_digit != 0:
+                    if digit - previous_digit < distance:
+                        return False
+                    break
+
+            for distance in range(1, length - position):
+                next_digit = data[cells[position + distance]]
+                if next_digit != 0:
+                    if next_digit - digit < distance:
+                        return False
+                    break
+        return True
+
+    def is_valid(self, data: Sequence[int]) -> bool:
+        """
+        整链检查：已填数字在静态取值范围内，且相邻已填数字之差不小于两者的距离
+
+        Args:
+            data: 棋盘数据
+
+        Returns:
+            如果满足约束返回True，否则返回False
+        """
+        length = len(self.cells)
+        previous_position = -1
+        previous_digit = 0
+        for position, cell in enumerate(self.cells):
+            digit = data[cell]
+            if digit == 0:
+                continue
+            if digit <= position or digit > self.size - (length - 1 - position):
+                return False
+            if previous_position >= 0 and digit - previous_digit < position - previous_position:
+                return False
+            previous_position = position
+            previous_digit = digit
+        return True
+
+
+class _Differences:
+    """一个单元格的所有两两差值约束：与每个相关单元格的数字之差的绝对值不能取某些值"""
+
+    def __init__(self, cell: int, partners: tuple[tuple[int, int], ...]):
+        """
+        Args:
+            cell: 单元格下标
+            partners: (相关单元格, 禁止的差值掩码)，第d位为1表示差的绝对值不能为d
+        """
+        self.cells = (cell,)
+        self.partners = partners
+
+    def check(self, data: Sequence[int], cell: int, digit: int) -> bool:
+        """
+        检查新数字与相关的已填数字之差
+
+        Args:
+            data: 棋盘数据
+            cell: 刚放置数字的单元格
+            digit: 刚放置的数字
+
+        Returns:
+            如果满足约束返回True，否则返回False
+        """
+        for other, forbidden in self.partners:
+            other_digit = data[other]
+            if other_digit != 0 and forbidden >> abs(digit - other_digit) & 1:
+                return False
+        return True
+
+    def is_valid(self, data: Sequence[int]) -> bool:
+        """
+        整体检查
+
+        Args:
+            data: 棋盘数据
+
+        Returns:
+            如果满足约束返回True，否则返回False
+        """
+        digit = data[self.cells[0]]
+        return digit == 0 or self.check(data, self.cells[0], digit)
+
+
+class ConstraintGraph:
+    """
+    约束图
+
+    规则通过Rule.compile把自身降为四类约束：全不同组（一组数字不能重复的单元格）、和组（杀手笼子的数字组合）、
+    有序链（温度计）和两两差值约束（非连续）。添加时合并重复的约束：相同或被其他组包含的全不同组、
+    相同单元格的和组（允许的组合取交集）、相同或是其他链子序列的有序链、同一对单元格的差值约束。
+
+    全不同组构成候选数状态的单元表，由位掩码保证，不再逐步检查；其余约束按单元格建立索引，
+    放置数字时只检查经过该单元格的约束。约束图按规则的几何结构缓存，finish之后不再修改，
+    可以被多个线程中的求解器共享；逐步检查由每个求解器各自的GraphChecker完成，
+    检查器结束时把检查和拒绝次数累加到约束图中（由锁保护），新的检查器按累积的拒绝率排列检查顺序
+    """
+
+    def __init__(self, size: int):
+        """
+        初始化空的约束图
+
+        Args:
+            size: 棋盘尺寸
+        """
+        self.size = size
+
+        self.tables = []
+        self.groups = []
+        self.sums: dict[frozenset[int], tuple[tuple[int, ...], int, frozenset[int]]] = {}
+        # 有序链 -> 添加它的规则下标
+        self.chains: dict[tuple[int, ...], int] = {}
+        # (较小的单元格, 较大的单元格) -> 禁止的差值掩码
+        self.differences: dict[tuple[int, int], int] = {}
+
+        # 正在编译的规则下标，由compile_rules设置；合并后的约束和单元记入最先添加它的规则
+        self.owner = -1
+        # 单元格集合 -> 添加该全不同组的规则下标
+        self.group_owners: dict[frozenset[int], int] = {}
+        # 和组、差值约束 -> 添加它的规则下标
+        self.sum_owners: dict[frozenset[int], int] = {}
+        self.difference_owners: dict[tuple[int, int], int] = {}
+
+        # 不能编译的规则下标，求解器继续调用它们的is_valid和is_valid_move
+        self.residual = []
+        # 不能完全由全不同组描述的规则下标（包括不能编译的规则）
+        self.move_rules = []
+        # 添加和组、有序链、差值约束的次数，用于判断规则是否只添加了全不同组
+        self.additions = 0
+
+        # 以下由finish生成
+        self.table: Optional[UnitTable] = None
+        self.constraints = []
+        # 约束下标 -> 规则下标，单元表中的单元下标 -> 规则下标，用于统计每条规则的检查和拒绝次数
+        self.owners: tuple[int, ...] = ()
+        self.unit_owners: tuple[int, ...] = ()
+        # 单元格 -> 经过该单元格的约束下标，按添加顺序排列
+        self.order: tuple[tuple[int, ...], ...] = ()
+
+        # 所有检查器累积的检查和拒绝次数，只在持有锁时读写
+        self.lock = threading.Lock()
+        self.checks = []
+        self.rejections = []
+
+    def add_table(self, table: UnitTable) -> None:
+        """
+        添加单元表中的所有单元作为全不同组
+
+        Args:
+            table: 尺寸与约束图相同的单元表
+        """
+        self.tables.append(table)
+        for unit in table.units:
+            self.group_owners.setdefault(frozenset(unit), self.owner)
+
+    def add_group(self, cells: Sequence[int]) -> None:
+        """
+        添加全不同组
+
+        Args:
+            cells: 单元格下标
+        """
+        if len(cells) >= 2:
+            self.groups.append(tuple(cells))
+            self.group_owners.setdefault(frozenset(cells), self.owner)
+
+    def add_sum(self, cells: Sequence[int], total: int, combinations: Sequence[int]) -> None:
+        """
+        添加和组，调用方还需用add_group保证组内数字不重复
+
+        Args:
+            cells: 单元格下标
+            total: 和值
+            combinations: 和为total的数字组合掩码
+        """
+        self.additions += 1
+        key = frozenset(cells)
+        combinations = frozenset(combinations)
+        existing = self.sums.get(key)
+        if existing is not None:
+            # 和值不同的同一组单元格只剩两者都允许的组合
+            combinations &= existing[2]
+        self.sums[key] = (tuple(cells), total, combinations)
+        self.sum_owners.setdefault(key, self.owner)
+
+    def add_chain(self, cells: Sequence[int]) -> None:
+        """
+        添加有序链
+
+        Args:
+            cells: 从最小端开始的单元格下标
+        """
+        self.additions += 1
+        self.chains.setdefault(tuple(cells), self.owner)
+
+    def add_difference(self, a: int, b: int, difference: int) -> None:
+        """
+        添加两两差值约束：两个单元格的数字之差的绝对值不能等于difference
+
+        Args:
+            a: 单元格下标
+            b: 单元格下标
+            difference: 禁止的差值
+        """
+        self.additions += 1
+        key = (a, b) if a < b else (b, a)
+        self.differences[key] = self.differences.get(key, 0) | 1 << difference
+        self.difference_owners.setdefault(key, self.owner)
+
+    def finish(self) -> None:
+        """生成单元表和按单元格索引的检查列表"""
+        size = self.size
+
+        tables = list(self.tables)
+        if self.groups:
+            tables.append(UnitTable(size, self.groups))
+        table = merge_tables(size, tuple(tables)) if tables else UnitTable(size, [])
+        # 被其他组包含的组不会排除更多的候选数
+        keys = [frozenset(unit) for unit in table.units]
+        kept = [unit for unit, key in zip(table.units, keys) if not any(key < other for other in keys)]
+        self.table = table if len(kept) == len(table.units) else UnitTable(size, kept)
+        self.unit_owners = tuple(self.group_owners[frozenset(unit)] for unit in self.table.units)
+
+        constraints = [_SumGroup(cells, total, combinations) for cells, total, combinations in self.sums.values()]
+        owners = list(self.sum_owners.values())
+
+        chains = list(self.chains)
+        for chain in chains:
+            if not any(other != chain and _is_subsequence(chain, other) for other in chains):
+                constraints.append(_Chain(size, chain))
+                owners.append(self.chains[chain])
+
+        partners = {}
+        for (a, b), forbidden in self.differences.items():
+            partners.setdefault(a, []).append((b, forbidden))
+            partners.setdefault(b, []).append((a, forbidden))
+        for cell in sorted(partners):
+            constraints.append(_Differences(cell, tuple(partners[cell])))
+            other = partners[cell][0][0]
+            owners.append(self.difference_owners[(cell, other) if cell < other else (other, cell)])
+
+        self.constraints = constraints
+        self.owners = tuple(owners)
+        self.checks = [0] * len(constraints)
+        self.rejections = [0] * len(constraints)
+        order = [[] for _ in range(size * size)]
+        for index, constraint in enumerate(constraints):
+            for cell in dict.fromkeys(constraint.cells):
+                order[cell].append(index)
+        self.order = tuple(map(tuple, order))
+
+    def checker(self) -> 'GraphChecker':
+        """
+        创建逐步检查器，每个单元格的检查顺序按目前累积的拒绝率从高到低排列，拒绝率相同时保持添加顺序
+
+        Returns:
+            检查器
+        """
+        with self.lock:
+            rates = [rejections / checks if checks else 0.0
+                     for checks, rejections in zip(self.checks, self.rejections)]
+        order = tuple(tuple(sorted(indexes, key=rates.__getitem__, reverse=True)) for indexes in self.order)
+        return GraphChecker(self, order)
+
+    def record(self, checks: Sequence[int], rejections: Sequence[int]) -> None:
+        """
+        累加检查器的检查和拒绝次数
+
+        Args:
+            checks: 每个约束新增的检查次数
+            rejections: 每个约束新增的拒绝次数
+        """
+        with self.lock:
+            for index, count in enumerate(checks):
+                self.checks[index] += count
+            for index, count in enumerate(rejections):
+                self.rejections[index] += count
+
+    def is_valid(self, board: Board) -> bool:
+        """
+        检查棋盘是否满足所有编译后的约束，每个约束只检查一次
+
+        Args:
+            board: 要检查的棋盘
+
+        Returns:
+            如果满足所有约束返回True，否则返回False
+        """
+        data = board.data
+        for unit in self.table.units:
+            seen = 0
+            for cell in unit:
+                digit = data[cell]
+                if digit != 0:
+                    bit = 1 << digit
+                    if seen & bit:
+                        return False
+                    seen |= bit
+        for constraint in self.constraints:
+            if not constraint.is_valid(data):
+                return False
+        return True
+
+    def __str__(self) -> str:
+        """返回约束个数摘要"""
+        sums = sum(isinstance(constraint, _SumGroup) for constraint in self.constraints)
+        chains = sum(isinstance(constraint, _Chain) for constraint in self.constraints)
+        return (f"约束图: {len(self.table)}个全不同组 {sums}个和组 {chains}条有序链 "
+                f"{len(self.differences)}对差值约束  未编译规则{len(self.residual)}条")
+
+
+class GraphChecker:
+    """
+    约束图的逐步检查器，每个求解器一个：检查顺序和检查、拒绝次数属于求解器自己，不与其他线程共享
+    """
+
+    def __init__(self, graph: ConstraintGraph, order: tuple[tuple[int, ...], ...]):
+        """
+        Args:
+            graph: 约束图
+            order: 单元格 -> 经过该单元格的约束下标，按检查顺序排列
+        """
+        self.graph = graph
+        self.size = graph.size
+        self.constraints = graph.constraints
+        self.order = order
+        self.checks = [0] * len(graph.constraints)
+        self.rejections = [0] * len(graph.constraints)
+        # 上一次拒绝的约束下标
+        self.rejected = -1
+        # 已经累加到约束图中的次数
+        self.recorded_checks = [0] * len(graph.constraints)
+        self.recorded_rejections = [0] * len(graph.constraints)
+
+    def is_valid_move(self, board: Board, row: int, col: int, digit: int) -> bool:
+        """
+        检查经过该单元格的约束（全不同组由候选数状态保证，不在此检查）
+
+        Args:
+            board: 要检查的棋盘
+            row: 行索引
+            col: 列索引
+            digit: 刚放置的数字
+
+        Returns:
+            如果满足所有约束返回True，否则返回False
+        """
+        data = board.data
+        cell = row * self.size + col
+        constraints = self.constraints
+        checks = self.checks
+        for index in self.order[cell]:
+            checks[index] += 1
+            if not constraints[index].check(data, cell, digit):
+                self.rejections[index] += 1
+                self.rejected = index
+                return False
+        return True
+
+    def record(self) -> None:
+        """把上次累加之后新增的检查和拒绝次数累加到约束图中，供之后创建的检查器排列检查顺序"""
+        checks = [count - recorded for count, recorded in zip(self.checks, self.recorded_checks)]
+        rejections = [count - recorded for count, recorded in zip(self.rejections, self.recorded_rejections)]
+        if any(checks):
+            self.graph.record(checks, rejections)
+            self.recorded_checks = self.checks[:]
+            self.recorded_rejections = self.rejections[:]
+
+
+def _is_subsequence(chain: tuple[int, ...], other: tuple[int, ...]) -> bool:
+    """
+    检查chain是否按相同顺序出现在other中（other严格递增时chain必然严格递增）
+
+    Args:
+        chain: 有序链
+        other: 另一条有序链
+
+    Returns:
+        如果chain是other的子序列返回True
+    """
+    remaining = iter(other)
+    return all(cell in remaining for cell in chain)
+
+
+def compile_rules(board: Board, rules: Sequence) -> ConstraintGraph:
+    """
+    把规则编译为约束图；所有规则都有cache_key时按(棋盘尺寸, 规则键)缓存，相同几何结构的谜题共享同一个约束图
+
+    Args:
+        board: 要求解的棋盘（规则已通过兼容性检查）
+        rules: 规则
+
+    Returns:
+        约束图
+    """
+    rule_keys = tuple(rule.cache_key() for rule in rules)
+    key = None if None in rule_keys else (board.size, rule_keys)
+    if key is not None:
+        with _compiled_lock:
+            graph = _compiled.get(key)
+            if graph is not None:
+                _compiled.move_to_end(key)
+                return graph
+
+    graph = ConstraintGraph(board.size)
+    for index, rule in enumerate(rules):
+        graph.owner = index
+        additions = graph.additions
+        if not rule.compile(board, graph):
+            graph.residual.append(index)
+            graph.move_rules.append(index)
+        elif graph.additions != additions:
+            graph.move_rules.append(index)
+    graph.finish()
+
+    if key is not None:
+        with _compiled_lock:
+            # 其他线程可能同时编译了相同的规则，使用先写入缓存的约束图
+            graph = _compiled.setdefault(key, graph)
+            _compiled.move_to_end(key)
+            if len(_compiled) > _CACHE_SIZE:
+                _compiled.popitem(last=False)
+    return graph
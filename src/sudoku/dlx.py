@@ -0,0 +1,198 @@
+# src/sudoku/dlx.py
+"""
+舞蹈链（Dancing Links）模块，把单元规则编译为精确覆盖问题并用Algorithm X求解。
+"""
+
+from typing import Iterator, Optional
+from .candidates import CandidateState
+
+
+class DancingLinks:
+    """
+    舞蹈链精确覆盖求解器
+
+    每个空格与候选数字组成矩阵的一行，每一行覆盖以下列：
+    - 单元格约束：每个空格恰好填一个数字
+    - 单元-数字约束：每个单元（行、列、宫等）中尚未出现的数字恰好出现一次
+    已填数字对应的列在建矩阵时直接省略。节点链接保存在整数列表中，覆盖与恢复只修改链接。
+    """
+
+    def __init__(self, state: CandidateState):
+        """
+        根据候选数状态构建精确覆盖矩阵
+
+        Args:
+            state: 求解器的候选数状态，所有单元都必须包含全部数字
+        """
+        self.steps = 0
+        values = state.values
+
+        # 第0号节点是根节点，列头节点紧随其后
+        columns = {}
+        for cell, digit in enumerate(values):
+            if digit == 0:
+                columns[("cell", cell)] = len(columns) + 1
+        for index in range(len(state.units)):
+            missing = state.full_mask & ~state.unit_masks[index]
+            for digit in range(1, state.size + 1):
+                if missing >> digit & 1:
+                    columns[("unit", index, digit)] = len(columns) + 1
+
+        column_count = len(columns)
+        self.left = [i - 1 for i in range(column_count + 1)]
+        self.right = [i + 1 for i in range(column_count + 1)]
+        self.left[0] = column_count
+        self.right[column_count] = 0
+        self.up = list(range(column_count + 1))
+        self.down = list(range(column_count + 1))
+        self.column = list(range(column_count + 1))
+        self.sizes = [0] * (column_count + 1)
+        # 行节点 -> (单元格下标, 数字)
+        self.row_data = [None] * (column_count + 1)
+
+        for cell, digit in enumerate(values):
+            if digit != 0:
+                continue
+            candidates = state.candidates(cell)
+            while candidates:
+                bit = candidates & -candidates
+                candidates ^= bit
+                digit = bit.bit_length() - 1
+                row_columns = [columns[("cell", cell)]]
+                row_columns.extend(columns[("unit", index, digit)] for index in state.cell_units[cell])
+                self._add_row(row_columns, (cell, digit))
+
+    def _add_row(self, row_columns: list[int], data: tuple[int, int]) -> None:
+        """
+        向矩阵添加一行
+
+        Args:
+            row_columns: 该行覆盖的列头节点
+            data: 该行对应的(单元格下标, 数字)
+        """
+        first = len(self.column)
+        for offset, header in enumerate(row_columns):
+            node = first + offset
+            self.left.append(node - 1 if offset > 0 else first + len(row_columns) - 1)
+            self.right.append(node + 1 if offset < len(row_columns) - 1 else first)
+            self.up.append(self.up[header])
+            self.down.append(header)
+            self.down[self.up[header]] = node
+            self.up[header] = node
+            self.column.append(header)
+            self.sizes[header] += 1
+            self.row_data.append(data)
+
+    def _cover(self, header: int) -> None:
+        """
+        覆盖一列：把列头从列表中摘除，并摘除与该列冲突的所有行
+
+        Args:
+            header: 列头节点
+        """
+        left, right, up, down, column, sizes = self.left, self.right, self.up, self.down, self.column, self.sizes
+        right[left[header]] = right[header]
+        left[right[header]] = left[header]
+        i = down[header]
+        while i != header:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                sizes[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def _uncover(self, header: int) -> None:
+        """
+        按与覆盖相反的顺序恢复一列
+
+        Args:
+            header: 列头节点
+        """
+        left, right, up, down, column, sizes = self.left, self.right, self.up, self.down, self.column, self.sizes
+        i = up[header]
+        while i != header:
+            j = left[i]
+            while j != i:
+                sizes[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[header]] = header
+        left[right[header]] = header
+
+    def _choose_column(self) -> int:
+        """
+        选择剩余行数最少的列
+
+        Returns:
+            列头节点
+        """
+        right, sizes = self.right, self.sizes
+        best = right[0]
+        best_size = sizes[best]
+        header = right[best]
+        while header != 0 and best_size > 1:
+            if sizes[header] < best_size:
+                best = header
+                best_size = sizes[header]
+            header = right[header]
+        return best
+
+    def solutions(self) -> Iterator[list[tuple[int, int]]]:
+        """
+        使用显式栈执行Algorithm X，逐个生成所有解
+
+        Yields:
+            解对应的(单元格下标, 数字)列表
+        """
+        right, down, left, column = self.right, self.down, self.left, self.column
+        stack = []
+        descend = True
+
+        while True:
+            if descend:
+                # 所有列都被覆盖，找到解；继续时按回溯处理以寻找下一个解
+                if right[0] == 0:
+                    yield [self.row_data[node] for node in stack]
+                    descend = False
+                    continue
+                header = self._choose_column()
+                self._cover(header)
+                node = down[header]
+            else:
+                # 回溯：撤销上一层选择的行，尝试同一列的下一行
+                if not stack:
+                    return
+                node = stack.pop()
+                header = column[node]
+                j = left[node]
+                while j != node:
+                    self._uncover(column[j])
+                    j = left[j]
+                node = down[node]
+
+            if node == header:
+                # 该列的所有行都已尝试
+                self._uncover(header)
+                descend = False
+                continue
+
+            self.steps += 1
+            stack.append(node)
+            j = right[node]
+            while j != node:
+                self._cover(column[j])
+                j = right[j]
+            descend = True
+
+    def search(self) -> Optional[list[tuple[int, int]]]:
+        """
+        搜索第一个解
+
+        Returns:
+            解对应的(单元格下标, 数字)列表，如果无解则返回None
+        """
+        return next(self.solutions(), None)
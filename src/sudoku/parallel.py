@@ -0,0 +1,243 @@
+# src/sudoku/parallel.py
+"""
+并行搜索模块，把单个谜题的搜索树拆分为互不相交的子问题，使用进程池并行求解。
+"""
+
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import NamedTuple, Optional
+from .board import Board
+from .rules import Rule
+from .solver import Solver
+
+
+class ParallelResult(NamedTuple):
+    """并行搜索结果"""
+
+    # 找到的解个数（不超过limit）
+    count: int
+    # 找到的解，不保留解时为空列表
+    solutions: list[Board]
+    # 所有进程累计的尝试次数
+    steps: int
+    # 为True表示搜索树已经全部探索完，count是全部解的个数
+    complete: bool
+
+
+class _Outcome(NamedTuple):
+    """单个子问题一个时间片的运行结果"""
+
+    # 时间片内找到的解个数
+    count: int
+    # 时间片内找到的解，每个解是Board.to_bytes的结果，不保留解时为空列表
+    solutions: list[bytes]
+    # 预算用完时尚未探索部分拆分出的子问题
+    subproblems: list[bytes]
+    steps: int
+
+
+# 工作进程每尝试这么多次检查一次停止信号
+_STOP_CHECK_STEPS = 256
+
+# 工作进程中反序列化后的规则和求解器参数，每个进程只反序列化一次
+_worker_rules: tuple = ()
+_worker_options: dict = {}
+# 主进程找到足够的解后设置的停止信号
+_worker_stop = None
+
+
+def _init_worker(payload: bytes, stop) -> None:
+    """
+    工作进程初始化：反序列化规则配置，保存停止信号
+
+    Args:
+        payload: pickle序列化后的(规则元组, 求解器参数)
+        stop: 主进程共享的multiprocessing.Event
+    """
+    global _worker_rules, _worker_options, _worker_stop
+    _worker_rules, _worker_options = pickle.loads(payload)
+    _worker_stop = stop
+
+
+def _explore(solver: Solver, limit: Optional[int], budget: Optional[int], keep_solutions: bool,
+             stop=None) -> _Outcome:
+    """
+    在预算内寻找解，预算用完时把尚未探索的部分拆分为子问题
+
+    Args:
+        solver: 子问题的求解器
+        limit: 最多寻找的解个数，None表示不限制
+        budget: 本时间片最多尝试放置的次数，None表示不限制
+        keep_solutions: 是否保留找到的解
+        stop: 停止信号，设置后在_STOP_CHECK_STEPS次尝试之内放弃本时间片，不再拆分子问题
+
+    Returns:
+        运行结果
+    """
+    count = 0
+    solutions = []
+    start = solver.steps
+    while limit is None or count < limit:
+        chunk = None if budget is None else budget - (solver.steps - start)
+        if stop is not None and chunk is not None:
+            chunk = min(chunk, _STOP_CHECK_STEPS)
+        result = solver.next_solution(chunk)
+        if result is None:
+            if stop is not None and stop.is_set():
+                return _Outcome(count, solutions, [], solver.steps - start)
+            if solver.steps - start < budget:
+                continue
+            subproblems = [subproblem.to_bytes() for subproblem in solver.split()]
+            return _Outcome(count, solutions, subproblems, solver.steps - start)
+        if not result:
+            break
+        count += 1
+        if keep_solutions:
+            solutions.append(solver.board.to_bytes())
+    return _Outcome(count, solutions, [], solver.steps - start)
+
+
+def _explore_subproblem(data: bytes, size: int, limit: Optional[int], budget: int,
+                        keep_solutions: bool) -> _Outcome:
+    """
+    在工作进程中运行一个子问题的时间片
+
+    Args:
+        data: 子问题棋盘的to_bytes结果
+        size: 棋盘尺寸
+        limit: 最多寻找的解个数，None表示不限制
+        budget: 本时间片最多尝试放置的次数
+        keep_solutions: 是否保留找到的解
+
+    Returns:
+        运行结果
+    """
+    if _worker_stop.is_set():
+        return _Outcome(0, [], [], 0)
+    solver = Solver(Board.from_bytes(data, size), *_worker_rules, **_worker_options)
+    return _explore(solver, limit, budget, keep_solutions, _worker_stop)
+
+
+def search_parallel(board: Board, *rules: Rule, limit: Optional[int] = 1, workers: Optional[int] = None,
+                    budget: int = 2000, keep_solutions: bool = True, **options) -> ParallelResult:
+    """
+    并行搜索单个谜题的解
+
+    先在当前进程中搜索budget步，未结束时把剩余的搜索树拆分为子问题交给进程池。
+    每个子问题只运行budget步，未结束的子问题再次拆分并放回队列，
+    因此不平衡的子树会被动态拆细，空闲进程总能取到新的子问题。
+    找到limit个解后取消所有排队的子问题，并通过共享的停止信号通知正在运行的子问题，
+    它们在_STOP_CHECK_STEPS次尝试之内结束，结果被丢弃
+
+    Args:
+        board: 要求解的棋盘
+        *rules: 规则
+        limit: 最多寻找的解个数，None表示寻找全部的解
+        workers: 进程数，默认使用CPU核数；小于等于1时在当前进程中顺序搜索
+        budget: 每个时间片最多尝试放置的次数
+        keep_solutions: 是否保留找到的解，只统计个数时设为False以免占用内存
+        **options: 传给Solver的其他参数（只支持回溯引擎）
+
+    Returns:
+        并行搜索结果
+
+    Raises:
+        SudokuError: 如果棋盘与任何规则不兼容
+        ValueError: 如果选择了回溯以外的引擎
+    """
+    if options.get("engine", "backtracking") != "backtracking":
+        raise ValueError("并行搜索只支持回溯引擎")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    solver = Solver(board, *rules, **options)
+    size = solver.board.size
+    if workers <= 1:
+        outcome = _explore(solver, limit, None, keep_solutions)
+        solutions = [Board.from_bytes(data, size) for data in outcome.solutions]
+        return ParallelResult(outcome.count, solutions, outcome.steps, solver.result is False)
+
+    outcome = _explore(solver, limit, budget, keep_solutions)
+    count = outcome.count
+    solutions = outcome.solutions
+    steps = outcome.steps
+    # 后进先出地分配子问题，优先探索较深的子树，使排队的子问题数量保持较小
+    queue = outcome.subproblems[::-1]
+    pending = set()
+
+    if queue and (limit is None or count < limit):
+        payload = pickle.dumps((rules, options))
+        context = multiprocessing.get_context()
+        stop = context.Event()
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                       initargs=(payload, stop))
+        try:
+            while limit is None or count < limit:
+                while queue and len(pending) < workers:
+                    remaining = None if limit is None else limit - count
+                    pending.add(executor.submit(_explore_subproblem, queue.pop(), size, remaining, budget,
+                                                keep_solutions))
+                if not pending:
+                    break
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    outcome = future.result()
+                    count += outcome.count
+                    solutions.extend(outcome.solutions)
+                    steps += outcome.steps
+                    queue.extend(reversed(outcome.subproblems))
+        finally:
+            # 取消排队的子问题，并让正在运行的时间片尽快结束，它们的结果不再需要
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # 达到limit时剩余的子问题可能还有解，不能确认已经找到全部的解
+    complete = not queue and not pending and (limit is None or count < limit)
+    if limit is not None and count > limit:
+        # 多个进程可能同时找到解
+        count = limit
+        solutions = solutions[:limit]
+    solutions = [Board.from_bytes(data, size) for data in solutions]
+    return ParallelResult(count, solutions, steps, complete)
+
+
+def solve_parallel(board: Board, *rules: Rule, workers: Optional[int] = None, budget: int = 2000,
+                   **options) -> Optional[Board]:
+    """
+    并行求解单个谜题，任何进程找到解后立即停止其余的搜索
+
+    Args:
+        board: 要求解的棋盘
+        *rules: 规则
+        workers: 进程数，默认使用CPU核数
+        budget: 每个时间片最多尝试放置的次数
+        **options: 传给Solver的其他参数（只支持回溯引擎）
+
+    Returns:
+        求解后的棋盘，如果无解则返回None
+    """
+    result = search_parallel(board, *rules, limit=1, workers=workers, budget=budget, **options)
+    return result.solutions[0] if result.solutions else None
+
+
+def count_solutions_parallel(board: Board, *rules: Rule, limit: Optional[int] = None,
+                             workers: Optional[int] = None, budget: int = 2000, **options) -> int:
+    """
+    并行统计解的个数，累计找到limit个解后立即停止
+
+    Args:
+        board: 要求解的棋盘
+        *rules: 规则
+        limit: 最多统计的解个数，None表示统计全部
+        workers: 进程数，默认使用CPU核数
+        budget: 每个时间片最多尝试放置的次数
+        **options: 传给Solver的其他参数（只支持回溯引擎）
+
+    Returns:
+        找到的解个数（不超过limit）
+    """
+    return search_parallel(board, *rules, limit=limit, workers=workers, budget=budget, keep_solutions=False,
+                           **options).count
@@ -0,0 +1,135 @@
+# src/sudoku/progress.py
+"""
+求解进度模块，定义求解器的进度报告接口和内置实现。
+"""
+
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+
+class ProgressReporter(ABC):
+    """
+    进度报告抽象基类
+
+    求解器每推进interval次尝试调用一次update，搜索循环本身不调用任何报告代码；
+    一次搜索开始时调用start，搜索结束（找到解或确定无解）时调用close
+    """
+
+    # 两次update之间求解器最多推进的尝试次数
+    interval = 1024
+
+    def start(self) -> None:
+        """搜索开始时调用（默认不做任何处理）"""
+        pass
+
+    @abstractmethod
+    def update(self, steps: int) -> None:
+        """
+        报告当前进度
+
+        Args:
+            steps: 求解器累计的尝试次数
+        """
+        pass
+
+    def close(self) -> None:
+        """搜索结束时调用（默认不做任何处理）"""
+        pass
+
+
+class TqdmReporter(ProgressReporter):
+    """使用tqdm显示求解步数、速率和耗时，tqdm只在开始显示时导入"""
+
+    def __init__(self, desc: str = "求解进度", interval: int = 1024):
+        """
+        初始化tqdm进度报告
+
+        Args:
+            desc: 进度条描述
+            interval: 两次刷新之间的尝试次数
+        """
+        self.desc = desc
+        self.interval = interval
+        self.pbar = None
+        self.reported = 0
+
+    def start(self) -> None:
+        """创建tqdm进度条"""
+        from tqdm import tqdm
+
+        self.pbar = tqdm(
+            desc=self.desc,
+            unit="步",
+            bar_format="{desc}: {n}步 - 速率: {rate_fmt} - 已用: {elapsed}",
+        )
+        self.reported = 0
+
+    def update(self, steps: int) -> None:
+        """
+        把新增的步数更新到进度条
+
+        Args:
+            steps: 求解器累计的尝试次数
+        """
+        if self.pbar is not None:
+            self.pbar.update(steps - self.reported)
+            self.reported = steps
+
+    def close(self) -> None:
+        """关闭进度条"""
+        if self.pbar is not None:
+            self.pbar.close()
+            self.pbar = None
+
+
+class CallbackReporter(ProgressReporter):
+    """每隔一定步数或时间调用一次回调函数"""
+
+    def __init__(self, callback: Callable[[int], None], every: Optional[int] = None,
+                 every_ms: Optional[float] = None, interval: int = 1024):
+        """
+        初始化回调进度报告，every与every_ms都为None时每次update都调用回调
+
+        Args:
+            callback: 回调函数，参数为累计的尝试次数
+            every: 距上次回调至少经过的尝试次数
+            every_ms: 距上次回调至少经过的毫秒数
+            interval: 求解器两次update之间的尝试次数，决定检查条件的粒度
+        """
+        self.callback = callback
+        self.every = every
+        self.every_ms = every_ms
+        self.interval = min(interval, every) if every else interval
+        self.steps = 0
+        self.last_steps = 0
+        self.last_time = 0.0
+
+    def start(self) -> None:
+        """记录开始的时间"""
+        self.last_time = time.monotonic()
+
+    def update(self, steps: int) -> None:
+        """
+        满足步数或时间条件时调用回调
+
+        Args:
+            steps: 求解器累计的尝试次数
+        """
+        self.steps = steps
+        now = time.monotonic()
+        due = self.every is None and self.every_ms is None
+        if self.every is not None and steps - self.last_steps >= self.every:
+            due = True
+        if self.every_ms is not None and (now - self.last_time) * 1000 >= self.every_ms:
+            due = True
+        if due:
+            self.callback(steps)
+            self.last_steps = steps
+            self.last_time = now
+
+    def close(self) -> None:
+        """搜索结束时，如果最终步数还没有报告过则调用一次回调"""
+        if self.steps != self.last_steps:
+            self.callback(self.steps)
+            self.last_steps = self.steps
@@ -0,0 +1,286 @@
+# src/sudoku/propagation.py
+"""
+约束传播模块，在回溯分支之间反复应用推理技巧，直到候选数不再变化。
+"""
+
+from .candidates import CandidateState
+
+
+class _Contradiction(Exception):
+    """传播过程中发现矛盾（某空格没有候选数，或某单元缺少可以放置某数字的位置）"""
+
+
+class Propagator:
+    """
+    约束传播器
+
+    依次应用以下技巧直到不动点：
+    - 唯余（naked single）：空格只剩一个候选数
+    - 摒除（hidden single）：某数字在单元内只剩一个位置
+    - 区块（locked candidates）：某数字在单元A内的位置都落在A与单元B的交集中，则从B的其他单元格排除该数字，
+      对行宫、列宫交集即为pointing/claiming
+    - 规则传播：调用每条规则的propagate方法
+    所有放置与排除都经由求解器记录在候选数状态的trail中，回溯时由求解器统一撤销。
+
+    候选数状态把放置与排除的单元格记录在传播队列中，每轮只检查队列中的单元格影响到的空格、单元和交集，
+    首次运行时检查整个棋盘。回溯只会恢复到之前的不动点，不需要重新检查。
+    放置数字的单元格同时累积到state.placed中，规则传播钩子可以只处理上次调用以来放置的单元格。
+    每轮只为检查到的单元格计算一次候选数快照；放置与排除只会缩小候选数，基于快照的推理仍然成立
+    """
+
+    def __init__(self, solver):
+        """
+        初始化传播器，绑定候选数状态的传播队列
+
+        Args:
+            solver: 所属求解器
+        """
+        self.solver = solver
+        self.state: CandidateState = solver.state
+        # 每条规则的传播钩子
+        self.hooks = [rule.propagate for rule in solver.rules]
+
+        table = self.state.table
+        # (交集单元格, 单元A中交集以外的单元格, 单元B中交集以外的单元格)，由共享的单元表缓存
+        self.intersections = table.intersections
+        self.unit_intersections = table.unit_intersections
+        self.peer_units = table.peer_units
+
+        # 只有包含全部数字的完整单元才能做摒除和区块推理
+        self.complete_units = [index for index, unit in enumerate(self.state.units) if len(unit) == self.state.size]
+
+        # 待检查的空格、待做摒除的单元、待做区块推理的单元，以及规则钩子是否需要重新调用；首次运行检查全部
+        self.pending_cells = set(range(self.state.size * self.state.size))
+        self.pending_units = set(self.complete_units)
+        self.pending_crossings = set(self.complete_units)
+        self.pending_rules = True
+        self.state.queue = []
+
+        # 本轮候选数快照，已填的单元格为0；单元格首次用到时计算并记下轮次，轮次不同的快照已过期
+        self.snapshot = [0] * (self.state.size * self.state.size)
+        self.stamps = [0] * (self.state.size * self.state.size)
+        self.round = 0
+
+    def run(self) -> bool:
+        """
+        运行传播直到不动点
+
+        Returns:
+            如果没有发现矛盾返回True，否则返回False
+        """
+        queue = self.state.queue
+        try:
+            while True:
+                self.round += 1
+                self._drain()
+                if self._naked_singles() or self._hidden_singles():
+                    continue
+                self._locked_candidates()
+                self._rule_propagation()
+                if not queue:
+                    return True
+        except _Contradiction:
+            # 求解器会撤销到上一个不动点，未处理的队列不再有效
+            queue.clear()
+            self.pending_cells.clear()
+            self.pending_units.clear()
+            self.pending_crossings.clear()
+            self.pending_rules = False
+            self.state.placed = []
+            return False
+
+    def _drain(self) -> None:
+        """
+        取出传播队列中的单元格，加入待检查的空格和单元：放置数字影响所有相关空格，排除候选数只影响该单元格
+        """
+        state = self.state
+        queue = state.queue
+        if not queue:
+            return
+
+        values = state.values
+        peers = state.peers
+        cell_units = state.cell_units
+        peer_units = self.peer_units
+        pending_cells = self.pending_cells
+        pending_units = self.pending_units
+        pending_crossings = self.pending_crossings
+        placed = state.placed
+        for cell in queue:
+            if values[cell]:
+                if placed is not None:
+                    placed.append(cell)
+                pending_cells.update(peers[cell])
+                pending_units.update(peer_units[cell])
+                pending_crossings.update(peer_units[cell])
+            else:
+                pending_cells.add(cell)
+                pending_units.update(cell_units[cell])
+                pending_crossings.update(cell_units[cell])
+        queue.clear()
+        self.pending_rules = True
+
+    def _mask(self, cells) -> int:
+        """
+        按本轮快照求一组单元格的候选数并集
+
+        Args:
+            cells: 单元格下标
+
+        Returns:
+            候选数掩码的并集
+        """
+        state = self.state
+        values = state.values
+        snapshot = self.snapshot
+        stamps = self.stamps
+        current = self.round
+        mask = 0
+        for cell in cells:
+            if stamps[cell] != current:
+                stamps[cell] = current
+                snapshot[cell] = 0 if values[cell] else state.candidates(cell)
+            mask |= snapshot[cell]
+        return mask
+
+    def _assign(self, cell: int, digit: int) -> None:
+        """
+        放置推理出的数字，如果违反规则则排除该候选数
+
+        Args:
+            cell: 单元格下标
+            digit: 要放置的数字
+        """
+        if self.state.values[cell] == 0 and not self.solver.place_digit(cell, digit):
+            self.state.eliminate(cell, 1 << digit)
+
+    def _naked_singles(self) -> bool:
+        """
+        放置待检查的空格中只剩一个候选数的空格
+
+        Returns:
+            如果放置或排除了数字返回True，否则返回False
+
+        Raises:
+            _Contradiction: 如果某个空格没有候选数
+        """
+        state = self.state
+        values = state.values
+        changed = False
+        pending = self.pending_cells
+        while pending:
+            cell = pending.pop()
+            if values[cell] != 0:
+                continue
+            candidates = state.candidates(cell)
+            if not candidates:
+                raise _Contradiction()
+            if not candidates & (candidates - 1):
+                self._assign(cell, candidates.bit_length() - 1)
+                changed = True
+        return changed
+
+    def _hidden_singles(self) -> bool:
+        """
+        放置待检查的完整单元中只剩一个位置的数字
+
+        Returns:
+            如果放置或排除了数字返回True，否则返回False
+
+        Raises:
+            _Contradiction: 如果某单元缺少可以放置某数字的位置
+        """
+        state = self.state
+        size = state.size
+        values = state.values
+        snapshot = self.snapshot
+        stamps = self.stamps
+        current = self.round
+        changed = False
+        pending = self.pending_units
+        while pending:
+            index = pending.pop()
+            unit = state.units[index]
+            if len(unit) != size:
+                continue
+            once = 0
+            twice = 0
+            for cell in unit:
+                if stamps[cell] != current:
+                    stamps[cell] = current
+                    snapshot[cell] = 0 if values[cell] else state.candidates(cell)
+                candidates = snapshot[cell]
+                twice |= once & candidates
+                once |= candidates
+
+            needed = state.full_mask & ~state.unit_masks[index]
+            if needed & ~once:
+                raise _Contradiction()
+
+            singles = once & ~twice & needed
+            while singles:
+                bit = singles & -singles
+                singles ^= bit
+                for cell in unit:
+                    if snapshot[cell] & bit:
+                        self._assign(cell, bit.bit_length() - 1)
+                        changed = True
+                        break
+        return changed
+
+    def _locked_candidates(self) -> None:
+        """
+        区块排除：对待检查单元参与的交集，数字在一个单元内的位置都落在交集中时，从另一单元的其余单元格排除该数字
+        """
+        state = self.state
+        snapshot = self.snapshot
+        unit_intersections = self.unit_intersections
+        crossings = set()
+        units = set(self.pending_crossings)
+        for index in self.pending_crossings:
+            for crossing, other in unit_intersections[index]:
+                crossings.add(crossing)
+                units.add(other)
+        self.pending_crossings.clear()
+        # 交集两侧单元的快照一次性补齐，下面直接读取
+        for index in units:
+            self._mask(state.units[index])
+
+        for crossing in sorted(crossings):
+            common, only_a, only_b = self.intersections[crossing]
+            inside = 0
+            for cell in common:
+                inside |= snapshot[cell]
+            if not inside:
+                continue
+
+            outside_a = 0
+            for cell in only_a:
+                outside_a |= snapshot[cell]
+            outside_b = 0
+            for cell in only_b:
+                outside_b |= snapshot[cell]
+
+            # 在A中被锁定的数字从B中排除，反之亦然
+            for locked, targets in ((inside & ~outside_a, only_b), (inside & ~outside_b, only_a)):
+                if locked:
+                    for cell in targets:
+                        if snapshot[cell] & locked:
+                            state.eliminate(cell, locked)
+
+    def _rule_propagation(self) -> None:
+        """
+        上次调用以来有放置或排除时，调用每条规则的传播钩子
+
+        Raises:
+            _Contradiction: 如果某条规则发现矛盾
+        """
+        if not self.pending_rules:
+            return
+        self.pending_rules = False
+        board = self.solver.board
+        for hook in self.hooks:
+            if not hook(board, self.state):
+                raise _Contradiction()
+        # 钩子排除候选数不会放置数字，本次调用之后放置的单元格重新开始累积
+        self.state.placed = []
@@ -4,8 +4,12 @@
 """
 
 from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Hashable, Optional, Sequence
 from .exceptions import SudokuError
 from .board import Board
+from .candidates import CandidateState
+from .units import UnitTable, block_shape, block_table, column_table, region_table, row_table
 
 
 class Rule(ABC):
@@ -32,6 +36,95 @@ class Rule(ABC):
         """
         pass
 
+    def is_valid_move(self, board: Board, row: int, col: int, digit: int) -> bool:
+        """
+        检查在指定位置放置数字后棋盘是否仍满足当前规则（调用时数字已放置在棋盘上）
+
+        默认实现回退为整盘检查is_valid，内置规则会重写为只检查与该单元格相关的约束
+
+        Args:
+            board: 要检查的棋盘
+            row: 行索引（0-based）
+            col: 列索引（0-based）
+            digit: 刚放置的数字
+
+        Returns:
+            如果满足规则返回True，否则返回False
+        """
+        return self.is_valid(board)
+
+    def get_units(self, board: Board) -> Optional[list[list[tuple[int, int]]]]:
+        """
+        获取规则对应的单元（一组数字不能重复的单元格）
+
+        返回单元列表的规则完全由单元描述，求解器会用候选数位掩码代替逐步调用is_valid_move。
+        默认返回None，表示规则不能用单元描述
+
+        Args:
+            board: 要检查的棋盘
+
+        Returns:
+            单元列表，每个单元是单元格坐标列表；不能用单元描述时返回None
+        """
+        return None
+
+    def propagate(self, board: Board, state: CandidateState) -> bool:
+        """
+        约束传播钩子：根据当前局面调用state.eliminate排除候选数（默认实现不排除任何候选数）
+
+        求解器会在每次放置后反复调用，直到所有规则都不再排除候选数；排除记录由求解器在回溯时撤销。
+        state.placed列出上次调用以来放置数字的单元格（为None时需要检查所有单元格），
+        只依赖已填数字的推理可以只处理这些单元格
+
+        Args:
+            board: 当前棋盘
+            state: 求解器的候选数状态
+
+        Returns:
+            如果没有发现矛盾返回True，否则返回False
+        """
+        return True
+
+    def compile(self, board: Board, graph) -> bool:
+        """
+        把规则降为约束图中的约束（默认把get_units返回的单元作为全不同组，没有单元时返回False）
+
+        graph.add_group(cells)添加全不同组，graph.add_sum(cells, total, combinations)添加和组，
+        graph.add_chain(cells)添加严格递增的有序链，graph.add_difference(a, b, difference)禁止两个单元格的差为该值，
+        单元格均为扁平下标（row * size + col）。不能编译的规则由求解器继续调用is_valid和is_valid_move
+
+        Args:
+            board: 要求解的棋盘
+            graph: 约束图
+
+        Returns:
+            如果规则已经完整编译返回True，否则返回False
+        """
+        units = self.get_units(board)
+        if units is None:
+            return False
+        size = board.size
+        for unit in units:
+            graph.add_group([row * size + col for row, col in unit])
+        return True
+
+    def encode(self, board: Board, encoder) -> bool:
+        """
+        把规则编码为CDCL引擎的子句（默认返回False，表示规则不能编码）
+
+        能用单元描述的规则由引擎直接编码，不会调用本方法。子句是带符号的变量编号列表，
+        encoder.variable(cell, digit)返回“单元格填该数字”的变量，取负表示“不填该数字”，
+        encoder.new_variable()申请辅助变量，encoder.add_clause(literals)添加子句
+
+        Args:
+            board: 要求解的棋盘
+            encoder: CDCL引擎
+
+        Returns:
+            如果规则已经完整编码返回True，否则返回False
+        """
+        return False
+
     def validate_compatibility(self, board: Board) -> None:
         """
         检查棋盘与规则是否适配（默认实现不进行任何检查）
@@ -41,58 +134,216 @@ class Rule(ABC):
         """
         pass
 
+    def cache_key(self) -> Optional[tuple]:
+        """
+        获取描述规则几何结构的可哈希键，供解缓存区分不同规则（默认返回None）
 
-class RowRule(Rule):
-    """数独行规则（支持任意尺寸）"""
+        两条规则的键相同意味着它们对任意棋盘的约束完全相同；返回None表示规则不能安全缓存
+
+        Returns:
+            由规则名称和几何参数组成的元组，不能缓存时返回None
+        """
+        return None
+
+
+class UnitRule(Rule):
+    """
+    单元规则基类：规则完全由一组数字不能重复的单元描述
+
+    子类只需提供unit_table，检查与候选数状态都使用按几何结构缓存的共享单元表，不会在每次检查时重新计算分组
+    """
+
+    @abstractmethod
+    def unit_table(self, size: int) -> UnitTable:
+        """
+        获取规则的单元表
+
+        Args:
+            size: 棋盘尺寸
+
+        Returns:
+            单元表
+        """
+        pass
 
     def is_valid(self, board: Board) -> bool:
         """
-        检查每一行是否满足数独规则（1-n不重复）
+        检查每个单元中已填数字是否不重复
 
         Args:
             board: 要检查的棋盘
 
         Returns:
-            如果所有行都满足规则返回True，否则返回False
+            如果所有单元都满足规则返回True，否则返回False
         """
-        for row in range(board.size):
-            seen = set()
-            for col in range(board.size):
-                digit = board.get_digit(row, col)
+        data = board.data
+        for unit in self.unit_table(board.size).units:
+            seen = 0
+            for cell in unit:
+                digit = data[cell]
                 if digit != 0:
-                    if digit in seen:
+                    bit = 1 << digit
+                    if seen & bit:
                         return False
-                    seen.add(digit)
+                    seen |= bit
         return True
 
+    def is_valid_move(self, board: Board, row: int, col: int, digit: int) -> bool:
+        """
+        只检查与新数字共享单元的单元格是否出现相同数字
 
-class ColumnRule(Rule):
-    """数独列规则（支持任意尺寸）"""
+        Args:
+            board: 要检查的棋盘
+            row: 行索引（0-based）
+            col: 列索引（0-based）
+            digit: 刚放置的数字
 
-    def is_valid(self, board: Board) -> bool:
+        Returns:
+            如果满足规则返回True，否则返回False
         """
-        检查每一列是否满足数独规则（1-n不重复）
+        data = board.data
+        for peer in self.unit_table(board.size).peers[row * board.size + col]:
+            if data[peer] == digit:
+                return False
+        return True
+
+    def get_units(self, board: Board) -> Optional[list[list[tuple[int, int]]]]:
+        """
+        返回单元表中的单元
 
         Args:
             board: 要检查的棋盘
 
         Returns:
-            如果所有列都满足规则返回True，否则返回False
+            所有单元的单元格坐标列表
         """
-        for col in range(board.size):
-            seen = set()
-            for row in range(board.size):
-                digit = board.get_digit(row, col)
-                if digit != 0:
-                    if digit in seen:
-                        return False
-                    seen.add(digit)
+        return [list(unit) for unit in self.unit_table(board.size).coordinates]
+
+    def compile(self, board: Board, graph) -> bool:
+        """
+        直接添加共享的单元表
+
+        Args:
+            board: 要求解的棋盘
+            graph: 约束图
+
+        Returns:
+            总是返回True
+        """
+        graph.add_table(self.unit_table(board.size))
         return True
 
 
-class Normal9x9BlockRule(Rule):
+class RowRule(UnitRule):
+    """数独行规则（支持任意尺寸）"""
+
+    def unit_table(self, size: int) -> UnitTable:
+        """
+        每一行是一个单元
+
+        Args:
+            size: 棋盘尺寸
+
+        Returns:
+            行单元表
+        """
+        return row_table(size)
+
+    def cache_key(self) -> Optional[tuple]:
+        """
+        行规则没有额外参数，键只包含规则名称
+
+        Returns:
+            规则键
+        """
+        return (self.rule_name,)
+
+
+class ColumnRule(UnitRule):
+    """数独列规则（支持任意尺寸）"""
+
+    def unit_table(self, size: int) -> UnitTable:
+        """
+        每一列是一个单元
+
+        Args:
+            size: 棋盘尺寸
+
+        Returns:
+            列单元表
+        """
+        return column_table(size)
+
+    def cache_key(self) -> Optional[tuple]:
+        """
+        列规则没有额外参数，键只包含规则名称
+
+        Returns:
+            规则键
+        """
+        return (self.rule_name,)
+
+
+class BlockRule(UnitRule):
+    """矩形宫规则，例如4×4（2×2宫）、6×6（2×3宫）、12×12（3×4宫）、16×16（4×4宫）"""
+
+    def __init__(self, box_rows: Optional[int] = None, box_cols: Optional[int] = None):
+        """
+        初始化宫规则，宫的形状都未指定时使用边长为sqrt(size)的正方形宫
+
+        Args:
+            box_rows: 每个宫的行数
+            box_cols: 每个宫的列数
+        """
+        super().__init__()
+        self.box_rows = box_rows
+        self.box_cols = box_cols
+
+    def validate_compatibility(self, board: Board) -> None:
+        """
+        检查宫能否恰好铺满棋盘
+
+        Args:
+            board: 要检查的棋盘
+
+        Raises:
+            SudokuError: 如果宫的行数乘列数不等于棋盘尺寸
+        """
+        if block_shape(board.size, self.box_rows, self.box_cols) is None:
+            raise SudokuError(
+                self.rule_name,
+                f"宫的形状{self.box_rows}×{self.box_cols}不能铺满{board.size}×{board.size}的棋盘"
+            )
+
+    def unit_table(self, size: int) -> UnitTable:
+        """
+        每一个宫是一个单元
+
+        Args:
+            size: 棋盘尺寸
+
+        Returns:
+            宫单元表
+        """
+        return block_table(size, *block_shape(size, self.box_rows, self.box_cols))
+
+    def cache_key(self) -> Optional[tuple]:
+        """
+        键包含宫的形状
+
+        Returns:
+            规则键
+        """
+        return (self.rule_name, self.box_rows, self.box_cols)
+
+
+class Normal9x9BlockRule(BlockRule):
     """9×9数独宫规则"""
 
+    def __init__(self):
+        """初始化3×3宫规则"""
+        super().__init__(3, 3)
+
     def validate_compatibility(self, board: Board) -> None:
         """
         检查棋盘是否为9×9
@@ -109,30 +360,89 @@ class Normal9x9BlockRule(Rule):
                 f"规则仅适用于9×9数独，当前棋盘尺寸为{board.size}×{board.size}"
             )
 
-    def is_valid(self, board: Board) -> bool:
+    def cache_key(self) -> Optional[tuple]:
+        """
+        宫规则固定为3×3宫，键只包含规则名称
+
+        Returns:
+            规则键
+        """
+        return (self.rule_name,)
+
+
+class RegionRule(UnitRule):
+    """不规则区域（锯齿数独）规则：每个区域内数字不重复"""
+
+    def __init__(self, region_map: Sequence[Sequence[Hashable]]):
+        """
+        初始化区域规则
+
+        Args:
+            region_map: size×size的区域标记，相同标记的单元格属于同一区域，例如
+                [[0, 0, 1, 1], [0, 0, 1, 1], [2, 2, 3, 3], [2, 2, 3, 3]]
+        """
+        super().__init__()
+        self.region_map = tuple(tuple(labels) for labels in region_map)
+
+    def validate_compatibility(self, board: Board) -> None:
         """
-        检查每一个3×3宫是否满足数独规则（1-9不重复）
+        检查区域标记与棋盘尺寸一致，且每个区域恰好包含size个单元格
 
         Args:
             board: 要检查的棋盘
 
+        Raises:
+            SudokuError: 如果区域标记的形状与棋盘不符，或某个区域的单元格个数不等于棋盘尺寸
+        """
+        size = board.size
+        if len(self.region_map) != size or any(len(labels) != size for labels in self.region_map):
+            raise SudokuError(self.rule_name, f"区域标记的形状与{size}×{size}的棋盘不符")
+        for unit in region_table(self.region_map).units:
+            if len(unit) != size:
+                raise SudokuError(self.rule_name, f"每个区域必须恰好包含{size}个单元格，实际为{len(unit)}个")
+
+    def unit_table(self, size: int) -> UnitTable:
+        """
+        每一个区域是一个单元
+
+        Args:
+            size: 棋盘尺寸
+
         Returns:
-            如果所有宫都满足规则返回True，否则返回False
-        """
-        for block_row in range(3):
-            for block_col in range(3):
-                seen = set()
-                # 检查每个3×3宫
-                for i in range(3):
-                    for j in range(3):
-                        row = block_row * 3 + i
-                        col = block_col * 3 + j
-                        digit = board.get_digit(row, col)
-                        if digit != 0:
-                            if digit in seen:
-                                return False
-                            seen.add(digit)
-        return True
+            区域单元表
+        """
+        return region_table(self.region_map)
+
+    def cache_key(self) -> Optional[tuple]:
+        """
+        键包含区域标记
+
+        Returns:
+            规则键
+        """
+        return (self.rule_name, self.region_map)
+
+
+@lru_cache(maxsize=None)
+def _orthogonal_neighbours(size: int) -> tuple[tuple[tuple[int, int], ...], ...]:
+    """
+    预计算每个单元格的正交相邻单元格
+
+    Args:
+        size: 棋盘尺寸
+
+    Returns:
+        以row * size + col为下标的相邻单元格坐标元组
+    """
+    neighbours = []
+    for i in range(size):
+        for j in range(size):
+            cells = []
+            for r, c in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+                if 0 <= r < size and 0 <= c < size:
+                    cells.append((r, c))
+            neighbours.append(tuple(cells))
+    return tuple(neighbours)
 
 
 class NonConsecutiveRule(Rule):
@@ -184,6 +494,101 @@ class NonConsecutiveRule(Rule):
 
         return True
 
+    def is_valid_move(self, board: Board, row: int, col: int, digit: int) -> bool:
+        """
+        只检查新数字与其正交相邻单元格是否连续
+
+        Args:
+            board: 要检查的棋盘
+            row: 行索引（0-based）
+            col: 列索引（0-based）
+            digit: 刚放置的数字
+
+        Returns:
+            如果满足规则返回True，否则返回False
+        """
+        size = board.size
+        data = board.data
+        for r, c in _orthogonal_neighbours(size)[row * size + col]:
+            neighbour_digit = data[r * size + c]
+            if neighbour_digit != 0 and abs(digit - neighbour_digit) == 1:
+                return False
+        return True
+
+    def propagate(self, board: Board, state: CandidateState) -> bool:
+        """
+        从已填数字的正交相邻空格中排除与其连续的数字，只处理上次调用以来放置的单元格
+
+        Args:
+            board: 当前棋盘
+            state: 求解器的候选数状态
+
+        Returns:
+            总是返回True，矛盾由求解器在候选数为空时发现
+        """
+        size = board.size
+        neighbours = _orthogonal_neighbours(size)
+        values = state.values
+        cells = range(len(values)) if state.placed is None else state.placed
+        for cell in cells:
+            digit = values[cell]
+            if digit != 0:
+                mask = (1 << (digit - 1)) | (1 << (digit + 1))
+                for r, c in neighbours[cell]:
+                    state.eliminate(r * size + c, mask)
+        return True
+
+    def compile(self, board: Board, graph) -> bool:
+        """
+        每对正交相邻的单元格的差不能为1
+
+        Args:
+            board: 要求解的棋盘
+            graph: 约束图
+
+        Returns:
+            总是返回True
+        """
+        size = board.size
+        for cell, neighbours in enumerate(_orthogonal_neighbours(size)):
+            for r, c in neighbours:
+                other = r * size + c
+                if other > cell:
+                    graph.add_difference(cell, other, 1)
+        return True
+
+    def encode(self, board: Board, encoder) -> bool:
+        """
+        每对正交相邻的单元格不能同时填入连续的两个数字
+
+        Args:
+            board: 要求解的棋盘
+            encoder: CDCL引擎
+
+        Returns:
+            总是返回True
+        """
+        size = board.size
+        variable = encoder.variable
+        for cell, neighbours in enumerate(_orthogonal_neighbours(size)):
+            for r, c in neighbours:
+                other = r * size + c
+                if other < cell:
+                    continue
+                for digit in range(1, size):
+                    encoder.add_clause([-variable(cell, digit), -variable(other, digit + 1)])
+                    encoder.add_clause([-variable(cell, digit + 1), -variable(other, digit)])
+        return True
+
+    def cache_key(self) -> Optional[tuple]:
+        """
+        非连续规则没有额外参数，键只包含规则名称
+
+        Returns:
+            规则键
+        """
+        return (self.rule_name,)
+
 
 class ThermometerRule(Rule):
     """温度计规则：沿着每个温度计的数字必须从灯泡端开始递增"""
@@ -192,15 +597,48 @@ class ThermometerRule(Rule):
         """初始化温度计规则"""
         super().__init__()
         self.thermometers = []
+        # 单元格 -> [(温度计下标, 单元格在温度计上的位置), ...]
+        self.cell_index = {}
 
     def set(self, thermometer: list[tuple[int, int]]) -> None:
         """
         添加一个温度计
 
         Args:
-            thermometer: 一个温度计的坐标列表，例如[(0,0), (0,1), (1,1)]
+            thermometer: 一个温度计的坐标列表，例如[(0,0), (0,1), (1,1)]，坐标也可以是列表
         """
+        # 坐标统一为元组，用作索引的键
+        thermometer = [tuple(cell) for cell in thermometer]
+        index = len(self.thermometers)
         self.thermometers.append(thermometer)
+        for position, cell in enumerate(thermometer):
+            self.cell_index.setdefault(cell, []).append((index, position))
+
+    def cache_key(self) -> Optional[tuple]:
+        """
+        键包含所有温度计的坐标
+
+        Returns:
+            规则键
+        """
+        return (self.rule_name, tuple(tuple(thermometer) for thermometer in self.thermometers))
+
+    @staticmethod
+    def static_bounds(size: int, length: int, position: int) -> tuple[int, int]:
+        """
+        计算温度计上某位置数字的静态取值范围
+
+        距灯泡第k个单元格之前还有k个更小的数字，之后还有length-1-k个更大的数字
+
+        Args:
+            size: 棋盘尺寸
+            length: 温度计长度
+            position: 单元格在温度计上的位置（灯泡为0）
+
+        Returns:
+            (最小值, 最大值)
+        """
+        return position + 1, size - (length - 1 - position)
 
     def validate_compatibility(self, board: Board) -> None:
         """
@@ -226,28 +664,191 @@ class ThermometerRule(Rule):
         """
         检查棋盘是否满足温度计规则
 
+        已填数字必须在静态取值范围内，且相邻已填数字之差不小于两者在温度计上的距离
+
         Args:
             board: 要检查的棋盘
 
         Returns:
             如果满足规则返回True，否则返回False
         """
+        size = board.size
         for thermometer in self.thermometers:
-            # 提取温度计上的数字（过滤掉0）
-            digits = []
-            for row, col in thermometer:
+            length = len(thermometer)
+            previous_position = -1
+            previous_digit = 0
+            for position, (row, col) in enumerate(thermometer):
                 digit = board.get_digit(row, col)
-                if digit != 0:
-                    digits.append(digit)
+                if digit == 0:
+                    continue
+
+                low, high = self.static_bounds(size, length, position)
+                if digit < low or digit > high:
+                    return False
+                if previous_position >= 0 and digit - previous_digit < position - previous_position:
+                    return False
+                previous_position = position
+                previous_digit = digit
+
+        return True
+
+    def is_valid_move(self, board: Board, row: int, col: int, digit: int) -> bool:
+        """
+        只检查经过该单元格的温度计：新数字须在静态取值范围内，
+        且与灯泡方向、末端方向最近的已填数字之差不小于两者的距离
+
+        Args:
+            board: 要检查的棋盘
+            row: 行索引（0-based）
+            col: 列索引（0-based）
+            digit: 刚放置的数字
+
+        Returns:
+            如果满足规则返回True，否则返回False
+        """
+        size = board.size
+        data = board.data
+        for index, position in self.cell_index.get((row, col), ()):
+            thermometer = self.thermometers[index]
+
+            low, high = self.static_bounds(size, len(thermometer), position)
+            if digit < low or digit > high:
+                return False
+
+            for distance in range(1, position + 1):
+                r, c = thermometer[position - distance]
+                previous_digit = data[r * size + c]
+                if previous_digit != 0:
+                    if digit - previous_digit < distance:
+                        return False
+                    break
+
+            for distance in range(1, len(thermometer) - position):
+                r, c = thermometer[position + distance]
+                next_digit = data[r * size + c]
+                if next_digit != 0:
+                    if next_digit - digit < distance:
+                        return False
+                    break
+
+        return True
+
+    def compile(self, board: Board, graph) -> bool:
+        """
+        每个温度计是一条从灯泡开始的有序链
+
+        Args:
+            board: 要求解的棋盘
+            graph: 约束图
+
+        Returns:
+            总是返回True
+        """
+        size = board.size
+        for thermometer in self.thermometers:
+            graph.add_chain([row * size + col for row, col in thermometer])
+        return True
+
+    def encode(self, board: Board, encoder) -> bool:
+        """
+        温度计上相邻的两个单元格a、b：a填d时b必须填大于d的数字，b填d时a必须填小于d的数字，
+        单元传播即可沿温度计传播上下界
+
+        Args:
+            board: 要求解的棋盘
+            encoder: CDCL引擎
+
+        Returns:
+            总是返回True
+        """
+        size = board.size
+        variable = encoder.variable
+        for thermometer in self.thermometers:
+            cells = [row * size + col for row, col in thermometer]
+            for a, b in zip(cells, cells[1:]):
+                for digit in range(1, size + 1):
+                    encoder.add_clause([-variable(a, digit)] +
+                                       [variable(b, larger) for larger in range(digit + 1, size + 1)])
+                    encoder.add_clause([-variable(b, digit)] +
+                                       [variable(a, smaller) for smaller in range(1, digit)])
+        return True
+
+    def propagate(self, board: Board, state: CandidateState) -> bool:
+        """
+        沿每个温度计传播上下界：正向扫描得到每个单元格的最小值，反向扫描得到最大值，
+        并从空格中排除界外的候选数
 
-            # 检查数字是否严格递增
-            for i in range(1, len(digits)):
-                if digits[i] <= digits[i - 1]:
+        Args:
+            board: 当前棋盘
+            state: 求解器的候选数状态
+
+        Returns:
+            如果没有发现矛盾返回True，否则返回False
+        """
+        size = board.size
+        full_mask = state.full_mask
+        values = state.values
+        for thermometer in self.thermometers:
+            cells = [row * size + col for row, col in thermometer]
+            domains = [1 << values[cell] if values[cell] else state.candidates(cell) for cell in cells]
+
+            # 正向：每个数字至少比前一个单元格的最小可能值大1
+            low = 1
+            for position, domain in enumerate(domains):
+                domain &= full_mask & ~((1 << low) - 1)
+                if not domain:
                     return False
+                domains[position] = domain
+                low = (domain & -domain).bit_length()
+
+            # 反向：每个数字至多比后一个单元格的最大可能值小1
+            high = size
+            for position in range(len(domains) - 1, -1, -1):
+                domain = domains[position] & ((1 << (high + 1)) - 1)
+                if not domain:
+                    return False
+                domains[position] = domain
+                high = domain.bit_length() - 2
+
+            for cell, domain in zip(cells, domains):
+                if values[cell] == 0:
+                    state.eliminate(cell, full_mask & ~domain)
 
         return True
 
 
+@lru_cache(maxsize=None)
+def _cage_combinations(max_digit: int, cage_size: int, cage_sum: int) -> tuple[int, ...]:
+    """
+    预计算由cage_size个互不相同的数字（1到max_digit）组成、和为cage_sum的所有数字组合
+
+    Args:
+        max_digit: 最大数字（棋盘尺寸）
+        cage_size: 笼子单元格数
+        cage_sum: 笼子和值
+
+    Returns:
+        数字组合掩码元组，第digit位为1表示组合包含digit
+    """
+    combinations = []
+
+    def search(smallest: int, remaining: int, count: int, mask: int) -> None:
+        if count == 0:
+            if remaining == 0:
+                combinations.append(mask)
+            return
+        # 剩余count个数字至少为smallest+...+(smallest+count-1)，至多为max_digit+...+(max_digit-count+1)
+        if remaining < count * (2 * smallest + count - 1) // 2:
+            return
+        if remaining > count * (2 * max_digit - count + 1) // 2:
+            return
+        for digit in range(smallest, max_digit + 1):
+            search(digit + 1, remaining - digit, count - 1, mask | (1 << digit))
+
+    search(1, cage_sum, cage_size, 0)
+    return tuple(combinations)
+
+
 class KillerRule(Rule):
     """杀手数独规则：笼子内的数字之和必须等于角标数字，且笼子内数字不能重复"""
 
@@ -256,6 +857,13 @@ class KillerRule(Rule):
         super().__init__()
         self.cages = []
         self.cage_sums = []
+        # 单元格 -> [笼子下标, ...]
+        self.cell_index = {}
+        # 每个笼子可能的数字组合，按棋盘尺寸构建
+        self.combinations = []
+        self.combination_size = 0
+        # (笼子下标, 已使用数字掩码) -> 剩余单元格可用的数字掩码
+        self.option_cache = {}
 
     def set(self, cage_sum: int, cage: list[tuple[int, int]]) -> None:
         """
@@ -263,14 +871,72 @@ class KillerRule(Rule):
 
         Args:
             cage_sum: 笼子内数字的和值
-            cage: 笼子覆盖的单元格坐标列表
+            cage: 笼子覆盖的单元格坐标列表，坐标也可以是列表
+
+        Raises:
+            SudokuError: 如果笼子不包含任何单元格
         """
+        # 坐标统一为元组，用作索引的键
+        cage = [tuple(cell) for cell in cage]
+        if not cage:
+            raise SudokuError(self.rule_name, f"笼子{len(self.cages)}不包含任何单元格")
+        index = len(self.cages)
         self.cage_sums.append(cage_sum)
         self.cages.append(cage)
+        for cell in cage:
+            self.cell_index.setdefault(cell, []).append(index)
+        if self.combination_size:
+            self.combinations.append(_cage_combinations(self.combination_size, len(cage), cage_sum))
+
+    def cache_key(self) -> Optional[tuple]:
+        """
+        键包含所有笼子的和值与坐标
+
+        Returns:
+            规则键
+        """
+        return (self.rule_name, tuple((cage_sum, tuple(cage)) for cage_sum, cage in zip(self.cage_sums, self.cages)))
+
+    def build_combinations(self, size: int) -> None:
+        """
+        按棋盘尺寸构建每个笼子的数字组合表（尺寸不变时只构建一次）
+
+        Args:
+            size: 棋盘尺寸
+        """
+        if self.combination_size == size:
+            return
+        self.combination_size = size
+        self.combinations = [
+            _cage_combinations(size, len(cage), cage_sum)
+            for cage, cage_sum in zip(self.cages, self.cage_sums)
+        ]
+        self.option_cache = {}
+
+    def cage_options(self, index: int, used: int) -> int:
+        """
+        查询笼子在已使用部分数字时，所有仍可能的组合所包含数字的并集
+
+        Args:
+            index: 笼子下标
+            used: 笼子内已填数字的掩码
+
+        Returns:
+            数字掩码，为0表示笼子已不可能满足和值
+        """
+        key = (index, used)
+        options = self.option_cache.get(key)
+        if options is None:
+            options = 0
+            for combination in self.combinations[index]:
+                if combination & used == used:
+                    options |= combination
+            self.option_cache[key] = options
+        return options
 
     def validate_compatibility(self, board: Board) -> None:
         """
-        检查笼子坐标是否在棋盘范围内
+        检查笼子坐标是否在棋盘范围内，并构建数字组合表
 
         Args:
             board: 要检查的棋盘
@@ -288,6 +954,35 @@ class KillerRule(Rule):
                         f"笼子{i}坐标({row},{col})超出棋盘范围(0-{size - 1})"
                     )
 
+        self.build_combinations(size)
+
+    def is_cage_valid(self, board: Board, index: int) -> bool:
+        """
+        检查单个笼子：数字不能重复，且已填数字必须属于某个和值正确的数字组合
+
+        Args:
+            board: 要检查的棋盘
+            index: 笼子下标
+
+        Returns:
+            如果满足规则返回True，否则返回False
+        """
+        used = 0
+        filled = 0
+        size = board.size
+        data = board.data
+        for row, col in self.cages[index]:
+            digit = data[row * size + col]
+            if digit != 0:
+                used |= 1 << digit
+                filled += 1
+
+        # 掩码中的位数少于已填单元格数说明有重复数字
+        if bin(used).count("1") != filled:
+            return False
+
+        return self.cage_options(index, used) != 0
+
     def is_valid(self, board: Board) -> bool:
         """
         检查棋盘是否满足杀手数独规则
@@ -298,29 +993,123 @@ class KillerRule(Rule):
         Returns:
             如果满足规则返回True，否则返回False
         """
-        for cage, cage_sum in zip(self.cages, self.cage_sums):
-            digits = []
-            s = 0
+        self.build_combinations(board.size)
+        for index in range(len(self.cages)):
+            if not self.is_cage_valid(board, index):
+                return False
+        return True
 
-            # 收集笼子内的数字
-            for row, col in cage:
-                digit = board.get_digit(row, col)
-                if digit != 0:
-                    digits.append(digit)
-                    s += digit
+    def is_valid_move(self, board: Board, row: int, col: int, digit: int) -> bool:
+        """
+        只检查包含该单元格的笼子
+
+        Args:
+            board: 要检查的棋盘
+            row: 行索引（0-based）
+            col: 列索引（0-based）
+            digit: 刚放置的数字
 
-            # 检查笼子内数字是否重复
-            if len(digits) != len(set(digits)):
+        Returns:
+            如果满足规则返回True，否则返回False
+        """
+        self.build_combinations(board.size)
+        for index in self.cell_index.get((row, col), ()):
+            if not self.is_cage_valid(board, index):
                 return False
+        return True
 
-            # 检查笼子和是否等于目标和
-            if len(digits) == len(cage):
-                # 如果笼子已填满，检查和是否等于目标和
-                if s != cage_sum:
-                    return False
-            else:
-                # 如果笼子未填满，检查和是否已超过目标和
-                if s >= cage_sum:
-                    return False
+    def compile(self, board: Board, graph) -> bool:
+        """
+        每个笼子是一个全不同组和一个和组
+
+        Args:
+            board: 要求解的棋盘
+            graph: 约束图
 
+        Returns:
+            总是返回True
+        """
+        size = board.size
+        self.build_combinations(size)
+        for cage, cage_sum, combinations in zip(self.cages, self.cage_sums, self.combinations):
+            cells = [row * size + col for row, col in cage]
+            graph.add_group(cells)
+            graph.add_sum(cells, cage_sum, combinations)
+        return True
+
+    def encode(self, board: Board, encoder) -> bool:
+        """
+        笼子内数字不能重复；每个笼子为每个数字组合申请一个辅助变量，恰好选中一个组合，
+        选中的组合中的数字都必须出现在笼子里，组合以外的数字都不能出现
+
+        Args:
+            board: 要求解的棋盘
+            encoder: CDCL引擎
+
+        Returns:
+            总是返回True
+        """
+        size = board.size
+        self.build_combinations(size)
+        variable = encoder.variable
+        for cage, combinations in zip(self.cages, self.combinations):
+            cells = [row * size + col for row, col in cage]
+            for digit in range(1, size + 1):
+                for i, a in enumerate(cells):
+                    for b in cells[i + 1:]:
+                        encoder.add_clause([-variable(a, digit), -variable(b, digit)])
+
+            selectors = [encoder.new_variable() for _ in combinations]
+            encoder.add_clause(selectors)
+            for i, a in enumerate(selectors):
+                for b in selectors[i + 1:]:
+                    encoder.add_clause([-a, -b])
+
+            for digit in range(1, size + 1):
+                using = []
+                for selector, combination in zip(selectors, combinations):
+                    if combination >> digit & 1:
+                        using.append(selector)
+                        encoder.add_clause([-selector] + [variable(cell, digit) for cell in cells])
+                    else:
+                        for cell in cells:
+                            encoder.add_clause([-selector, -variable(cell, digit)])
+                # 单元格填digit时必须选中包含digit的组合
+                for cell in cells:
+                    encoder.add_clause([-variable(cell, digit)] + using)
+        return True
+
+    def propagate(self, board: Board, state: CandidateState) -> bool:
+        """
+        用数字组合表排除笼子内空格的候选数：只保留仍可能的组合中未使用的数字
+
+        Args:
+            board: 当前棋盘
+            state: 求解器的候选数状态
+
+        Returns:
+            如果没有发现矛盾返回True，否则返回False
+        """
+        size = board.size
+        self.build_combinations(size)
+        values = state.values
+        for index, cage in enumerate(self.cages):
+            used = 0
+            empty_cells = []
+            for row, col in cage:
+                cell = row * size + col
+                digit = values[cell]
+                if digit != 0:
+                    used |= 1 << digit
+                else:
+                    empty_cells.append(cell)
+
+            if not empty_cells:
+                continue
+
+            allowed = self.cage_options(index, used) & ~used
+            if not allowed:
+                return False
+            for cell in empty_cells:
+                state.eliminate(cell, state.full_mask & ~allowed)
         return True
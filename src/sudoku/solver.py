@@ -3,33 +3,118 @@
 数独求解器模块，实现回溯算法求解数独。
 """
 
-from typing import Optional
-from tqdm import tqdm
+from typing import Iterator, Optional
 from .board import Board
+from .candidates import CandidateState
+from .cdcl import CDCLEngine
+from .compiler import compile_rules
+from .dlx import DancingLinks
+from .exceptions import SudokuError
+from .progress import ProgressReporter
+from .propagation import Propagator
 from .rules import Rule
+from .stats import SolverStats
+from .strategies import BranchingStrategy, MRVStrategy
+from .transposition import TranspositionTable
+
+# 显式栈搜索的动作：选择新的空格、尝试栈顶空格的下一个数字、栈顶空格当前数字无解需要回溯
+_DESCEND, _TRY, _BACKTRACK = range(3)
+
+# run()不限预算时每次推进的尝试次数
+_RUN_CHUNK = 1 << 16
 
 
 class Solver:
     """数独求解器"""
 
-    def __init__(self, board: Board, *rules: Rule):
+    ENGINES = ("backtracking", "dlx", "cdcl")
+
+    def __init__(self, board: Board, *rules: Rule, strategy: Optional[BranchingStrategy] = None,
+                 propagation: bool = True, engine: str = "backtracking",
+                 progress: Optional[ProgressReporter] = None, stats: bool = False,
+                 transposition: Optional[TranspositionTable] = None):
         """
         初始化求解器
 
         Args:
             board: 要求解的数独棋盘
             *rules: 要应用的规则列表
+            strategy: 分支策略，默认使用最少候选数优先的MRVStrategy
+            propagation: 是否在每次放置后运行约束传播，默认开启
+            engine: 求解引擎，"backtracking"为回溯搜索，"dlx"为舞蹈链精确覆盖（只支持单元规则），
+                "cdcl"为冲突驱动子句学习（只支持单元规则和实现了encode的规则）
+            progress: 进度报告，默认不报告进度
+            stats: 是否记录每条规则的调用统计和每层的节点数、回溯数，结果保存在self.stats中
+            transposition: 记录无解局面的置换表，只用于回溯引擎，默认不使用
 
         Raises:
-            SudokuError: 如果棋盘与任何规则不兼容
+            SudokuError: 如果棋盘与任何规则不兼容，或规则不能由所选引擎求解
+            ValueError: 如果引擎名称未知
         """
+        if engine not in self.ENGINES:
+            raise ValueError(f"未知的求解引擎: {engine}，可选: {', '.join(self.ENGINES)}")
+
         self.board = board.copy()
         self.rules = rules
         self.steps = 0
-        self.pbar = None
+        self.progress = progress
+        # 进度报告是否已经在本次搜索中调用过start
+        self.reporting = False
+
+        # 显式栈搜索状态：result为None表示搜索尚未结束
+        self.stack = []
+        self.action = _DESCEND
+        self.started = False
+        self.result = None
+
+        # DLX引擎的精确覆盖矩阵、解生成器，以及写入解之前的trail长度
+        self.dancing_links = None
+        self.exact_cover = None
+        self.exact_cover_mark = 0
+
+        # CDCL引擎、是否已把找到的解写入棋盘，以及写入解之前的trail长度
+        self.clauses = None
+        self.clauses_found = False
+        self.clauses_mark = 0
 
         self.validate_compatibility()
 
+        # 规则编译为按几何结构缓存的约束图：全不同组交给候选数状态处理，其余约束由本求解器的检查器逐步检查，
+        # 不能编译的规则逐步调用is_valid_move
+        self.graph = compile_rules(self.board, self.rules)
+        self.checker = self.graph.checker()
+        self.move_rules = [self.rules[index] for index in self.graph.move_rules]
+        self.state = CandidateState(self.board, self.graph.table)
+
+        # 预先取出检查函数，开启统计时逐个包装为带计数的版本，检查路径不变
+        residual = [self.rules[index] for index in self.graph.residual]
+        self.board_checks = [self.graph.is_valid] + [rule.is_valid for rule in residual]
+        self.move_checks = [rule.is_valid_move for rule in residual]
+        if self.graph.constraints:
+            self.move_checks.insert(0, self.checker.is_valid_move)
+
+        self.engine = engine
+        if engine == "dlx":
+            self.validate_exact_cover()
+        elif engine == "cdcl":
+            self.clauses = CDCLEngine(self.state, self.board, self.move_rules)
+
+        self.strategy = strategy if strategy is not None else MRVStrategy()
+        self.strategy.attach(self.state)
+
+        # 只有回溯引擎在搜索中运行约束传播
+        self.propagator = Propagator(self) if propagation and engine == "backtracking" else None
+
+        self.stats = None
+        if stats:
+            self.stats = SolverStats()
+            self.stats.attach(self)
+
+        self.transposition = None
+        if transposition is not None and engine == "backtracking":
+            self.transposition = transposition
+            self.transposition.attach(self)
+
     def validate_compatibility(self) -> None:
         """
         一次性调用所有rule实例的validate_compatibility方法
@@ -40,6 +125,19 @@ class Solver:
         for rule in self.rules:
             rule.validate_compatibility(self.board)
 
+    def validate_exact_cover(self) -> None:
+        """
+        检查规则能否编译为精确覆盖问题：每条规则都必须由包含全部数字的单元描述
+
+        Raises:
+            SudokuError: 如果某条规则不能编译为精确覆盖问题
+        """
+        if self.move_rules:
+            raise SudokuError(self.move_rules[0].rule_name, "DLX引擎只支持可由单元描述的规则")
+        for unit in self.state.units:
+            if len(unit) != self.board.size:
+                raise SudokuError(self.__class__.__name__, "DLX引擎要求每个单元恰好包含全部数字")
+
     def is_valid(self) -> bool:
         """
         检查当前棋盘是否满足所有规则
@@ -47,11 +145,59 @@ class Solver:
         Returns:
             如果满足所有规则返回True，否则返回False
         """
-        for rule in self.rules:
-            if not rule.is_valid(self.board):
+        board = self.board
+        for check in self.board_checks:
+            if not check(board):
                 return False
         return True
 
+    def is_valid_move(self, row: int, col: int, digit: int) -> bool:
+        """
+        检查刚放置的数字是否满足所有不能用单元描述的规则，只检查与该单元格相关的约束
+
+        未重写is_valid_move的规则会自动回退为整盘检查is_valid
+
+        Args:
+            row: 行索引
+            col: 列索引
+            digit: 刚放置的数字
+
+        Returns:
+            如果满足所有规则返回True，否则返回False
+        """
+        board = self.board
+        for check in self.move_checks:
+            if not check(board, row, col, digit):
+                return False
+        return True
+
+    def place_digit(self, cell: int, digit: int) -> bool:
+        """
+        检查并放置数字，成功时记录到候选数状态的trail中以便回溯
+
+        Args:
+            cell: 单元格下标（row * size + col）
+            digit: 要放置的数字
+
+        Returns:
+            如果放置后棋盘有效则返回True，否则返回False
+        """
+        # 单元规则只需检查候选数掩码
+        if not self.state.candidates(cell) >> digit & 1:
+            return False
+
+        row, col = divmod(cell, self.board.size)
+        self.board.set_digit(row, col, digit)
+
+        # 只检查与该单元格相关的约束
+        if not self.is_valid_move(row, col, digit):
+            self.board.remove_digit(row, col)
+            return False
+
+        self.state.place(cell, digit)
+        self.strategy.on_place(cell)
+        return True
+
     def try_set_digit(self, row: int, col: int, digit: int) -> bool:
         """
         尝试在指定位置放置数字
@@ -66,51 +212,403 @@ class Solver:
         """
         # 增加步数计数
         self.steps += 1
-        self.pbar.update(1)
+        return self.place_digit(row * self.board.size + col, digit)
 
-        # 记录原始数字
-        original_digit = self.board.get_digit(row, col)
+    def eliminate(self, cell: int, mask: int) -> None:
+        """
+        从空格的候选数中排除数字，并通知分支策略
 
-        # 放置数字
-        self.board.set_digit(row, col, digit)
+        Args:
+            cell: 单元格下标（row * size + col）
+            mask: 要排除的数字掩码
+        """
+        if self.state.eliminate(cell, mask):
+            self.strategy.on_eliminate(cell)
+
+    def propagate(self) -> bool:
+        """
+        运行约束传播直到不动点（未开启传播时直接返回True）
+
+        Returns:
+            如果没有发现矛盾返回True，否则返回False
+        """
+        if self.propagator is None:
+            return True
+
+        trail = self.state.trail
+        mark = len(trail)
+        result = self.propagator.run()
 
-        # 检查是否满足所有规则
-        is_valid = self.is_valid()
+        # 规则钩子直接修改候选数状态，传播结束后统一通知分支策略
+        for cell, previous in trail[mark:]:
+            if previous >= 0:
+                self.strategy.on_eliminate(cell)
+        return result
 
-        # 如果不满足规则，则恢复原始状态
-        if not is_valid:
-            self.board.set_digit(row, col, original_digit)
+    def undo(self, mark: int) -> None:
+        """
+        按相反顺序撤销trail中mark之后的放置与排除
+
+        Args:
+            mark: 要回退到的trail长度
+        """
+        trail = self.state.trail
+        size = self.board.size
+        while len(trail) > mark:
+            cell, previous = trail.pop()
+            if previous < 0:
+                self.state.remove(cell)
+                self.board.remove_digit(cell // size, cell % size)
+                self.strategy.on_remove(cell)
+            else:
+                self.state.eliminated[cell] = previous
+                self.strategy.on_eliminate(cell)
+
+    def solve_exact_cover(self) -> bool:
+        """
+        使用舞蹈链求解精确覆盖问题，并把解写回棋盘；再次调用时撤销上一个解并继续寻找下一个解
+
+        Returns:
+            如果找到解返回True，否则返回False
+        """
+        trail = self.state.trail
+        size = self.board.size
+        if self.exact_cover is None:
+            self.dancing_links = DancingLinks(self.state)
+            self.exact_cover = self.dancing_links.solutions()
+            self.exact_cover_mark = len(trail)
+        else:
+            # 撤销上一个解写入的数字
+            while len(trail) > self.exact_cover_mark:
+                cell, _ = trail.pop()
+                self.state.remove(cell)
+                self.board.remove_digit(cell // size, cell % size)
 
-        return is_valid
+        steps = self.dancing_links.steps
+        solution = next(self.exact_cover, None)
+        self.steps += self.dancing_links.steps - steps
+        if solution is None:
+            return False
+
+        for cell, digit in solution:
+            self.state.place(cell, digit)
+            self.board.set_digit(cell // size, cell % size, digit)
+        return True
+
+    def solve_clauses(self, budget: int) -> Optional[bool]:
+        """
+        使用CDCL引擎搜索，并把解写回棋盘；找到解后再次调用时撤销并禁止该解，继续寻找下一个解
+
+        Args:
+            budget: 本次最多做出的决策次数
+
+        Returns:
+            找到解返回True，确定无解返回False，因预算用完而暂停返回None
+        """
+        trail = self.state.trail
+        size = self.board.size
+        if self.clauses_found:
+            self.clauses_found = False
+            while len(trail) > self.clauses_mark:
+                cell, _ = trail.pop()
+                self.state.remove(cell)
+                self.board.remove_digit(cell // size, cell % size)
+            self.clauses.block_solution()
+
+        decisions = self.clauses.decisions
+        result = self.clauses.search(budget)
+        self.steps += self.clauses.decisions - decisions
+        if not result:
+            return result
+
+        self.clauses_found = True
+        self.clauses_mark = len(trail)
+        values = self.state.values
+        for cell, digit in self.clauses.solution():
+            if values[cell] == 0:
+                self.state.place(cell, digit)
+                self.board.set_digit(cell // size, cell % size, digit)
+        return True
+
+    def start(self) -> None:
+        """
+        开始求解前的准备：整盘检查初始局面，并在根节点运行一次约束传播（只执行一次）
+        """
+        if self.started:
+            return
+        self.started = True
+
+        # 逐步检查只覆盖新放置的数字，初始局面需要整盘检查一次
+        if not self.is_valid():
+            self.result = False
+        elif self.engine == "backtracking" and not self.propagate():
+            self.result = False
+
+    def step(self, count: int = 1) -> Optional[bool]:
+        """
+        推进搜索，至多尝试放置count次数字后暂停；搜索状态保存在求解器中，可以随时继续
+
+        搜索使用显式选择栈代替递归：栈中每一帧记录[单元格, 放置前的trail长度, 正在尝试的数字]，
+        放置与排除都记录在候选数状态的trail中，回溯时撤销到对应的长度
+
+        Args:
+            count: 本次最多尝试放置的次数
+
+        Returns:
+            找到解返回True，确定无解返回False，尚未结束返回None
+        """
+        self.start()
+        if self.engine == "dlx":
+            if self.result is None:
+                self.result = self.solve_exact_cover()
+            return self.result
+        if self.engine == "cdcl":
+            if self.result is None:
+                self.result = self.solve_clauses(count)
+            return self.result
+
+        limit = self.steps + count
+        stack = self.stack
+        table = self.transposition
+        values = self.state.values
+        size = self.board.size
+
+        while self.result is None:
+            action = self.action
+
+            if action == _DESCEND:
+                # 由分支策略选择下一个空格
+                cell = self.strategy.select_cell()
+                if cell is None:
+                    # 没有空格，检查棋盘是否完全满足规则
+                    if self.is_valid():
+                        self.result = True
+                        if table is not None:
+                            table.recording = False
+                    else:
+                        self.action = _BACKTRACK
+                    continue
+                stack.append([cell, 0, 0])
+                self.action = _TRY
+
+            elif action == _TRY:
+                if self.steps >= limit:
+                    break
+
+                frame = stack[-1]
+                cell = frame[0]
+                # 只尝试候选数掩码中的数字
+                candidates = self.state.candidates(cell)
+                if not candidates:
+                    # 所有数字都尝试过，交给上一层回溯
+                    if table is not None:
+                        table.store(len(stack) - 1)
+                    stack.pop()
+                    self.action = _BACKTRACK
+                    continue
+
+                digit = (candidates & -candidates).bit_length() - 1
+                frame[1] = len(self.state.trail)
+                frame[2] = digit
+                if not (self.try_set_digit(cell // size, cell % size, digit) and self.propagate()):
+                    self.action = _BACKTRACK
+                elif table is not None and table.probe():
+                    # 经由其他路线到达过相同的局面，已被证明无解
+                    self.action = _BACKTRACK
+                else:
+                    self.action = _DESCEND
+
+            else:
+                # 栈顶帧当前尝试的数字无解
+                if not stack:
+                    self.result = False
+                    break
+
+                frame = stack[-1]
+                cell, mark, digit = frame
+                self.undo(mark)
+
+                # 当前数字已被证明无解，排除后重新传播，矛盾时继续向上回溯
+                self.eliminate(cell, 1 << digit)
+                if not self.propagate():
+                    if table is not None:
+                        table.store(len(stack) - 1)
+                    stack.pop()
+                elif values[cell] != 0:
+                    # 传播可能已经填好该单元格，此时继续求解其余空格
+                    stack.pop()
+                    self.action = _DESCEND
+                else:
+                    self.action = _TRY
+
+        if self.result is not None:
+            # 搜索结束时把检查统计累加到共享的约束图，供之后的求解器排列检查顺序
+            self.checker.record()
+        return self.result
+
+    def run(self, budget: Optional[int] = None) -> Optional[bool]:
+        """
+        运行搜索直到结束，或尝试次数达到budget后暂停
+
+        Args:
+            budget: 本次最多尝试放置的次数，None表示不限制
+
+        Returns:
+            找到解返回True，确定无解返回False，因预算用完而暂停返回None
+        """
+        if self.progress is not None:
+            return self.run_with_progress(budget)
+        if budget is None:
+            while self.step(_RUN_CHUNK) is None:
+                pass
+            return self.result
+        return self.step(budget)
+
+    def run_with_progress(self, budget: Optional[int] = None) -> Optional[bool]:
+        """
+        分段运行搜索，每段之间向进度报告更新一次步数，搜索循环本身不调用进度报告
+
+        Args:
+            budget: 本次最多尝试放置的次数，None表示不限制
+
+        Returns:
+            找到解返回True，确定无解返回False，因预算用完而暂停返回None
+        """
+        progress = self.progress
+        if not self.reporting:
+            self.reporting = True
+            progress.start()
+
+        limit = None if budget is None else self.steps + budget
+        while True:
+            count = progress.interval if limit is None else min(progress.interval, limit - self.steps)
+            result = self.step(count)
+            progress.update(self.steps)
+            if result is not None:
+                self.reporting = False
+                progress.close()
+                return result
+            if limit is not None and self.steps >= limit:
+                return None
 
     def solve(self) -> bool:
         """
-        使用回溯算法求解数独
+        使用回溯算法求解数独，每次放置后运行约束传播
 
         Returns:
             如果找到解返回True，否则返回False
         """
-        # 找到第一个空格
-        empty_pos = self.board.find_empty_cell()
+        return bool(self.run())
+
+    def next_solution(self, budget: Optional[int] = None) -> Optional[bool]:
+        """
+        从当前搜索位置继续寻找下一个解；如果当前棋盘已经是一个解，则把它当作失败分支回溯后继续搜索
+
+        Args:
+            budget: 本次最多尝试放置的次数，None表示不限制
+
+        Returns:
+            如果找到新的解返回True，没有更多解返回False，因预算用完而暂停返回None
+        """
+        if self.result:
+            self.result = None
+            self.action = _BACKTRACK
+        return self.run(budget)
+
+    def iter_solutions(self) -> Iterator[Board]:
+        """
+        逐个生成解，每个解在找到时才计算，复用与solve相同的搜索
+
+        Yields:
+            每个解的棋盘副本
+        """
+        while self.next_solution():
+            yield self.board.copy()
+
+    def count_solutions(self, limit: Optional[int] = None) -> int:
+        """
+        统计解的个数，找到limit个解后立即停止
+
+        Args:
+            limit: 最多统计的解个数，None表示统计全部
+
+        Returns:
+            找到的解个数（不超过limit）
+        """
+        count = 0
+        while (limit is None or count < limit) and self.next_solution():
+            count += 1
+        return count
+
+    def is_unique(self) -> bool:
+        """
+        检查谜题是否恰好有一个解，找到第二个解后立即停止
+
+        Returns:
+            如果恰好有一个解返回True，否则返回False
+        """
+        return self.count_solutions(limit=2) == 1
 
-        # 如果没有空格，检查棋盘是否完全满足规则
-        if not empty_pos:
-            return self.is_valid()
+    def split(self) -> list[Board]:
+        """
+        把因预算用完而暂停的回溯搜索中尚未探索的部分拆分为互不相交的子问题
 
-        row, col = empty_pos
+        子问题按栈从顶到底的顺序生成：栈顶帧的剩余候选数，以及更低各帧除当前数字以外的候选数，
+        每个子问题是该帧所在位置的棋盘加上这个单元格的一个候选数。所有子问题的解恰好是本次搜索剩余的解，
+        调用后搜索状态回到根节点，本求解器不再继续搜索
 
-        # 尝试所有可能的数字
-        for digit in range(1, self.board.size + 1):
-            if self.try_set_digit(row, col, digit):
-                # 递归求解
-                if self.solve():
-                    return True
+        Returns:
+            子问题棋盘列表
 
-                # 如果当前数字导致无解，则回溯
-                self.board.remove_digit(row, col)
+        Raises:
+            ValueError: 如果不是回溯引擎，或搜索不处于暂停状态
+        """
+        if self.engine != "backtracking" or not self.started or self.result is not None or self.action != _TRY:
+            raise ValueError("只能拆分因预算用完而暂停的回溯搜索")
 
-        # 所有数字都尝试过，无解
-        return False
+        size = self.board.size
+        subproblems = []
+        # 暂停时栈顶帧尚未放置数字，其余帧的当前数字所在子树只探索了一部分
+        for index in range(len(self.stack) - 1, -1, -1):
+            cell, mark, digit = self.stack[index]
+            if index == len(self.stack) - 1:
+                remaining = self.state.candidates(cell)
+            else:
+                self.undo(mark)
+                remaining = self.state.candidates(cell) & ~(1 << digit)
+            while remaining:
+                bit = remaining & -remaining
+                remaining ^= bit
+                subproblem = self.board.copy()
+                subproblem.set_digit(cell // size, cell % size, bit.bit_length() - 1)
+                subproblems.append(subproblem)
+
+        self.stack.clear()
+        self.result = False
+        return subproblems
+
+    @staticmethod
+    def solve_many(puzzles, rules, workers: Optional[int] = None, chunksize: int = 64, ordered: bool = True,
+                   timeout: Optional[float] = None, **options):
+        """
+        使用进程池批量求解谜题，详见sudoku.batch.solve_many
+
+        Args:
+            puzzles: 谜题序列，每个元素为棋盘或表示初始局面的整数列表
+            rules: 所有谜题共用的规则
+            workers: 进程数，默认使用CPU核数
+            chunksize: 每批提交的谜题数量
+            ordered: 为True时按输入顺序返回结果，否则按完成顺序返回
+            timeout: 每个谜题的超时秒数，None表示不限制
+            **options: 传给Solver的其他参数
+
+        Returns:
+            BatchResult迭代器
+        """
+        # batch模块依赖Solver，在此处导入以避免循环导入
+        from .batch import solve_many
+        return solve_many(puzzles, rules, workers=workers, chunksize=chunksize, ordered=ordered, timeout=timeout,
+                          **options)
 
     def get_solution(self) -> Optional[Board]:
         """
@@ -119,12 +617,6 @@ class Solver:
         Returns:
             返回求解后的棋盘，如果无解则返回None
         """
-        self.pbar = tqdm(
-            desc="求解进度",
-            unit="步",
-            bar_format="{desc}: {n}步 - 速率: {rate_fmt} - 已用: {elapsed}",
-        )
-
         if self.solve():
             return self.board.copy()
 
@@ -0,0 +1,257 @@
+# src/sudoku/stats.py
+"""
+求解统计模块，记录每条规则的检查次数、耗时和拒绝次数，以及每层搜索深度的节点数和回溯数。
+"""
+
+import time
+from collections import Counter
+from typing import Callable
+
+
+class RuleStats:
+    """单条规则的统计"""
+
+    def __init__(self, name: str):
+        """
+        初始化规则统计
+
+        Args:
+            name: 规则名称
+        """
+        self.name = name
+        # 未编译规则的is_valid、is_valid_move和propagate的调用次数与累计耗时（秒）
+        self.calls = 0
+        self.time = 0.0
+        # 编译到约束图中的约束：(检查器的检查次数列表, 约束下标)
+        self.constraints: list[tuple[list[int], int]] = []
+        # 检查返回False、候选数掩码拒绝放置或传播发现矛盾的次数
+        self.rejections = 0
+        # 搜索深度 -> 拒绝次数
+        self.rejections_by_depth = Counter()
+        # propagate排除的候选数记录条数，对单元规则为放置数字时从同一单元的空格中去掉的候选数个数
+        self.eliminations = 0
+
+    @property
+    def checks(self) -> int:
+        """检查次数：直接调用次数加上编译后的约束在约束图中被检查的次数"""
+        return self.calls + sum(counts[index] for counts, index in self.constraints)
+
+    def __repr__(self) -> str:
+        return (f"RuleStats({self.name!r}, checks={self.checks}, time={self.time:.6f}, "
+                f"rejections={self.rejections}, eliminations={self.eliminations})")
+
+
+class SolverStats:
+    """
+    求解器统计
+
+    统计的是求解器实际使用的检查路径：编译后的约束由求解器的约束图检查器计数并记入添加它的规则，
+    候选数掩码拒绝的放置记入包含冲突数字的单元所属的规则，未编译的规则和传播钩子包装为带计数的版本。
+    约束图检查的耗时无法分到单条规则，单独记录在graph_time中。
+    未开启时求解器不创建本对象，搜索过程中没有任何额外开销。
+    只统计回溯引擎，DLX引擎不调用规则检查
+    """
+
+    def __init__(self):
+        """初始化空的统计"""
+        # 规则名称 -> 统计，同名规则依次加上#2、#3后缀
+        self.rules: dict[str, RuleStats] = {}
+        # 搜索深度 -> 尝试放置的次数
+        self.nodes_by_depth = Counter()
+        # 搜索深度 -> 回溯次数
+        self.backtracks_by_depth = Counter()
+        # 约束图逐步检查的累计耗时（秒）
+        self.graph_time = 0.0
+
+    @property
+    def nodes(self) -> int:
+        """尝试放置的总次数"""
+        return sum(self.nodes_by_depth.values())
+
+    @property
+    def backtracks(self) -> int:
+        """回溯总次数"""
+        return sum(self.backtracks_by_depth.values())
+
+    def attach(self, solver) -> None:
+        """
+        为求解器的检查函数、放置、尝试放置和回溯函数加上计数，求解器初始化时调用一次；
+        检查函数列表和检查顺序保持不变
+
+        Args:
+            solver: 要统计的求解器
+        """
+        stack = solver.stack
+        rule_stats = []
+        for rule in solver.rules:
+            name = rule.rule_name
+            suffix = 2
+            while name in self.rules:
+                name = f"{rule.rule_name}#{suffix}"
+                suffix += 1
+            self.rules[name] = RuleStats(name)
+            rule_stats.append(self.rules[name])
+
+        def depth() -> int:
+            return len(stack)
+
+        graph = solver.graph
+        checker = solver.checker
+        for index, owner in enumerate(graph.owners):
+            rule_stats[owner].constraints.append((checker.checks, index))
+
+        # 未编译的规则按原来的位置包装，约束图的整盘检查只在开始和结束时各调用一次，不包装
+        residual = [rule_stats[index] for index in graph.residual]
+        offset = len(solver.board_checks) - len(residual)
+        for position, stats in enumerate(residual, offset):
+            solver.board_checks[position] = self._timed(solver.board_checks[position], stats, depth)
+        offset = len(solver.move_checks) - len(residual)
+        for position, stats in enumerate(residual, offset):
+            solver.move_checks[position] = self._timed(solver.move_checks[position], stats, depth)
+        if offset:
+            solver.move_checks[0] = self._timed_graph(solver.move_checks[0], checker, graph.owners, rule_stats,
+                                                      depth)
+
+        if solver.propagator is not None:
+            trail = solver.state.trail
+            solver.propagator.hooks = [self._timed_propagate(hook, stats, depth, trail)
+                                       for hook, stats in zip(solver.propagator.hooks, rule_stats)]
+
+        state = solver.state
+        unit_stats = [rule_stats[owner] for owner in graph.unit_owners]
+        place_digit = solver.place_digit
+        try_set_digit = solver.try_set_digit
+        undo = solver.undo
+        nodes_by_depth = self.nodes_by_depth
+        backtracks_by_depth = self.backtracks_by_depth
+
+        def counted_place_digit(cell: int, digit: int) -> bool:
+            bit = 1 << digit
+            if not state.candidates(cell) & bit:
+                # 记入第一个已经使用该数字的单元；没有这样的单元时数字是被传播排除的，已在排除时统计
+                for index in state.cell_units[cell]:
+                    if state.unit_masks[index] & bit:
+                        unit_stats[index].rejections += 1
+                        unit_stats[index].rejections_by_depth[len(stack)] += 1
+                        break
+                return False
+
+            # 放置前统计每个单元中仍以该数字为候选数的空格，每个空格只记入第一个单元
+            removed = {}
+            for index in state.cell_units[cell]:
+                for other in state.units[index]:
+                    if other != cell and other not in removed and state.values[other] == 0 \
+                            and state.candidates(other) & bit:
+                        removed[other] = index
+            if not place_digit(cell, digit):
+                return False
+            for index in removed.values():
+                unit_stats[index].eliminations += 1
+            return True
+
+        def counted_try_set_digit(row: int, col: int, digit: int) -> bool:
+            nodes_by_depth[len(stack)] += 1
+            return try_set_digit(row, col, digit)
+
+        def counted_undo(mark: int) -> None:
+            # 搜索中只有回溯时调用undo
+            backtracks_by_depth[len(stack)] += 1
+            undo(mark)
+
+        solver.place_digit = counted_place_digit
+        solver.try_set_digit = counted_try_set_digit
+        solver.undo = counted_undo
+
+    def _timed_graph(self, check: Callable[..., bool], checker, owners: tuple[int, ...], rule_stats: list[RuleStats],
+                     depth: Callable[[], int]) -> Callable[..., bool]:
+        """
+        包装约束图检查器的is_valid_move，记录耗时，并把拒绝记入拒绝约束所属的规则
+
+        Args:
+            check: 检查器的is_valid_move
+            checker: 求解器的约束图检查器
+            owners: 约束下标 -> 规则下标
+            rule_stats: 规则下标 -> 规则统计
+            depth: 返回当前搜索深度的函数
+
+        Returns:
+            带计数的检查函数
+        """
+        def timed(*args) -> bool:
+            start = time.perf_counter()
+            result = check(*args)
+            self.graph_time += time.perf_counter() - start
+            if not result:
+                stats = rule_stats[owners[checker.rejected]]
+                stats.rejections += 1
+                stats.rejections_by_depth[depth()] += 1
+            return result
+
+        return timed
+
+    @staticmethod
+    def _timed(check: Callable[..., bool], stats: RuleStats, depth: Callable[[], int]) -> Callable[..., bool]:
+        """
+        包装规则检查函数，记录调用次数、耗时和拒绝次数
+
+        Args:
+            check: 规则的is_valid或is_valid_move
+            stats: 规则统计
+            depth: 返回当前搜索深度的函数
+
+        Returns:
+            带计数的检查函数
+        """
+        def timed(*args) -> bool:
+            start = time.perf_counter()
+            result = check(*args)
+            stats.time += time.perf_counter() - start
+            stats.calls += 1
+            if not result:
+                stats.rejections += 1
+                stats.rejections_by_depth[depth()] += 1
+            return result
+
+        return timed
+
+    @staticmethod
+    def _timed_propagate(propagate: Callable[..., bool], stats: RuleStats, depth: Callable[[], int],
+                         trail: list) -> Callable[..., bool]:
+        """
+        包装规则传播钩子，额外记录排除的候选数记录条数
+
+        Args:
+            propagate: 规则的propagate
+            stats: 规则统计
+            depth: 返回当前搜索深度的函数
+            trail: 求解器候选数状态的trail
+
+        Returns:
+            带计数的传播钩子
+        """
+        def timed(*args) -> bool:
+            mark = len(trail)
+            start = time.perf_counter()
+            result = propagate(*args)
+            stats.time += time.perf_counter() - start
+            stats.calls += 1
+            stats.eliminations += len(trail) - mark
+            if not result:
+                stats.rejections += 1
+                stats.rejections_by_depth[depth()] += 1
+            return result
+
+        return timed
+
+    def __str__(self) -> str:
+        """返回统计表格"""
+        # 表头中的汉字按两个字符宽度显示，列宽相应减少
+        lines = [f"{'规则':22s}{'检查次数':>8s}{'耗时(ms)':>12s}{'拒绝次数':>8s}{'排除次数':>8s}"]
+        for name, stats in self.rules.items():
+            lines.append(f"{name:24s}{stats.checks:>12d}{stats.time * 1000:>14.2f}"
+                         f"{stats.rejections:>12d}{stats.eliminations:>12d}")
+        lines.append(f"约束图检查耗时: {self.graph_time * 1000:.2f}ms")
+        lines.append(f"节点数: {self.nodes}  回溯数: {self.backtracks}")
+        for depth in sorted(self.nodes_by_depth.keys() | self.backtracks_by_depth.keys()):
+            lines.append(f"  深度{depth}: 节点{self.nodes_by_depth[depth]} 回溯{self.backtracks_by_depth[depth]}")
+        return "\n".join(lines)
@@ -0,0 +1,164 @@
+# src/sudoku/strategies.py
+"""
+分支策略模块，决定回溯求解时下一个尝试填写的空格。
+"""
+
+from abc import ABC, abstractmethod
+from typing import Optional
+from .candidates import CandidateState
+
+
+class BranchingStrategy(ABC):
+    """分支策略抽象基类"""
+
+    def attach(self, state: CandidateState) -> None:
+        """
+        绑定求解器的候选数状态，求解器初始化时调用一次
+
+        Args:
+            state: 求解器的候选数状态
+        """
+        self.state = state
+
+    @abstractmethod
+    def select_cell(self) -> Optional[int]:
+        """
+        选择下一个要填写的空格
+
+        Returns:
+            单元格下标（row * size + col），如果没有空格则返回None
+        """
+        pass
+
+    def on_place(self, cell: int) -> None:
+        """
+        单元格放置数字后调用（默认不做任何处理）
+
+        Args:
+            cell: 单元格下标
+        """
+        pass
+
+    def on_remove(self, cell: int) -> None:
+        """
+        单元格移除数字后调用（默认不做任何处理）
+
+        Args:
+            cell: 单元格下标
+        """
+        pass
+
+    def on_eliminate(self, cell: int) -> None:
+        """
+        单元格的候选数被排除或恢复后调用（默认不做任何处理）
+
+        Args:
+            cell: 单元格下标
+        """
+        pass
+
+
+class FirstEmptyStrategy(BranchingStrategy):
+    """按行优先顺序选择第一个空格"""
+
+    def select_cell(self) -> Optional[int]:
+        """
+        选择行优先顺序下的第一个空格
+
+        Returns:
+            单元格下标，如果没有空格则返回None
+        """
+        for cell, digit in enumerate(self.state.values):
+            if digit == 0:
+                return cell
+        return None
+
+
+class MRVStrategy(BranchingStrategy):
+    """
+    最少候选数优先（minimum remaining values）策略
+
+    按候选数个数把空格分桶，选择时取候选数最少的非空桶中的任意一个空格，不再按相关空格数排序，
+    因此选择只需要查看至多size+1个桶。放置或移除数字时只更新该单元格及其相关单元格所在的桶
+    """
+
+    def attach(self, state: CandidateState) -> None:
+        """
+        绑定候选数状态并建立分桶索引
+
+        Args:
+            state: 求解器的候选数状态
+        """
+        super().attach(state)
+        cell_count = state.size * state.size
+        self.buckets = [set() for _ in range(state.size + 1)]
+        self.counts = [-1] * cell_count
+
+        for cell in range(cell_count):
+            if state.values[cell] == 0:
+                self._refresh(cell)
+
+    def _refresh(self, cell: int) -> None:
+        """
+        重新计算空格的候选数个数并移动到对应的桶
+
+        Args:
+            cell: 单元格下标
+        """
+        count = bin(self.state.candidates(cell)).count("1")
+        old_count = self.counts[cell]
+        if count != old_count:
+            if old_count >= 0:
+                self.buckets[old_count].discard(cell)
+            self.buckets[count].add(cell)
+            self.counts[cell] = count
+
+    def select_cell(self) -> Optional[int]:
+        """
+        选择候选数最少的空格，候选数相同时任取一个
+
+        Returns:
+            单元格下标，如果没有空格则返回None
+        """
+        for bucket in self.buckets:
+            if bucket:
+                return next(iter(bucket))
+        return None
+
+    def on_place(self, cell: int) -> None:
+        """
+        把单元格移出分桶，并更新相关空格的候选数个数
+
+        Args:
+            cell: 单元格下标
+        """
+        self.buckets[self.counts[cell]].discard(cell)
+        self.counts[cell] = -1
+
+        values = self.state.values
+        for peer in self.state.peers[cell]:
+            if values[peer] == 0:
+                self._refresh(peer)
+
+    def on_remove(self, cell: int) -> None:
+        """
+        把单元格放回分桶，并更新相关空格的候选数个数
+
+        Args:
+            cell: 单元格下标
+        """
+        values = self.state.values
+        for peer in self.state.peers[cell]:
+            if values[peer] == 0:
+                self._refresh(peer)
+        self._refresh(cell)
+
+    def on_eliminate(self, cell: int) -> None:
+        """
+        更新空格所在的桶
+
+        Args:
+            cell: 单元格下标
+        """
+        if self.state.values[cell] == 0:
+            self._refresh(cell)
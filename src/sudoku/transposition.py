@@ -0,0 +1,204 @@
+# src/sudoku/transposition.py
+"""
+置换表模块，用增量维护的Zobrist哈希记录回溯搜索中已被证明无解的局面，经由其他路线再次到达时直接跳过。
+"""
+
+import random
+import sys
+from collections import OrderedDict
+from functools import lru_cache
+
+# 表中每个64位哈希整数对象占用的字节数
+_KEY_BYTES = sys.getsizeof(1 << 63)
+
+POLICIES = ("depth", "lru")
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(size: int) -> tuple[int, ...]:
+    """
+    获取Zobrist随机数表，固定随机种子使同一尺寸的哈希在不同进程中一致
+
+    Args:
+        size: 棋盘尺寸
+
+    Returns:
+        以cell * (size + 1) + digit为下标的64位随机数，digit为0的项为0
+    """
+    generator = random.Random(size)
+    keys = []
+    for _ in range(size * size):
+        keys.append(0)
+        keys.extend(generator.getrandbits(64) for _ in range(size))
+    return tuple(keys)
+
+
+class TranspositionTable:
+    """
+    无解局面置换表
+
+    局面由棋盘上已填的数字决定：所有约束只依赖已填数字，回溯中排除的候选数都是由更少的已填数字证明的结论，
+    因此一个局面下的子树全部搜索完且没有解时，任何路线到达相同的已填数字都可以直接回溯。
+    哈希是所有已填(单元格, 数字)的Zobrist随机数的异或，放置和撤销时增量更新，64位哈希的冲突忽略不计。
+
+    一次搜索中兄弟分支在分支单元格上的数字不同，不会重复到达同一局面；局面是否无解只取决于已填数字和规则，
+    与谜题的提示数无关，因此表在规则相同的多次搜索之间保留，例如先检查唯一解再求解、生成谜题时反复求解相近的局面。
+    附加到规则不同（或有规则没有cache_key）的求解器时清空。
+
+    一个表同时只能用于一个求解器，只用于回溯引擎；
+    找到第一个解之后，回溯时排除的数字可能来自有解的分支，此后只查询不再记录
+    """
+
+    def __init__(self, capacity: int = 1 << 16, policy: str = "depth"):
+        """
+        初始化置换表
+
+        Args:
+            capacity: 最多记录的局面个数
+            policy: 表满时的淘汰策略，"depth"淘汰最深（子树最小）的局面，"lru"淘汰最久未命中的局面
+
+        Raises:
+            ValueError: 如果淘汰策略未知
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"未知的淘汰策略: {policy}，可选: {', '.join(POLICIES)}")
+        self.capacity = capacity
+        self.policy = policy
+        # 哈希 -> 局面的搜索深度（已做出的选择次数）
+        self.entries = OrderedDict()
+        # depth策略：深度 -> {哈希: None}，按记录顺序
+        self.by_depth = {}
+
+        # 记录的局面所属的规则，由棋盘尺寸和规则的cache_key组成
+        self.rules_key = None
+
+        # 当前局面的哈希
+        self.key = 0
+        self.recording = True
+
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """返回记录的局面个数"""
+        return len(self.entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """查询命中率"""
+        return self.hits / self.probes if self.probes else 0.0
+
+    @property
+    def memory(self) -> int:
+        """表占用的内存字节数（容器与哈希整数对象，深度是缓存的小整数）"""
+        total = sys.getsizeof(self.entries) + len(self.entries) * _KEY_BYTES
+        if self.policy == "depth":
+            total += sys.getsizeof(self.by_depth) + sum(map(sys.getsizeof, self.by_depth.values()))
+        return total
+
+    def clear(self) -> None:
+        """清空表和统计"""
+        self.entries.clear()
+        self.by_depth.clear()
+        self.rules_key = None
+        self.probes = self.hits = self.stores = self.evictions = 0
+
+    def attach(self, solver) -> None:
+        """
+        规则与已记录的局面不同时清空表，由棋盘上已有的数字计算初始哈希，
+        并把求解器的放置和撤销函数替换为同时更新哈希的版本
+
+        Args:
+            solver: 回溯引擎的求解器
+        """
+        size = solver.board.size
+        rule_keys = [rule.cache_key() for rule in solver.rules]
+        rules_key = None if None in rule_keys else (size, repr(sorted(set(map(repr, rule_keys)))))
+        if rules_key is None or rules_key != self.rules_key:
+            self.entries.clear()
+            self.by_depth.clear()
+        self.rules_key = rules_key
+
+        keys = zobrist_keys(size)
+        stride = size + 1
+        values = solver.state.values
+        trail = solver.state.trail
+        self.key = 0
+        self.recording = True
+        for cell, digit in enumerate(values):
+            self.key ^= keys[cell * stride + digit]
+
+        place_digit = solver.place_digit
+        undo = solver.undo
+
+        def hashed_place_digit(cell: int, digit: int) -> bool:
+            if not place_digit(cell, digit):
+                return False
+            self.key ^= keys[cell * stride + digit]
+            return True
+
+        def hashed_undo(mark: int) -> None:
+            key = self.key
+            for cell, previous in trail[mark:]:
+                if previous < 0:
+                    key ^= keys[cell * stride + values[cell]]
+            self.key = key
+            undo(mark)
+
+        solver.place_digit = hashed_place_digit
+        solver.undo = hashed_undo
+
+    def probe(self) -> bool:
+        """
+        查询当前局面是否已被证明无解
+
+        Returns:
+            如果当前局面在表中返回True
+        """
+        self.probes += 1
+        if self.key not in self.entries:
+            return False
+        self.hits += 1
+        if self.policy == "lru":
+            self.entries.move_to_end(self.key)
+        return True
+
+    def store(self, depth: int) -> None:
+        """
+        记录当前局面无解，表满时按淘汰策略腾出位置
+
+        Args:
+            depth: 当前搜索深度
+        """
+        key = self.key
+        if not self.recording or key in self.entries:
+            return
+        if self.policy == "lru":
+            if len(self.entries) >= self.capacity:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        elif len(self.entries) >= self.capacity:
+            deepest = max(self.by_depth)
+            if depth >= deepest:
+                # 新局面不比表中任何局面更浅，不值得替换
+                return
+            bucket = self.by_depth[deepest]
+            evicted = next(iter(bucket))
+            del bucket[evicted]
+            if not bucket:
+                del self.by_depth[deepest]
+            del self.entries[evicted]
+            self.evictions += 1
+
+        self.entries[key] = depth
+        if self.policy == "depth":
+            self.by_depth.setdefault(depth, {})[key] = None
+        self.stores += 1
+
+    def __str__(self) -> str:
+        """返回统计摘要"""
+        return (f"置换表: {len(self.entries)}/{self.capacity}个局面 ({self.policy})  "
+                f"查询{self.probes}次 命中{self.hits}次 ({self.hit_rate:.1%})  "
+                f"记录{self.stores}次 淘汰{self.evictions}次  内存{self.memory / 1024:.1f}KiB")
@@ -0,0 +1,221 @@
+# src/sudoku/units.py
+"""
+单元表模块，预计算单元（一组数字不能重复的单元格）与单元格之间的索引，并按几何结构缓存供所有规则共享。
+"""
+
+from functools import lru_cache
+from math import isqrt
+from typing import Hashable, Optional, Sequence
+
+
+class UnitTable:
+    """
+    单元表
+
+    单元格用扁平下标（row * size + col）表示。单元表创建后不再修改，
+    相同几何结构的单元表由下面的缓存函数返回同一个实例，多个规则和求解器之间共享
+    """
+
+    def __init__(self, size: int, units: Sequence[Sequence[int]]):
+        """
+        根据单元列表构建单元表
+
+        Args:
+            size: 棋盘尺寸
+            units: 单元列表，每个单元是一组单元格下标
+        """
+        self.size = size
+        # 单元 -> 单元格下标
+        self.units = tuple(tuple(unit) for unit in units)
+        # 单元 -> 单元格坐标
+        self.coordinates = tuple(tuple(divmod(cell, size) for cell in unit) for unit in self.units)
+
+        cell_units = [[] for _ in range(size * size)]
+        peers = [set() for _ in range(size * size)]
+        for index, unit in enumerate(self.units):
+            for cell in unit:
+                cell_units[cell].append(index)
+                peers[cell].update(unit)
+        # 单元格 -> 所属单元下标
+        self.cell_units = tuple(tuple(indexes) for indexes in cell_units)
+        # 单元格 -> 与其至少共享一个单元的其他单元格
+        self.peers = tuple(tuple(sorted(cells - {cell})) for cell, cells in enumerate(peers))
+        # 单元格 -> 相关单元格的坐标
+        self.peer_coordinates = tuple(tuple(divmod(peer, size) for peer in cell_peers) for cell_peers in self.peers)
+
+        self._intersections = None
+        self._unit_intersections = None
+        self._peer_units = None
+
+    def __len__(self) -> int:
+        """返回单元个数"""
+        return len(self.units)
+
+    @property
+    def intersections(self) -> list[tuple[tuple[int, ...], tuple[int, ...], tuple[int, ...]]]:
+        """
+        完整单元（包含全部数字）两两之间至少包含2个单元格的交集，首次访问时计算
+
+        Returns:
+            (交集单元格, 单元A中交集以外的单元格, 单元B中交集以外的单元格)列表
+        """
+        if self._intersections is None:
+            complete = [index for index, unit in enumerate(self.units) if len(unit) == self.size]
+            self._intersections = []
+            unit_intersections = [[] for _ in self.units]
+            for position, a in enumerate(complete):
+                set_a = set(self.units[a])
+                for b in complete[position + 1:]:
+                    common = set_a.intersection(self.units[b])
+                    if len(common) >= 2:
+                        unit_intersections[a].append((len(self._intersections), b))
+                        unit_intersections[b].append((len(self._intersections), a))
+                        self._intersections.append((
+                            tuple(sorted(common)),
+                            tuple(cell for cell in self.units[a] if cell not in common),
+                            tuple(cell for cell in self.units[b] if cell not in common),
+                        ))
+            self._unit_intersections = tuple(tuple(indexes) for indexes in unit_intersections)
+        return self._intersections
+
+    @property
+    def unit_intersections(self) -> tuple[tuple[tuple[int, int], ...], ...]:
+        """
+        单元 -> 该单元参与的交集，不完整的单元没有交集
+
+        Returns:
+            每个单元的(交集在intersections中的下标, 交集另一侧的单元下标)列表
+        """
+        if self._unit_intersections is None:
+            self.intersections
+        return self._unit_intersections
+
+    @property
+    def peer_units(self) -> tuple[tuple[int, ...], ...]:
+        """
+        单元格 -> 单元格本身及其相关单元格所属的单元下标，即单元格放置数字后候选数可能变化的单元，首次访问时计算
+
+        Returns:
+            每个单元格的单元下标
+        """
+        if self._peer_units is None:
+            self._peer_units = tuple(
+                tuple(sorted({index for other in (cell, *cell_peers) for index in self.cell_units[other]}))
+                for cell, cell_peers in enumerate(self.peers)
+            )
+        return self._peer_units
+
+
+@lru_cache(maxsize=None)
+def row_table(size: int) -> UnitTable:
+    """
+    获取行单元表
+
+    Args:
+        size: 棋盘尺寸
+
+    Returns:
+        每一行是一个单元的单元表
+    """
+    return UnitTable(size, [[row * size + col for col in range(size)] for row in range(size)])
+
+
+@lru_cache(maxsize=None)
+def column_table(size: int) -> UnitTable:
+    """
+    获取列单元表
+
+    Args:
+        size: 棋盘尺寸
+
+    Returns:
+        每一列是一个单元的单元表
+    """
+    return UnitTable(size, [[row * size + col for row in range(size)] for col in range(size)])
+
+
+def block_shape(size: int, box_rows: Optional[int] = None, box_cols: Optional[int] = None) -> Optional[tuple[int, int]]:
+    """
+    确定宫的形状：未指定时使用边长为sqrt(size)的正方形宫
+
+    Args:
+        size: 棋盘尺寸
+        box_rows: 宫的行数
+        box_cols: 宫的列数
+
+    Returns:
+        (宫的行数, 宫的列数)，不能铺满棋盘时返回None
+    """
+    if box_rows is None and box_cols is None:
+        box_rows = box_cols = isqrt(size)
+    elif box_rows is None:
+        box_rows = size // box_cols
+    elif box_cols is None:
+        box_cols = size // box_rows
+    if box_rows <= 0 or box_cols <= 0 or box_rows * box_cols != size:
+        return None
+    return box_rows, box_cols
+
+
+@lru_cache(maxsize=None)
+def block_table(size: int, box_rows: int, box_cols: int) -> UnitTable:
+    """
+    获取宫单元表，宫按行优先顺序编号
+
+    Args:
+        size: 棋盘尺寸，必须等于box_rows * box_cols
+        box_rows: 宫的行数
+        box_cols: 宫的列数
+
+    Returns:
+        每一个宫是一个单元的单元表
+    """
+    units = []
+    for top in range(0, size, box_rows):
+        for left in range(0, size, box_cols):
+            units.append([(top + i) * size + left + j for i in range(box_rows) for j in range(box_cols)])
+    return UnitTable(size, units)
+
+
+@lru_cache(maxsize=None)
+def region_table(region_map: tuple[tuple[Hashable, ...], ...]) -> UnitTable:
+    """
+    获取不规则区域单元表，区域按在棋盘上首次出现的顺序编号
+
+    Args:
+        region_map: size×size的区域标记，相同标记的单元格属于同一区域
+
+    Returns:
+        每一个区域是一个单元的单元表
+    """
+    size = len(region_map)
+    regions = {}
+    for row, labels in enumerate(region_map):
+        for col, label in enumerate(labels):
+            regions.setdefault(label, []).append(row * size + col)
+    return UnitTable(size, list(regions.values()))
+
+
+@lru_cache(maxsize=64)
+def merge_tables(size: int, tables: tuple[UnitTable, ...]) -> UnitTable:
+    """
+    合并多个单元表，去掉重复的单元；相同的单元表组合返回同一个实例
+
+    Args:
+        size: 棋盘尺寸
+        tables: 尺寸为size的单元表
+
+    Returns:
+        合并后的单元表
+    """
+    if len(tables) == 1:
+        return tables[0]
+    seen = set()
+    units = []
+    for table in tables:
+        for unit in table.units:
+            key = frozenset(unit)
+            if key not in seen:
+                seen.add(key)
+                units.append(unit)
+    return UnitTable(size, units)
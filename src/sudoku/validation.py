@@ -0,0 +1,235 @@
+# src/sudoku/validation.py
+"""
+批量校验模块，使用NumPy向量化地检查大量已完成的棋盘是否满足规则。
+
+本模块依赖numpy，不会被sudoku包自动导入，需要时显式导入：
+    from sudoku.validation import validate_boards
+"""
+
+from typing import Callable, Iterable, NamedTuple
+import numpy as np
+from .board import Board
+from .rules import KillerRule, NonConsecutiveRule, Rule, ThermometerRule
+
+# 棋盘含有空格或超出1-size范围的数字时，first_failure中记录的值
+INCOMPLETE = -2
+
+# 每批向量化处理的棋盘数量，控制中间数组的内存占用
+_CHUNK_SIZE = 1 << 16
+
+
+class ValidationResult(NamedTuple):
+    """批量校验结果"""
+
+    # 每个棋盘是否满足所有规则
+    passed: np.ndarray
+    # 每个棋盘第一个不满足的规则在rules中的下标，全部满足为-1，棋盘不完整为INCOMPLETE
+    first_failure: np.ndarray
+
+
+def _unit_checker(units: list[list[tuple[int, int]]], size: int) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    构建单元规则（行、列、宫等）的向量化检查：每个单元排序后必须恰好为1到size
+
+    Args:
+        units: 单元列表
+        size: 棋盘尺寸
+
+    Returns:
+        检查函数，输入(N, size*size)数组，输出(N,)布尔数组
+    """
+    index = np.array([[row * size + col for row, col in unit] for unit in units], dtype=np.intp)
+    complete = len(index) == 0 or index.shape[1] == size
+    expected = np.arange(1, index.shape[1] + 1 if len(index) else 1)
+
+    def check(values: np.ndarray) -> np.ndarray:
+        if len(index) == 0:
+            return np.ones(len(values), dtype=bool)
+        grouped = np.sort(values[:, index], axis=2)
+        if complete:
+            return (grouped == expected).all(axis=(1, 2))
+        # 不完整的单元只要求数字互不相同
+        return (np.diff(grouped, axis=2) != 0).all(axis=(1, 2))
+
+    return check
+
+
+def _non_consecutive_checker(size: int) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    构建非连续规则的向量化检查：横向、纵向相邻单元格之差的绝对值不能为1
+
+    Args:
+        size: 棋盘尺寸
+
+    Returns:
+        检查函数
+    """
+    def check(values: np.ndarray) -> np.ndarray:
+        grid = values.reshape(-1, size, size)
+        horizontal = np.abs(np.diff(grid, axis=2)) != 1
+        vertical = np.abs(np.diff(grid, axis=1)) != 1
+        return horizontal.all(axis=(1, 2)) & vertical.all(axis=(1, 2))
+
+    return check
+
+
+def _thermometer_checker(rule: ThermometerRule, size: int) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    构建温度计规则的向量化检查：温度计上每对相邻单元格都必须严格递增
+
+    Args:
+        rule: 温度计规则
+        size: 棋盘尺寸
+
+    Returns:
+        检查函数
+    """
+    lower = []
+    upper = []
+    for thermometer in rule.thermometers:
+        cells = [row * size + col for row, col in thermometer]
+        lower.extend(cells[:-1])
+        upper.extend(cells[1:])
+    lower = np.array(lower, dtype=np.intp)
+    upper = np.array(upper, dtype=np.intp)
+
+    def check(values: np.ndarray) -> np.ndarray:
+        return (values[:, upper] > values[:, lower]).all(axis=1)
+
+    return check
+
+
+def _killer_checker(rule: KillerRule, size: int) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    构建杀手数独规则的向量化检查：笼子和值用reduceat分段求和，笼内不重复用单元格对比较
+
+    Args:
+        rule: 杀手数独规则
+        size: 棋盘尺寸
+
+    Returns:
+        检查函数
+    """
+    cells = []
+    starts = []
+    first = []
+    second = []
+    for cage in rule.cages:
+        starts.append(len(cells))
+        cage_cells = [row * size + col for row, col in cage]
+        cells.extend(cage_cells)
+        for i in range(len(cage_cells)):
+            for j in range(i + 1, len(cage_cells)):
+                first.append(cage_cells[i])
+                second.append(cage_cells[j])
+    cells = np.array(cells, dtype=np.intp)
+    starts = np.array(starts, dtype=np.intp)
+    sums = np.array(rule.cage_sums)
+    first = np.array(first, dtype=np.intp)
+    second = np.array(second, dtype=np.intp)
+
+    def check(values: np.ndarray) -> np.ndarray:
+        if len(cells) == 0:
+            return np.ones(len(values), dtype=bool)
+        cage_sums = np.add.reduceat(values[:, cells], starts, axis=1)
+        distinct = (values[:, first] != values[:, second]).all(axis=1)
+        return (cage_sums == sums).all(axis=1) & distinct
+
+    return check
+
+
+def _fallback_checker(rule: Rule, size: int) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    无法向量化的规则逐个棋盘调用is_valid
+
+    Args:
+        rule: 规则
+        size: 棋盘尺寸
+
+    Returns:
+        检查函数
+    """
+    def check(values: np.ndarray) -> np.ndarray:
+        result = np.empty(len(values), dtype=bool)
+        board = Board(size)
+        for i, row in enumerate(values.tolist()):
+            board.load_puzzle(row)
+            result[i] = rule.is_valid(board)
+        return result
+
+    return check
+
+
+def _build_checker(rule: Rule, size: int) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    为规则选择向量化检查函数
+
+    Args:
+        rule: 规则
+        size: 棋盘尺寸
+
+    Returns:
+        检查函数
+    """
+    if isinstance(rule, KillerRule):
+        return _killer_checker(rule, size)
+    if isinstance(rule, ThermometerRule):
+        return _thermometer_checker(rule, size)
+    if isinstance(rule, NonConsecutiveRule):
+        return _non_consecutive_checker(size)
+
+    units = rule.get_units(Board(size))
+    if units is not None:
+        return _unit_checker(units, size)
+    return _fallback_checker(rule, size)
+
+
+def validate_boards(boards, rules: Iterable[Rule]) -> ValidationResult:
+    """
+    批量校验已完成的棋盘
+
+    Args:
+        boards: 形状为(N, size, size)或(N, size*size)的整数数组（或可转换为数组的嵌套列表）
+        rules: 要检查的规则
+
+    Returns:
+        ValidationResult，包含每个棋盘是否通过以及第一个不满足的规则下标
+
+    Raises:
+        SudokuError: 如果棋盘尺寸与某条规则不兼容
+        ValueError: 如果数组形状不是(N, size, size)或(N, size*size)
+    """
+    rules = list(rules)
+    values = np.asarray(boards)
+    if values.ndim == 3 and values.shape[1] == values.shape[2]:
+        size = values.shape[1]
+    elif values.ndim == 2 and int(round(values.shape[1] ** 0.5)) ** 2 == values.shape[1]:
+        size = int(round(values.shape[1] ** 0.5))
+    else:
+        raise ValueError(f"棋盘数组形状应为(N, size, size)或(N, size*size)，实际为{values.shape}")
+
+    # 向量化检查直接用坐标索引数组，坐标越界的规则必须在构建检查函数之前报错
+    board = Board(size)
+    for rule in rules:
+        rule.validate_compatibility(board)
+
+    values = values.reshape(len(values), size * size).astype(np.int16, copy=False)
+    checkers = [_build_checker(rule, size) for rule in rules]
+
+    first_failure = np.full(len(values), -1, dtype=np.int64)
+    for start in range(0, len(values), _CHUNK_SIZE):
+        chunk = values[start:start + _CHUNK_SIZE]
+        failure = first_failure[start:start + _CHUNK_SIZE]
+
+        complete = ((chunk >= 1) & (chunk <= size)).all(axis=1)
+        failure[~complete] = INCOMPLETE
+
+        # 只对仍然通过的棋盘继续检查后面的规则
+        for index, checker in enumerate(checkers):
+            pending = np.flatnonzero(failure == -1)
+            if len(pending) == 0:
+                break
+            passed = checker(chunk[pending])
+            failure[pending[~passed]] = index
+
+    return ValidationResult(first_failure == -1, first_failure)
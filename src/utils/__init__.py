@@ -4,10 +4,15 @@
 """
 
 from .parser import *
+from .reader import *
 
 __all__ = [
     'parse_compact_puzzle',
     'parse_spaced_puzzle',
     'parse_compact_thermometer',
     'parse_spaced_thermometer',
+    'is_spaced_line',
+    'parse_puzzle_line',
+    'read_puzzle_lines',
+    'read_puzzle_file',
 ]
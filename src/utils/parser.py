@@ -3,18 +3,28 @@
 数独棋盘解析器模块
 """
 
+# 紧凑格式的字节翻译表：'0'-'9'映射为对应的数字，'.'映射为0（空格）
+COMPACT_DIGITS = b"0123456789."
+COMPACT_TABLE = bytes.maketrans(COMPACT_DIGITS, bytes(range(10)) + b"\x00")
+
 
 def parse_compact_puzzle(puzzle_str: str) -> list[int]:
     """
     将无空格分隔的紧凑字符串转换为整数列表
 
     Args:
-        puzzle_str: 无空格分隔的puzzle字符串，如"030007004..."
+        puzzle_str: 无空格分隔的puzzle字符串，如"030007004..."，空格可以用'0'或'.'表示
 
     Returns:
         整数列表，每个元素对应一个数字
+
+    Raises:
+        ValueError: 如果字符串包含数字和'.'以外的字符
     """
-    return [int(char) for char in puzzle_str]
+    data = puzzle_str.encode("ascii")
+    if data.translate(None, COMPACT_DIGITS):
+        raise ValueError(f"无法解析的紧凑格式puzzle字符串: {puzzle_str!r}")
+    return list(data.translate(COMPACT_TABLE))
 
 
 def parse_spaced_puzzle(puzzle_str: str) -> list[int]:
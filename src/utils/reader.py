@@ -0,0 +1,104 @@
+# src/utils/reader.py
+"""
+谜题文件读取模块，以内存映射方式流式读取每行一个谜题的文件
+"""
+
+import mmap
+from typing import Iterator, Optional
+from .parser import COMPACT_DIGITS, COMPACT_TABLE
+
+# 分隔格式中出现的分隔符
+_SEPARATORS = b" \t,"
+
+
+def is_spaced_line(line: bytes) -> bool:
+    """
+    判断一行谜题是否为分隔格式
+
+    Args:
+        line: 一行谜题的字节串
+
+    Returns:
+        含有空格、制表符或逗号时返回True，否则为紧凑格式返回False
+    """
+    return any(separator in line for separator in _SEPARATORS)
+
+
+def parse_puzzle_line(line: bytes, spaced: Optional[bool] = None) -> list[int]:
+    """
+    解析一行谜题数据
+
+    Args:
+        line: 一行谜题的字节串（不含换行符）
+        spaced: True为分隔格式，False为紧凑格式，None时根据是否含有分隔符自动判断
+
+    Returns:
+        整数列表，每个元素对应一个数字，0表示空格
+
+    Raises:
+        ValueError: 如果该行无法解析
+    """
+    if spaced is None:
+        spaced = is_spaced_line(line)
+
+    if not spaced:
+        # 紧凑格式：整行一次性翻译，不逐字符调用int()
+        if line.translate(None, COMPACT_DIGITS):
+            raise ValueError(f"无法解析的紧凑格式谜题: {line!r}")
+        return list(line.translate(COMPACT_TABLE))
+
+    # 分隔格式：适用于数字可能超过9的大尺寸棋盘，'.'同样表示空格
+    tokens = line.replace(b",", b" ").replace(b".", b"0").split()
+    return [int(token) for token in tokens]
+
+
+def read_puzzle_lines(path: str) -> Iterator[tuple[int, bytes]]:
+    """
+    以内存映射方式逐行读取谜题文件，不解析，内存占用与文件大小无关
+
+    空行和以'#'开头的注释行会被跳过
+
+    Args:
+        path: 谜题文件路径，每行一个谜题
+
+    Returns:
+        (行号, 去掉首尾空白的行)迭代器，行号从1开始
+    """
+    with open(path, "rb") as file:
+        # 空文件无法映射
+        if file.seek(0, 2) == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            position = 0
+            number = 0
+            end = len(mapped)
+            while position < end:
+                line_end = mapped.find(b"\n", position)
+                if line_end < 0:
+                    line_end = end
+                line = mapped[position:line_end].strip()
+                position = line_end + 1
+                number += 1
+
+                if line and not line.startswith(b"#"):
+                    yield number, line
+
+
+def read_puzzle_file(path: str, spaced: Optional[bool] = None) -> Iterator[list[int]]:
+    """
+    以内存映射方式逐行读取谜题文件，按需解析，内存占用与文件大小无关
+
+    空行和以'#'开头的注释行会被跳过
+
+    Args:
+        path: 谜题文件路径，每行一个谜题
+        spaced: True为分隔格式，False为紧凑格式，None时逐行自动判断
+
+    Returns:
+        谜题迭代器，每个谜题为整数列表
+
+    Raises:
+        ValueError: 如果某行无法解析
+    """
+    for _, line in read_puzzle_lines(path):
+        yield parse_puzzle_line(line, spaced)
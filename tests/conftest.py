@@ -0,0 +1,12 @@
+# tests/conftest.py
+"""
+测试配置：把src目录加入模块搜索路径。
+
+在仓库根目录运行：
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
@@ -0,0 +1,77 @@
+# tests/helpers.py
+"""
+测试辅助函数：构建棋盘和4×4变体规则，以及只依赖规则整盘检查is_valid的暴力计数器，作为各求解引擎的参照。
+"""
+
+from typing import Optional
+from sudoku import Board, KillerRule, Rule, ThermometerRule
+
+
+def make_board(puzzle: str) -> Board:
+    """
+    根据紧凑格式的谜题字符串创建棋盘
+
+    Args:
+        puzzle: 每格一个数字的字符串，0表示空格
+
+    Returns:
+        棋盘
+    """
+    size = int(len(puzzle) ** 0.5)
+    board = Board(size)
+    board.load_puzzle([int(character) for character in puzzle])
+    return board
+
+
+def thermometer_rule() -> ThermometerRule:
+    """4×4棋盘上的两个温度计"""
+    rule = ThermometerRule()
+    rule.set([(0, 0), (0, 1), (1, 1)])
+    rule.set([(3, 3), (2, 3), (2, 2)])
+    return rule
+
+
+def killer_rule() -> KillerRule:
+    """4×4棋盘上的几个笼子"""
+    rule = KillerRule()
+    rule.set(4, [(0, 0), (1, 0)])
+    rule.set(7, [(0, 2), (0, 3)])
+    rule.set(6, [(2, 1), (3, 1), (3, 2)])
+    return rule
+
+
+def brute_force_count(board: Board, rules: list[Rule], limit: Optional[int] = None) -> int:
+    """
+    逐格尝试所有数字，每次放置后调用所有规则的is_valid整盘检查，统计解的个数
+
+    不使用候选数状态、约束传播或规则编译，只用于小棋盘
+
+    Args:
+        board: 要求解的棋盘（不会被修改）
+        rules: 规则
+        limit: 最多统计的解个数，None表示统计全部
+
+    Returns:
+        解的个数（不超过limit）
+    """
+    board = board.copy()
+    size = board.size
+    if not all(rule.is_valid(board) for rule in rules):
+        return 0
+    empty = [cell for cell in range(size * size) if board.data[cell] == 0]
+
+    def search(index: int) -> int:
+        if index == len(empty):
+            return 1
+        row, col = divmod(empty[index], size)
+        count = 0
+        for digit in range(1, size + 1):
+            board.set_digit(row, col, digit)
+            if all(rule.is_valid(board) for rule in rules):
+                count += search(index + 1)
+                if limit is not None and count >= limit:
+                    break
+        board.remove_digit(row, col)
+        return count
+
+    return search(0)
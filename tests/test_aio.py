@@ -0,0 +1,114 @@
+# tests/test_aio.py
+"""
+异步求解测试：结果与同步求解相同，超时和步数上限返回放弃原因，相同的并发请求合并为一次求解，
+取消一个请求不影响其他请求。
+"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from sudoku import BlockRule, ColumnRule, FirstEmptyStrategy, RowRule, Solver, solve_async
+from sudoku.aio import MAX_STEPS, TIMEOUT
+from helpers import make_board
+
+HARD_9X9 = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+# 最后一格无论填什么都与同列的9冲突，按顺序搜索时需要穷举前面所有格子
+IMPOSSIBLE_LAST_CELL = "000000009" + "0" * 63 + "123456780"
+
+
+def rules() -> list:
+    """9×9标准数独规则"""
+    return [RowRule(), ColumnRule(), BlockRule()]
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """记录提交次数的线程池"""
+
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+def test_matches_sync_solve():
+    expected = Solver(make_board(HARD_9X9), *rules())
+    assert expected.solve()
+    result = asyncio.run(solve_async(make_board(HARD_9X9), *rules(), slice_steps=16))
+    assert result.gave_up is None
+    assert list(result.solution.data) == list(expected.board.data)
+    assert result.steps == expected.steps
+    assert result.elapsed >= 0
+
+
+def test_no_solution():
+    result = asyncio.run(solve_async(make_board("11" + "0" * 79), *rules()))
+    assert (result.solution, result.gave_up) == (None, None)
+
+
+def test_max_steps():
+    result = asyncio.run(solve_async(make_board(IMPOSSIBLE_LAST_CELL), *rules(), max_steps=100, slice_steps=32,
+                                     propagation=False, strategy=FirstEmptyStrategy()))
+    assert result.solution is None
+    assert result.gave_up == MAX_STEPS
+    assert result.steps == 100
+
+
+def test_timeout():
+    result = asyncio.run(solve_async(make_board(IMPOSSIBLE_LAST_CELL), *rules(), timeout=0.05,
+                                     propagation=False, strategy=FirstEmptyStrategy()))
+    assert result.solution is None
+    assert result.gave_up == TIMEOUT
+    assert result.elapsed >= 0.05
+
+
+def test_process_pool_limits():
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        result = asyncio.run(solve_async(make_board(IMPOSSIBLE_LAST_CELL), *rules(), max_steps=50,
+                                         executor=executor, propagation=False, strategy=FirstEmptyStrategy()))
+        assert result.gave_up == MAX_STEPS
+        solved = asyncio.run(solve_async(make_board(HARD_9X9), *rules(), executor=executor))
+        assert solved.gave_up is None and 0 not in solved.solution.data
+
+
+def test_concurrent_requests_coalesce():
+    async def run(count: int, executor: CountingExecutor) -> list:
+        return await asyncio.gather(*(solve_async(make_board(HARD_9X9), *rules(), executor=executor,
+                                                  slice_steps=16) for _ in range(count)))
+
+    with CountingExecutor() as single, CountingExecutor() as shared:
+        (expected,) = asyncio.run(run(1, single))
+        results = asyncio.run(run(3, shared))
+        assert shared.submitted == single.submitted
+
+    assert all(list(result.solution.data) == list(expected.solution.data) for result in results)
+    # 每个请求得到各自的棋盘副本
+    assert len({id(result.solution) for result in results}) == 3
+
+
+def test_different_executors_not_coalesced():
+    async def run(first: CountingExecutor, second: CountingExecutor) -> list:
+        return await asyncio.gather(solve_async(make_board(HARD_9X9), *rules(), executor=first),
+                                    solve_async(make_board(HARD_9X9), *rules(), executor=second))
+
+    with CountingExecutor() as first, CountingExecutor() as second:
+        results = asyncio.run(run(first, second))
+        assert first.submitted > 0 and second.submitted > 0
+    assert list(results[0].solution.data) == list(results[1].solution.data)
+
+
+def test_cancelling_one_request_keeps_others():
+    async def run():
+        board = make_board(HARD_9X9)
+        first = asyncio.ensure_future(solve_async(board, *rules(), slice_steps=4, propagation=False))
+        second = asyncio.ensure_future(solve_async(board, *rules(), slice_steps=4, propagation=False))
+        await asyncio.sleep(0)
+        first.cancel()
+        result = await second
+        assert first.cancelled()
+        return result
+
+    result = asyncio.run(run())
+    assert result.gave_up is None
+    assert 0 not in result.solution.data
@@ -0,0 +1,51 @@
+# tests/test_batch.py
+"""
+批量求解测试：进程池与顺序求解的结果相同，按输入顺序或完成顺序返回，超时的谜题被标记。
+"""
+
+import pytest
+from sudoku import BlockRule, ColumnRule, FirstEmptyStrategy, RowRule, Solver, solve_many
+from helpers import make_board
+
+PUZZLES = [
+    "1000" "0020" "0300" "0004",
+    "0" * 16,
+    "1100" "0000" "0000" "0000",
+    "0200" "0000" "0000" "4000",
+    "0000" "0000" "0000" "0001",
+]
+
+
+def rules() -> list:
+    """4×4标准数独规则"""
+    return [RowRule(), ColumnRule(), BlockRule(2, 2)]
+
+
+@pytest.mark.parametrize("workers, ordered", [(1, True), (2, True), (2, False)])
+def test_solve_many_matches_solver(workers, ordered):
+    # 输入可以是棋盘、整数列表或bytes
+    boards = [make_board(puzzle) for puzzle in PUZZLES]
+    inputs = [boards[0], list(boards[1].data), boards[2].to_bytes(), boards[3], list(boards[4].data)]
+    results = list(solve_many(inputs, rules(), workers=workers, chunksize=2, ordered=ordered))
+
+    assert sorted(result.index for result in results) == list(range(len(PUZZLES)))
+    if ordered:
+        assert [result.index for result in results] == list(range(len(PUZZLES)))
+    for result in results:
+        expected = Solver(boards[result.index], *rules()).get_solution()
+        assert not result.timed_out
+        if expected is None:
+            assert result.solution is None
+        else:
+            assert result.solution.data == expected.data
+
+
+def test_timeout_marks_unfinished_puzzles():
+    # 最后一格不可能填数，但按行优先顺序且关闭传播时要先搜索完前8行的所有填法才能发现
+    board = make_board("000000009" + "0" * 63 + "123456780")
+    rules = [RowRule(), ColumnRule(), BlockRule()]
+    options = {"strategy": FirstEmptyStrategy(), "propagation": False}
+    (result,) = solve_many([board], rules, workers=1, timeout=0.1, **options)
+    assert result.timed_out
+    assert result.solution is None
+    assert result.steps > 0
@@ -0,0 +1,82 @@
+# tests/test_benchmarks.py
+"""
+基准测试门禁测试：求解结果和步数退化判定失败，耗时与峰值内存默认只作为提示，基线中的步数可以复现。
+"""
+
+import importlib.util
+import json
+import os
+import pytest
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks")
+
+
+@pytest.fixture(scope="module")
+def bench():
+    """按文件路径导入benchmarks/run.py"""
+    spec = importlib.util.spec_from_file_location("benchmark_run", os.path.join(BENCHMARK_DIR, "run.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def result(solved: bool = True, steps: int = 100, wall_time: float = 0.01, peak_memory_kib: float = 50.0) -> dict:
+    """构造一条基准测试结果"""
+    return {
+        "solved": solved,
+        "steps": steps,
+        "wall_time": wall_time,
+        "steps_per_sec": steps / wall_time,
+        "peak_memory_kib": peak_memory_kib,
+    }
+
+
+def test_unchanged_results_pass(bench):
+    baseline = {"a/backtracking": result()}
+    assert bench.compare({"a/backtracking": result()}, baseline, 0.25, 0.25) == ([], [])
+
+
+def test_timing_growth_is_advisory(bench):
+    baseline = {"a/backtracking": result()}
+    results = {"a/backtracking": result(wall_time=0.05, peak_memory_kib=500.0)}
+    regressions, warnings = bench.compare(results, baseline, 0.25, 0.25)
+    assert regressions == []
+    assert len(warnings) == 2
+    assert any("wall_time" in warning for warning in warnings)
+    assert any("peak_memory_kib" in warning for warning in warnings)
+
+    regressions, warnings = bench.compare(results, baseline, 0.25, 0.25, strict_timing=True)
+    assert len(regressions) == 2
+    assert warnings == []
+
+
+def test_deterministic_metrics_are_gated(bench):
+    baseline = {"a/backtracking": result(), "b/dlx": result()}
+    results = {"a/backtracking": result(steps=200), "b/dlx": result(solved=False)}
+    regressions, warnings = bench.compare(results, baseline, 0.25, 0.25)
+    assert len(regressions) == 2
+    assert any("a/backtracking" in message and "steps" in message for message in regressions)
+    assert any("b/dlx" in message for message in regressions)
+    assert warnings == []
+
+    # 阈值以内的增长和没有基线的新谜题都不算退化
+    results = {"a/backtracking": result(steps=120), "c/dlx": result(steps=10 ** 6)}
+    assert bench.compare(results, baseline, 0.25, 0.25) == ([], [])
+
+
+def test_baseline_steps_reproduce(bench):
+    with open(os.path.join(BENCHMARK_DIR, "baseline.json"), encoding="utf-8") as file:
+        baseline = json.load(file)["results"]
+
+    results = {}
+    for benchmark in bench.BENCHMARKS:
+        if not benchmark.name.startswith("classic"):
+            continue
+        for config in bench.CONFIGS:
+            key = f"{benchmark.name}/{config}"
+            if key in baseline:
+                solver, solved, _ = bench.solve_once(benchmark, config)
+                results[key] = result(solved, solver.steps, 1.0, 0.0)
+    assert results
+    regressions, _ = bench.compare(results, baseline, 0.0, 1.0)
+    assert regressions == []
@@ -0,0 +1,76 @@
+# tests/test_board.py
+"""
+棋盘测试：扁平缓冲区的读写、复制与字节往返，cells只读，尺寸超过255时每格使用2字节。
+"""
+
+import pytest
+from sudoku import Board
+from helpers import make_board
+
+PUZZLE = "1000" "0020" "0300" "0004"
+
+
+def test_digit_access():
+    board = make_board(PUZZLE)
+    assert board.get_digit(1, 2) == 2
+    board.set_digit(0, 3, 4)
+    assert board.data[3] == 4
+    board.remove_digit(0, 0)
+    assert board.find_empty_cell() == (0, 0)
+    assert str(board).splitlines()[0] == ". . . 4"
+
+
+def test_cells_is_read_only_snapshot():
+    board = make_board(PUZZLE)
+    cells = board.cells
+    assert cells == ((1, 0, 0, 0), (0, 0, 2, 0), (0, 3, 0, 0), (0, 0, 0, 4))
+    with pytest.raises(TypeError):
+        cells[0][1] = 2
+    board.set_digit(0, 1, 2)
+    assert cells[0][1] == 0
+    assert board.cells[0][1] == 2
+
+
+def test_copy_is_independent():
+    board = make_board(PUZZLE)
+    copy = board.copy()
+    copy.set_digit(0, 1, 2)
+    assert board.get_digit(0, 1) == 0
+    assert list(copy.data) != list(board.data)
+
+
+def test_bytes_round_trip():
+    board = make_board(PUZZLE)
+    data = board.to_bytes()
+    assert len(data) == 16
+    restored = Board.from_bytes(data)
+    assert restored.size == 4
+    assert list(restored.data) == list(board.data)
+
+    loaded = Board(4)
+    loaded.load_puzzle(data)
+    assert list(loaded.data) == list(board.data)
+
+
+def test_view_is_read_only_and_shared():
+    board = make_board(PUZZLE)
+    view = board.view()
+    with pytest.raises(TypeError):
+        view[0] = 2
+    board.set_digit(0, 1, 2)
+    assert view[1] == 2
+
+
+def test_large_board_uses_two_bytes():
+    board = Board(256)
+    board.set_digit(255, 255, 256)
+    data = board.to_bytes()
+    assert len(data) == 2 * 256 * 256
+    assert Board.from_bytes(data, 256).get_digit(255, 255) == 256
+
+
+def test_length_mismatch_rejected():
+    with pytest.raises(ValueError):
+        make_board(PUZZLE).load_puzzle([0] * 15)
+    with pytest.raises(ValueError):
+        Board.from_bytes(bytes(15), 4)
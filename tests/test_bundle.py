@@ -0,0 +1,136 @@
+# tests/test_bundle.py
+"""
+捆绑包测试：谜题和规则往返后求解结果完全相同，每条规则一条记录并保持顺序，几何结构相同的谜题共享规则块，
+读取器按路径pickle，格式错误或不支持的规则报错。
+"""
+
+import pickle
+import struct
+import pytest
+from sudoku import (BlockRule, Board, BundleFile, ColumnRule, KillerRule, NonConsecutiveRule, RegionRule, Rule,
+                    RowRule, Solver, SudokuError, ThermometerRule, pack_bundles, write_bundles)
+from helpers import killer_rule, make_board, thermometer_rule
+
+HARD_9X9 = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+
+
+def bundles() -> list:
+    """不同尺寸和规则的谜题"""
+    return [
+        (make_board(HARD_9X9), [RowRule(), ColumnRule(), BlockRule()]),
+        (make_board("0" * 16), [RowRule(), ColumnRule(), BlockRule(2, 2), thermometer_rule(), killer_rule()]),
+        (make_board("0" * 15 + "3"), [RowRule(), ColumnRule(), BlockRule(2, 2), thermometer_rule(), killer_rule()]),
+        (make_board("100000" "004000" "000020" "030000" "000500" "000006"),
+         [RowRule(), ColumnRule(), BlockRule(3, 2), NonConsecutiveRule()]),
+    ]
+
+
+def assert_same_search(board: Board, rules, restored_board: Board, restored_rules) -> None:
+    """原谜题与往返后的谜题解的个数、第一个解和步数都相同"""
+    assert list(restored_board.data) == list(board.data)
+    expected = Solver(board, *rules)
+    actual = Solver(restored_board, *restored_rules)
+    assert actual.solve() == expected.solve()
+    assert list(actual.board.data) == list(expected.board.data)
+    assert actual.steps == expected.steps
+    assert Solver(restored_board, *restored_rules).count_solutions(limit=50) == \
+        Solver(board, *rules).count_solutions(limit=50)
+
+
+def test_round_trip_in_memory():
+    original = bundles()
+    reader = BundleFile(pack_bundles(original))
+    assert len(reader) == len(original)
+    for (board, rules), bundle in zip(original, reader):
+        assert [type(rule) for rule in bundle.rules] == [type(rule) for rule in rules]
+        assert_same_search(board, rules, bundle.board, bundle.rules)
+
+    # 几何结构相同的谜题共享规则块和规则对象
+    assert reader.rules_count == 3
+    assert reader[1].rules is reader[2].rules
+    assert reader[-1].board.size == 6
+    with pytest.raises(IndexError):
+        reader[len(original)]
+
+
+def test_round_trip_file(tmp_path):
+    path = str(tmp_path / "puzzles.sdkb")
+    assert write_bundles(path, bundles()) == 4
+    with BundleFile.open(path) as reader:
+        board, rules = reader[1]
+        killer = rules[-1]
+        assert killer.cages == killer_rule().cages
+        assert killer.cage_sums == killer_rule().cage_sums
+        assert rules[-2].thermometers == thermometer_rule().thermometers
+        # 读取时经由set()构建单元格索引
+        assert killer.cell_index == killer_rule().cell_index
+        assert rules[-2].cell_index == thermometer_rule().cell_index
+        original = bundles()[1]
+        assert_same_search(original[0], original[1], board, rules)
+
+
+def test_pickle_by_path(tmp_path):
+    path = str(tmp_path / "puzzles.sdkb")
+    write_bundles(path, bundles())
+    with BundleFile.open(path) as reader:
+        data = pickle.dumps(reader)
+        # 只保存路径，不包含文件内容
+        assert len(data) < 200
+    with pickle.loads(data) as restored:
+        assert restored.path == path
+        assert list(restored[0].board.data) == list(make_board(HARD_9X9).data)
+
+    with pytest.raises(TypeError):
+        pickle.dumps(BundleFile(pack_bundles(bundles())))
+
+
+def test_rule_instances_round_trip():
+    region = RegionRule(["AAAB", "CABB", "CCDB", "CDDD"])
+    first_killer = KillerRule()
+    first_killer.set(4, [(0, 0), (1, 0)])
+    second_killer = KillerRule()
+    second_killer.set(7, [(0, 2), (0, 3)])
+    first_thermometer = ThermometerRule()
+    first_thermometer.set([(0, 0), (0, 1), (1, 1)])
+    second_thermometer = ThermometerRule()
+    second_thermometer.set([(3, 3), (2, 3), (2, 2)])
+    rules = [first_killer, RowRule(), region, first_thermometer, ColumnRule(), second_killer, BlockRule(4, 1),
+             second_thermometer]
+    board = make_board("0" * 16)
+
+    (bundle,) = BundleFile(pack_bundles([(board, rules)]))
+    # 同类规则不合并，顺序不变
+    assert [type(rule) for rule in bundle.rules] == [type(rule) for rule in rules]
+    assert [rule.cages for rule in bundle.rules[::5]] == [first_killer.cages, second_killer.cages]
+    assert [rule.thermometers for rule in bundle.rules[3::4]] == \
+        [first_thermometer.thermometers, second_thermometer.thermometers]
+    # 区域标记按首次出现的顺序编号，区域划分不变
+    assert bundle.rules[2].region_map == ((0, 0, 0, 1), (2, 0, 1, 1), (2, 2, 3, 1), (2, 3, 3, 3))
+    assert bundle.rules[6].box_rows == 4 and bundle.rules[6].box_cols == 1
+    assert_same_search(board, rules, bundle.board, bundle.rules)
+
+
+def test_unsupported_rules():
+    class CustomRule(Rule):
+        def is_valid(self, board: Board) -> bool:
+            return True
+
+    with pytest.raises(SudokuError):
+        pack_bundles([(Board(4), [RowRule(), ColumnRule(), CustomRule()])])
+    with pytest.raises(SudokuError):
+        pack_bundles([(Board(6), [BlockRule()])])
+
+
+def test_malformed_files(tmp_path):
+    data = pack_bundles(bundles())
+    with pytest.raises(ValueError):
+        BundleFile(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        BundleFile(data[:4] + struct.pack("<H", 99) + data[6:])
+    with pytest.raises(ValueError):
+        BundleFile(data[:8])
+
+    empty = tmp_path / "empty.sdkb"
+    empty.write_bytes(b"")
+    with pytest.raises(ValueError):
+        BundleFile.open(str(empty))
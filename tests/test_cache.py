@@ -0,0 +1,134 @@
+# tests/test_cache.py
+"""
+解缓存测试：等价谜题命中同一个缓存项并还原为各自的解，变体规则精确匹配，LRU淘汰与sqlite持久化。
+"""
+
+import pytest
+from sudoku import Board, BlockRule, ColumnRule, Normal9x9BlockRule, RowRule, SolutionCache, Solver
+from helpers import killer_rule, make_board
+
+PUZZLE = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+
+
+def rules() -> list:
+    """9×9标准数独规则"""
+    return [RowRule(), ColumnRule(), Normal9x9BlockRule()]
+
+
+def relabel(puzzle: str) -> str:
+    """数字重新编号：d -> 10 - d"""
+    return "".join("0" if character == "0" else str(10 - int(character)) for character in puzzle)
+
+
+def transpose(puzzle: str) -> str:
+    """转置"""
+    return "".join(puzzle[col * 9 + row] for row in range(9) for col in range(9))
+
+
+def permute_rows(puzzle: str, order: list[int]) -> str:
+    """按order排列行"""
+    return "".join(puzzle[row * 9:row * 9 + 9] for row in order)
+
+
+def assert_solves(board, puzzle: str) -> None:
+    """检查board是puzzle的解"""
+    assert board is not None
+    assert all(character == "0" or board.data[cell] == int(character) for cell, character in enumerate(puzzle))
+    assert Solver(board, *rules()).is_valid()
+
+
+def test_equivalent_puzzles_share_entry():
+    cache = SolutionCache()
+    assert_solves(cache.solve(make_board(PUZZLE), *rules()), PUZZLE)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    # 交换两条带、交换带内的两行、转置、重新编号数字
+    bands = permute_rows(PUZZLE, [3, 4, 5, 0, 1, 2, 6, 7, 8])
+    equivalents = [
+        relabel(PUZZLE),
+        transpose(PUZZLE),
+        bands,
+        permute_rows(bands, [0, 1, 2, 3, 4, 5, 7, 6, 8]),
+        relabel(transpose(bands)),
+    ]
+    for puzzle in equivalents:
+        assert_solves(cache.solve(make_board(puzzle), *rules()), puzzle)
+    assert (cache.hits, cache.misses) == (len(equivalents), 1)
+    assert len(cache.entries) == 1
+
+
+def test_no_solution_is_cached():
+    cache = SolutionCache()
+    puzzle = "11" + "0" * 79
+    assert cache.solve(make_board(puzzle), *rules()) is None
+    assert cache.solve(make_board(relabel(puzzle)), *rules()) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_variant_rules_match_exactly():
+    cache = SolutionCache()
+    variant = [RowRule(), ColumnRule(), killer_rule()]
+    puzzle = "0" * 15 + "3"
+    expected = Solver(make_board(puzzle), *variant)
+    assert expected.solve()
+    assert list(cache.solve(make_board(puzzle), *variant).data) == list(expected.board.data)
+    # 重新编号不保持笼子的和，不能共享缓存项
+    assert cache.solve(make_board("0" * 15 + "4"), *variant) is None
+    assert list(cache.solve(make_board(puzzle), *variant).data) == list(expected.board.data)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_rule_without_cache_key_bypasses():
+    class Unkeyed(RowRule):
+        def cache_key(self):
+            return None
+
+    cache = SolutionCache()
+    assert_solves(cache.solve(make_board(PUZZLE), Unkeyed(), ColumnRule(), Normal9x9BlockRule()), PUZZLE)
+    assert (cache.hits, cache.misses, cache.bypassed) == (0, 0, 1)
+    assert not cache.entries
+
+
+def test_lru_eviction():
+    cache = SolutionCache(capacity=2)
+    puzzles = ["0" * 16, "0" * 15 + "1", "0" * 15 + "3"]
+    boards = [make_board(puzzle) for puzzle in puzzles]
+    variant = [RowRule(), ColumnRule(), killer_rule()]
+    for board in boards:
+        cache.solve(board, *variant)
+    assert len(cache.entries) == 2
+    # 最早的项已被淘汰
+    cache.solve(boards[0], *variant)
+    assert (cache.hits, cache.misses) == (0, 4)
+    cache.solve(boards[2], *variant)
+    assert cache.hits == 1
+
+
+def test_sqlite_persistence(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    with SolutionCache(path=path) as cache:
+        first = cache.solve(make_board(PUZZLE), *rules())
+
+    with SolutionCache(path=path) as cache:
+        assert cache.solve(make_board(transpose(PUZZLE)), *rules()) is not None
+        assert list(cache.solve(make_board(PUZZLE), *rules()).data) == list(first.data)
+        assert (cache.hits, cache.misses) == (2, 0)
+        cache.clear()
+
+    with SolutionCache(path=path) as cache:
+        cache.solve(make_board(PUZZLE), *rules())
+        assert (cache.hits, cache.misses) == (0, 1)
+
+
+@pytest.mark.parametrize("block", [False, True])
+def test_digits_above_255_round_trip(block):
+    # 尺寸超过255时每格编码为2字节
+    size = 256
+    board = Board(size)
+    board.load_puzzle([(row * 16 + row // 16 + col) % size + 1 for row in range(size) for col in range(size)])
+    cache_rules = [RowRule(), ColumnRule()] + ([BlockRule(16, 16)] if block else [])
+    key, transform = SolutionCache().make_key(board, cache_rules)
+    form = SolutionCache._to_form(board, transform)
+    assert len(form) == 2 * size * size
+    assert key.endswith(form)
+    assert list(SolutionCache._from_form(form, size, transform).data) == list(board.data)
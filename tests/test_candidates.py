@@ -0,0 +1,78 @@
+# tests/test_candidates.py
+"""
+候选数状态测试：位掩码与按单元逐格计算的结果一致，放置和移除精确还原。
+"""
+
+import random
+from sudoku import Board, CandidateState, ColumnRule, RowRule
+
+
+def units_of(board: Board) -> list[list[tuple[int, int]]]:
+    """4×4标准数独的所有单元"""
+    units = RowRule().get_units(board) + ColumnRule().get_units(board)
+    for top in (0, 2):
+        for left in (0, 2):
+            units.append([(top + row, left + col) for row in range(2) for col in range(2)])
+    return units
+
+
+def expected_candidates(board: Board, units: list[list[tuple[int, int]]], row: int, col: int) -> int:
+    """逐格扫描所属单元计算候选数掩码"""
+    used = 0
+    for unit in units:
+        if (row, col) in unit:
+            for r, c in unit:
+                used |= 1 << board.get_digit(r, c)
+    return ((1 << board.size) - 1) << 1 & ~used
+
+
+def test_candidates_follow_placements_and_removals():
+    board = Board(4)
+    board.set_digit(0, 0, 1)
+    units = units_of(board)
+    state = CandidateState(board, units)
+    assert state.candidates(1) == 0b11100
+
+    generator = random.Random(2)
+    placed = []
+    for _ in range(6):
+        empty = [cell for cell in range(16) if state.values[cell] == 0 and state.candidates(cell)]
+        cell = generator.choice(empty)
+        candidates = state.candidates(cell)
+        digit = generator.choice([d for d in range(1, 5) if candidates >> d & 1])
+        placed.append((cell, list(state.unit_masks)))
+        state.place(cell, digit)
+        board.set_digit(*divmod(cell, 4), digit)
+        for other in range(16):
+            if state.values[other] == 0:
+                assert state.candidates(other) == expected_candidates(board, units, *divmod(other, 4))
+
+    # 按相反顺序移除后单元掩码精确还原
+    for cell, masks in reversed(placed):
+        state.remove(cell)
+        assert state.unit_masks == masks
+
+
+def test_eliminate_records_previous_mask():
+    board = Board(4)
+    state = CandidateState(board, units_of(board))
+    assert state.eliminate(5, 1 << 2)
+    assert not state.candidates(5) & 1 << 2
+    # 已经排除的数字不再记录
+    assert not state.eliminate(5, 1 << 2)
+    assert state.trail == [(5, 0)]
+
+
+def test_queue_records_changed_cells_once_bound():
+    board = Board(4)
+    state = CandidateState(board, units_of(board))
+    state.place(0, 1)
+    state.eliminate(5, 1 << 2)
+    assert state.queue is None
+
+    state.queue = []
+    state.place(1, 2)
+    assert state.eliminate(6, 1 << 3)
+    # 没有改变候选数的排除不记录
+    assert not state.eliminate(6, 1 << 3)
+    assert state.queue == [1, 6]
@@ -0,0 +1,111 @@
+# tests/test_cli.py
+"""
+命令行测试：每个谜题输出一行JSON，不能解析或不兼容的行输出错误记录并以状态1退出，支持规则文件和只校验模式。
+"""
+
+import io
+import json
+import sys
+import pytest
+from sudoku.cli import main
+
+HARD_9X9 = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+
+
+def write_lines(tmp_path, name: str, lines: list[str]) -> str:
+    """把行写入临时文件并返回路径"""
+    path = tmp_path / name
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def records(text: str) -> list[dict]:
+    """解析每行一个JSON的输出"""
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_solve_all_valid(tmp_path, capsys):
+    path = write_lines(tmp_path, "puzzles.txt", ["# 注释", HARD_9X9, "", "11" + "0" * 79])
+    assert main(["solve", path]) == 0
+    first, second = records(capsys.readouterr().out)
+    assert (first["source"], first["line"], first["status"]) == (path, 2, "solved")
+    assert len(first["solution"]) == 81 and "0" not in first["solution"]
+    assert all(given in ("0", digit) for given, digit in zip(HARD_9X9, first["solution"]))
+    assert (second["line"], second["status"]) == (4, "unsolvable")
+    assert "solution" not in second
+
+
+def test_bad_lines_reported(tmp_path, capsys):
+    path = write_lines(tmp_path, "puzzles.txt", ["12345", HARD_9X9, "1" * 16, "9" + "0" * 15, "0" * 36])
+    assert main(["solve", "--jobs", "2", "--chunksize", "1", path]) == 1
+    output = records(capsys.readouterr().out)
+    errors = [record for record in output if record["status"] == "error"]
+    # 5格不是平方数，4×4谜题中的9超出范围，6×6谜题与默认的正方形宫不兼容；全是1的4×4谜题可以解析，只是无解
+    assert {record["line"] for record in errors} == {1, 4, 5}
+    assert all(record["error"] for record in errors)
+    statuses = {record["line"]: record["status"] for record in output}
+    assert statuses[2] == "solved"
+    assert statuses[3] == "unsolvable"
+    # 错误记录与求解结果一起按输入顺序输出
+    assert [record["line"] for record in output] == [1, 2, 3, 4, 5]
+
+
+def test_solution_uses_input_format(tmp_path, capsys):
+    spaced = " ".join(HARD_9X9)
+    big = " ".join(["0"] * 256)
+    path = write_lines(tmp_path, "puzzles.txt", [HARD_9X9, spaced, big])
+    assert main(["solve", path]) == 0
+    compact_record, spaced_record, big_record = records(capsys.readouterr().out)
+    assert len(compact_record["solution"]) == 81
+    assert spaced_record["solution"] == " ".join(compact_record["solution"])
+    # 紧凑格式无法表示大于9的数字
+    assert len(big_record["solution"].split()) == 256
+
+
+def test_rules_file_and_output(tmp_path):
+    rules = tmp_path / "rules.json"
+    rules.write_text(json.dumps({"block": [2, 2], "killer": [{"sum": 4, "cells": "A1B1"}, {"sum": 7, "cells": "A3A4"},
+                                                             {"sum": 6, "cells": "C2D2D3"}]}), encoding="utf-8")
+    path = write_lines(tmp_path, "puzzles.txt", ["0" * 16, "0" * 15 + "3"])
+    output = tmp_path / "results.jsonl"
+    assert main(["solve", "--rules", str(rules), "-o", str(output), "--engine", "cdcl", path]) == 0
+    first, second = records(output.read_text(encoding="utf-8"))
+    assert first["status"] == second["status"] == "solved"
+    assert second["solution"] == "1234341223414123"
+
+
+def test_validate_only(tmp_path, capsys):
+    path = write_lines(tmp_path, "puzzles.txt", [HARD_9X9, "11" + "0" * 79, "123"])
+    assert main(["solve", "--validate-only", path]) == 1
+    statuses = [record["status"] for record in records(capsys.readouterr().out)]
+    assert statuses == ["valid", "invalid", "error"]
+
+    path = write_lines(tmp_path, "valid.txt", [HARD_9X9])
+    assert main(["solve", "--validate-only", path]) == 0
+
+
+def test_stdin(monkeypatch, capsys):
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(HARD_9X9.encode() + b"\n")))
+    assert main(["solve"]) == 0
+    (record,) = records(capsys.readouterr().out)
+    assert (record["source"], record["status"]) == ("<stdin>", "solved")
+
+
+@pytest.mark.parametrize("argv", [
+    ["solve", "--jobs", "0"],
+    ["solve", "--timeout", "-1"],
+    ["solve", "--rules", "missing.json"],
+])
+def test_bad_arguments(argv, capsys):
+    with pytest.raises(SystemExit) as error:
+        main(argv)
+    assert error.value.code == 2
+    assert capsys.readouterr().err
+
+
+def test_bad_rules_file(tmp_path, capsys):
+    rules = tmp_path / "rules.json"
+    rules.write_text(json.dumps({"diagonal": True}), encoding="utf-8")
+    with pytest.raises(SystemExit):
+        main(["solve", "--rules", str(rules)])
+    assert "diagonal" in capsys.readouterr().err
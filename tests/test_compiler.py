@@ -0,0 +1,125 @@
+# tests/test_compiler.py
+"""
+规则编译测试：约束图按规则的几何结构缓存，重叠的约束被合并，约束记入添加它的规则，编译后的检查与规则的整盘检查一致，
+每个求解器使用各自的检查器，多个线程共享同一个约束图时结果不变。
+"""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+from sudoku import (BlockRule, Board, ColumnRule, KillerRule, NonConsecutiveRule, Rule, RowRule, Solver,
+                    ThermometerRule)
+from sudoku.compiler import compile_rules
+from helpers import brute_force_count, killer_rule, make_board, thermometer_rule
+
+
+def rules() -> list:
+    """4×4杀手与温度计数独规则"""
+    return [RowRule(), ColumnRule(), BlockRule(2, 2), killer_rule(), thermometer_rule()]
+
+
+def test_graph_cached_by_geometry():
+    board = Board(4)
+    graph = compile_rules(board, rules())
+    assert compile_rules(make_board("1" + "0" * 15), rules()) is graph
+    assert compile_rules(board, rules()[:4]) is not graph
+
+    class Unkeyed(RowRule):
+        def cache_key(self):
+            return None
+
+    assert compile_rules(board, [Unkeyed()]) is not compile_rules(board, [Unkeyed()])
+
+
+def test_overlapping_constraints_merged():
+    killer = KillerRule()
+    # 两个笼子分别在第0行和右下宫内，它们的全不同组被行、宫包含
+    killer.set(3, [(0, 0), (0, 1)])
+    killer.set(7, [(2, 2), (3, 3)])
+    thermometer = ThermometerRule()
+    thermometer.set([(1, 0), (1, 1), (1, 2), (1, 3)])
+    # 子序列不会增加约束
+    thermometer.set([(1, 1), (1, 3)])
+    graph = compile_rules(Board(4), [RowRule(), ColumnRule(), BlockRule(2, 2), killer, thermometer])
+
+    assert len(graph.table) == 12
+    assert len(graph.constraints) == 3
+    assert graph.residual == []
+    assert graph.move_rules == [3, 4]
+
+
+def test_owners_map_to_rules():
+    graph = compile_rules(Board(4), [RowRule(), ColumnRule(), BlockRule(2, 2), NonConsecutiveRule(),
+                                     killer_rule()])
+    assert len(graph.owners) == len(graph.constraints)
+    assert set(graph.owners) == {3, 4}
+    assert set(graph.unit_owners) == {0, 1, 2, 4}
+    # 每个单元都属于添加它的规则
+    for unit, owner in zip(graph.table.units, graph.unit_owners):
+        if owner == 0:
+            assert len({cell // 4 for cell in unit}) == 1
+        elif owner == 1:
+            assert len({cell % 4 for cell in unit}) == 1
+
+
+def test_residual_rules_kept():
+    class DiagonalRule(Rule):
+        def is_valid(self, board: Board) -> bool:
+            digits = [board.get_digit(i, i) for i in range(board.size) if board.get_digit(i, i)]
+            return len(digits) == len(set(digits))
+
+    graph = compile_rules(Board(4), [RowRule(), DiagonalRule(), ColumnRule()])
+    assert graph.residual == [1]
+    assert graph.move_rules == [1]
+
+
+def test_graph_is_valid_matches_rules():
+    rule_list = rules() + [NonConsecutiveRule()]
+    graph = compile_rules(Board(4), rule_list)
+    generator = random.Random(23)
+    for _ in range(500):
+        board = make_board("".join(str(generator.randint(0, 4)) for _ in range(16)))
+        assert graph.is_valid(board) == all(rule.is_valid(board) for rule in rule_list)
+
+
+def test_compiled_solver_matches_brute_force():
+    board = make_board("0" * 15 + "1")
+    assert Solver(board, *rules(), propagation=False).count_solutions() == brute_force_count(board, rules())
+
+
+def test_checkers_are_per_solver():
+    killer = KillerRule()
+    killer.set(3, [(0, 0), (0, 1)])
+    killer.set(7, [(2, 3), (3, 2)])
+    first = Solver(Board(4), RowRule(), ColumnRule(), BlockRule(2, 2), killer, propagation=False)
+    second = Solver(Board(4), RowRule(), ColumnRule(), BlockRule(2, 2), killer, propagation=False)
+    graph = first.graph
+    assert second.graph is graph
+    assert first.checker is not second.checker
+    assert first.checker.checks is not second.checker.checks
+
+    before = list(graph.checks)
+    assert first.solve()
+    assert sum(first.checker.checks) > 0
+    assert sum(second.checker.checks) == 0
+    # 搜索结束时把检查次数累加到约束图，之后的检查器按拒绝率排列顺序
+    assert [total - old for total, old in zip(graph.checks, before)] == first.checker.checks
+    third = graph.checker()
+    rates = [rejections / checks if checks else 0.0 for checks, rejections in zip(graph.checks, graph.rejections)]
+    for indexes in third.order:
+        assert [rates[index] for index in indexes] == sorted((rates[index] for index in indexes), reverse=True)
+
+    # 重复record不会重复累加
+    checks = list(graph.checks)
+    first.checker.record()
+    assert graph.checks == checks
+
+
+def test_threads_share_graph():
+    puzzles = ["0" * 16, "0" * 15 + "1", "0" * 15 + "3", "0" * 15 + "2"]
+    expected = [Solver(make_board(puzzle), *rules()).count_solutions() for puzzle in puzzles]
+
+    def count(puzzle: str) -> int:
+        return Solver(make_board(puzzle), *rules(), propagation=False).count_solutions()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(count, puzzles * 25)) == expected * 25
@@ -0,0 +1,81 @@
+# tests/test_engines.py
+"""
+求解引擎测试：每个引擎在4×4和6×6谜题上统计的解个数与暴力计数相同，找到的解满足所有规则；
+CDCL引擎在变体规则上找到的解与回溯搜索相同。
+"""
+
+import pytest
+from sudoku import BlockRule, Board, ColumnRule, NonConsecutiveRule, Rule, RowRule, Solver, SudokuError
+from helpers import brute_force_count, killer_rule, make_board, thermometer_rule
+
+ENGINES = ["backtracking", "dlx", "cdcl"]
+
+PUZZLES = [
+    ("0" * 16, (2, 2)),
+    ("1000" "0020" "0300" "0004", (2, 2)),
+    # 同一行出现两个1，无解
+    ("1100" "0000" "0000" "0000", (2, 2)),
+    ("100000" "004000" "000020" "030000" "000500" "000006", (2, 3)),
+    ("000100" "200000" "000003" "040000" "000050" "600000", (3, 2)),
+]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("puzzle, shape", PUZZLES)
+def test_solution_count_matches_brute_force(engine, puzzle, shape):
+    board = make_board(puzzle)
+    rules = [RowRule(), ColumnRule(), BlockRule(*shape)]
+    expected = brute_force_count(board, rules)
+
+    solver = Solver(board, *rules, engine=engine)
+    solutions = list(solver.iter_solutions())
+    assert len(solutions) == expected
+    # 解互不相同，保留给定数字，并满足所有规则
+    assert len({solution.to_bytes() for solution in solutions}) == expected
+    for solution in solutions:
+        assert all(given in (0, digit) for given, digit in zip(board.data, solution.data))
+        assert all(rule.is_valid(solution) for rule in rules)
+        assert 0 not in solution.data
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_count_limit_and_uniqueness(engine):
+    board = make_board("0" * 16)
+    rules = [RowRule(), ColumnRule(), BlockRule(2, 2)]
+    assert Solver(board, *rules, engine=engine).count_solutions(limit=5) == 5
+    assert not Solver(board, *rules, engine=engine).is_unique()
+
+
+@pytest.mark.parametrize("make_rules", [
+    lambda: [RowRule(), ColumnRule(), BlockRule(2, 2), killer_rule()],
+    lambda: [RowRule(), ColumnRule(), BlockRule(2, 2), thermometer_rule()],
+    lambda: [RowRule(), ColumnRule(), NonConsecutiveRule()],
+    lambda: [RowRule(), ColumnRule(), thermometer_rule(), killer_rule()],
+])
+def test_cdcl_variant_rules_match_backtracking(make_rules):
+    board = make_board("0" * 16)
+    expected = {solution.to_bytes() for solution in Solver(board, *make_rules()).iter_solutions()}
+    assert len(expected) == brute_force_count(board, make_rules())
+    found = [solution.to_bytes() for solution in Solver(board, *make_rules(), engine="cdcl").iter_solutions()]
+    assert len(found) == len(expected)
+    assert set(found) == expected
+
+
+def test_cdcl_rejects_rules_without_encoding():
+    class DiagonalRule(Rule):
+        def is_valid(self, board: Board) -> bool:
+            digits = [board.get_digit(i, i) for i in range(board.size) if board.get_digit(i, i)]
+            return len(digits) == len(set(digits))
+
+    with pytest.raises(SudokuError):
+        Solver(make_board("0" * 16), RowRule(), ColumnRule(), DiagonalRule(), engine="cdcl")
+
+
+def test_dlx_rejects_rules_without_units():
+    with pytest.raises(SudokuError):
+        Solver(make_board("0" * 16), RowRule(), ColumnRule(), NonConsecutiveRule(), engine="dlx")
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        Solver(make_board("0" * 16), RowRule(), engine="simplex")
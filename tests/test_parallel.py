@@ -0,0 +1,77 @@
+# tests/test_parallel.py
+"""
+并行搜索测试：拆分后的子问题互不相交，解的个数与顺序搜索相同，找到足够的解后停止，
+停止信号使正在运行的时间片提前结束。
+"""
+
+import threading
+import pytest
+from sudoku import (BlockRule, Board, ColumnRule, NonConsecutiveRule, RowRule, Solver, count_solutions_parallel,
+                    search_parallel, solve_parallel)
+from sudoku.parallel import _STOP_CHECK_STEPS, _explore
+from helpers import killer_rule, make_board
+
+
+def rules() -> list:
+    """4×4标准数独规则"""
+    return [RowRule(), ColumnRule(), BlockRule(2, 2)]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_count_matches_sequential(workers):
+    board = Board(4)
+    expected = Solver(board, *rules()).count_solutions()
+    # 很小的预算使搜索树被多次拆分
+    assert count_solutions_parallel(board, *rules(), workers=workers, budget=5) == expected
+
+
+def test_solutions_are_distinct_and_complete():
+    board = make_board("1000" + "0" * 12)
+    result = search_parallel(board, *rules(), limit=None, workers=2, budget=5)
+    expected = {bytes(solution.data) for solution in Solver(board, *rules()).iter_solutions()}
+    assert result.complete
+    assert result.count == len(expected)
+    assert {bytes(solution.data) for solution in result.solutions} == expected
+    assert result.steps > 0
+
+
+def test_variant_rules_are_sent_to_workers():
+    board = Board(4)
+    variant = rules() + [killer_rule()]
+    expected = Solver(board, *variant).count_solutions()
+    assert count_solutions_parallel(board, *variant, workers=2, budget=3) == expected
+
+
+def test_limit_stops_search():
+    board = Board(9)
+    full = [RowRule(), ColumnRule(), BlockRule()]
+    result = search_parallel(board, *full, limit=3, workers=2, budget=20)
+    assert result.count == 3
+    assert len(result.solutions) == 3
+    assert not result.complete
+
+    solution = solve_parallel(board, *full, workers=2, budget=20)
+    assert 0 not in solution.data
+    assert Solver(solution, *full).is_valid()
+
+
+def test_unsolvable():
+    board = make_board("11" + "0" * 14)
+    result = search_parallel(board, *rules(), limit=None, workers=2, budget=5)
+    assert (result.count, result.solutions, result.complete) == (0, [], True)
+    assert solve_parallel(board, *rules(), workers=2) is None
+
+
+def test_only_backtracking_engine():
+    with pytest.raises(ValueError):
+        search_parallel(Board(4), *rules(), workers=2, engine="dlx")
+
+
+def test_stop_signal_abandons_slice():
+    stop = threading.Event()
+    stop.set()
+    solver = Solver(Board(9), RowRule(), ColumnRule(), NonConsecutiveRule(), propagation=False)
+    outcome = _explore(solver, None, 10 ** 6, False, stop)
+    # 设置停止信号后在一个检查周期内放弃，不再拆分子问题
+    assert outcome.subproblems == []
+    assert outcome.steps <= _STOP_CHECK_STEPS
@@ -0,0 +1,96 @@
+# tests/test_progress.py
+"""
+进度报告测试：报告进度不改变搜索结果，回调按步数节流，start与close在一次搜索中各调用一次。
+"""
+
+import pytest
+from sudoku import CallbackReporter, ColumnRule, Normal9x9BlockRule, ProgressReporter, RowRule, Solver
+from helpers import make_board
+
+HARD_9X9 = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+
+
+def rules() -> list:
+    """9×9标准数独规则"""
+    return [RowRule(), ColumnRule(), Normal9x9BlockRule()]
+
+
+class RecordingReporter(ProgressReporter):
+    """记录所有调用的进度报告"""
+
+    interval = 7
+
+    def __init__(self):
+        self.calls = []
+
+    def start(self) -> None:
+        self.calls.append("start")
+
+    def update(self, steps: int) -> None:
+        self.calls.append(steps)
+
+    def close(self) -> None:
+        self.calls.append("close")
+
+
+def test_progress_does_not_change_result():
+    plain = Solver(make_board(HARD_9X9), *rules(), propagation=False)
+    assert plain.solve()
+
+    reporter = RecordingReporter()
+    reported = Solver(make_board(HARD_9X9), *rules(), propagation=False, progress=reporter)
+    assert reported.solve()
+    assert list(reported.board.data) == list(plain.board.data)
+    assert reported.steps == plain.steps
+
+    assert reporter.calls[0] == "start" and reporter.calls[-1] == "close"
+    updates = reporter.calls[1:-1]
+    assert "start" not in updates and "close" not in updates
+    assert updates[-1] == reported.steps
+    assert all(later - earlier <= reporter.interval for earlier, later in zip(updates, updates[1:]))
+
+
+def test_progress_across_budgets():
+    reporter = RecordingReporter()
+    solver = Solver(make_board(HARD_9X9), *rules(), propagation=False, progress=reporter)
+    while solver.run(50) is None:
+        pass
+    # 分多次运行仍然只开始和结束一次
+    assert reporter.calls.count("start") == 1
+    assert reporter.calls.count("close") == 1
+    assert reporter.calls[-2] == solver.steps
+
+
+def test_callback_reporter_throttles_by_steps():
+    reported = []
+    reporter = CallbackReporter(reported.append, every=100)
+    solver = Solver(make_board(HARD_9X9), *rules(), propagation=False, progress=reporter)
+    assert solver.solve()
+
+    assert reporter.interval == 100
+    assert reported == sorted(reported)
+    assert all(later - earlier >= 100 for earlier, later in zip(reported, reported[1:-1]))
+    # close补报最终步数
+    assert reported[-1] == solver.steps
+    assert len(reported) <= solver.steps // 100 + 1
+
+
+def test_callback_reporter_without_throttle():
+    reported = []
+    reporter = CallbackReporter(reported.append, interval=10)
+    reporter.start()
+    for steps in (10, 20, 30):
+        reporter.update(steps)
+    reporter.close()
+    assert reported == [10, 20, 30]
+
+
+def test_tqdm_reporter():
+    pytest.importorskip("tqdm")
+    from sudoku import TqdmReporter
+
+    reporter = TqdmReporter(interval=100)
+    solver = Solver(make_board(HARD_9X9), *rules(), propagation=False, progress=reporter)
+    assert solver.solve()
+    assert reporter.pbar is None
+    assert reporter.reported == solver.steps
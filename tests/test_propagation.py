@@ -0,0 +1,62 @@
+# tests/test_propagation.py
+"""
+约束传播测试：开启传播不改变谜题是否有解，并能直接推出唯一解的谜题。
+"""
+
+import pytest
+from sudoku import BlockRule, ColumnRule, NonConsecutiveRule, Normal9x9BlockRule, RowRule, Solver
+from sudoku.propagation import Propagator
+from helpers import brute_force_count, make_board
+
+
+def latin_4x4() -> list:
+    """4×4拉丁方规则"""
+    return [RowRule(), ColumnRule()]
+
+
+def non_consecutive_4x4() -> list:
+    """4×4非连续拉丁方规则"""
+    return [RowRule(), ColumnRule(), NonConsecutiveRule()]
+
+
+@pytest.mark.parametrize("make_rules", [latin_4x4, non_consecutive_4x4])
+@pytest.mark.parametrize("puzzle", ["0" * 16, "1000" "0000" "0030" "0000", "0200" "0000" "0000" "4000",
+                                    "1200" "0000" "0000" "0000"])
+def test_propagation_keeps_solvability(make_rules, puzzle):
+    board = make_board(puzzle)
+    rules = make_rules()
+    expected = brute_force_count(board, rules, limit=1)
+    for propagation in (True, False):
+        solution = Solver(board, *make_rules(), propagation=propagation).get_solution()
+        assert (solution is not None) == bool(expected)
+        if solution is not None:
+            assert all(rule.is_valid(solution) for rule in rules)
+            assert all(solution.get_digit(row, col) for row in range(4) for col in range(4))
+
+
+def test_propagation_solves_17_clue_without_branching():
+    # 唯余、摒除和区块推理即可解出这个17个提示数的谜题，不需要任何尝试
+    board = make_board("000000010400000000020000000000050407008000300001090000300400200050100000000806000")
+    solver = Solver(board, RowRule(), ColumnRule(), Normal9x9BlockRule())
+    solution = solver.get_solution()
+    assert solution is not None
+    assert solver.steps == 0
+    assert solver.is_valid()
+    assert all(solution.get_digit(row, col) for row in range(9) for col in range(9))
+
+
+@pytest.mark.parametrize("size, box", [(9, 3), (16, 4)])
+def test_queue_reaches_full_fixed_point(size, box):
+    # 每次放置后只检查受影响的部分，结果应与从头检查整个棋盘的传播器得到的不动点相同
+    solver = Solver(make_board("0" * size * size), RowRule(), ColumnRule(), BlockRule(box, box))
+    solver.start()
+    assert solver.result is None
+    trail = solver.state.trail
+    for cell in range(0, size * size, size + 3):
+        if solver.state.values[cell] == 0:
+            candidates = solver.state.candidates(cell)
+            digit = (candidates & -candidates).bit_length() - 1
+            assert solver.place_digit(cell, digit) and solver.propagate()
+            mark = len(trail)
+            assert Propagator(solver).run()
+            assert len(trail) == mark
@@ -0,0 +1,35 @@
+# tests/test_reader.py
+"""
+谜题文件读取测试：流式读取的结果与逐行解析相同，支持两种格式、注释、空行和空文件。
+"""
+
+import pytest
+from utils import is_spaced_line, parse_compact_puzzle, parse_puzzle_line, parse_spaced_puzzle, read_puzzle_file, \
+    read_puzzle_lines
+
+COMPACT = "530070000600195000098000060800060003400801006060000000000419005000080079000000000"
+
+
+def test_parse_puzzle_line_formats():
+    assert parse_puzzle_line(COMPACT.encode()) == parse_compact_puzzle(COMPACT)
+    assert parse_puzzle_line(COMPACT.replace("0", ".").encode()) == parse_compact_puzzle(COMPACT)
+    spaced = "16 0 . 3, 10 0"
+    assert parse_puzzle_line(spaced.encode()) == [16, 0, 0, 3, 10, 0]
+    assert parse_puzzle_line(b"1 2 0 4", spaced=True) == parse_spaced_puzzle("1 2 0 4")
+    with pytest.raises(ValueError):
+        parse_puzzle_line(b"12x4")
+
+
+def test_read_puzzle_file(tmp_path):
+    path = tmp_path / "puzzles.txt"
+    path.write_bytes(b"# comment\n" + COMPACT.encode() + b"\n\n  1 2 0 4  \r\n" + b"1" * 16)
+    assert list(read_puzzle_file(str(path))) == [parse_compact_puzzle(COMPACT), [1, 2, 0, 4], [1] * 16]
+    # 行号包括被跳过的注释行和空行
+    assert list(read_puzzle_lines(str(path))) == [(2, COMPACT.encode()), (4, b"1 2 0 4"), (5, b"1" * 16)]
+    assert [is_spaced_line(line) for _, line in read_puzzle_lines(str(path))] == [False, True, False]
+
+
+def test_read_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert list(read_puzzle_file(str(path))) == []
@@ -0,0 +1,144 @@
+# tests/test_rules.py
+"""
+规则测试：逐步检查is_valid_move与整盘检查is_valid一致，以及规则参数的输入格式。
+"""
+
+import random
+from itertools import combinations
+import pytest
+from sudoku import Board, CandidateState, ColumnRule, KillerRule, NonConsecutiveRule, RowRule, Solver, SudokuError, ThermometerRule
+from sudoku.rules import _cage_combinations
+from helpers import brute_force_count, killer_rule, make_board, thermometer_rule
+
+
+@pytest.mark.parametrize("make_rule", [RowRule, ColumnRule, NonConsecutiveRule, thermometer_rule, killer_rule])
+def test_is_valid_move_matches_full_check(make_rule):
+    # 在满足规则的随机局面上放置数字，逐步检查的结果必须与整盘检查相同
+    rule = make_rule()
+    generator = random.Random(1)
+    for _ in range(200):
+        board = Board(4)
+        cells = list(range(16))
+        generator.shuffle(cells)
+        for cell in cells[:generator.randrange(12)]:
+            row, col = divmod(cell, 4)
+            digit = generator.randint(1, 4)
+            board.set_digit(row, col, digit)
+            if not rule.is_valid(board):
+                board.remove_digit(row, col)
+
+        for cell in cells:
+            row, col = divmod(cell, 4)
+            if board.get_digit(row, col) != 0:
+                continue
+            for digit in range(1, 5):
+                board.set_digit(row, col, digit)
+                assert rule.is_valid_move(board, row, col, digit) == rule.is_valid(board)
+                board.remove_digit(row, col)
+
+
+@pytest.mark.parametrize("make_rules", [
+    lambda: [RowRule(), ColumnRule(), thermometer_rule()],
+    lambda: [RowRule(), ColumnRule(), killer_rule()],
+    lambda: [RowRule(), ColumnRule(), NonConsecutiveRule()],
+])
+def test_solution_satisfies_all_rules(make_rules):
+    rules = make_rules()
+    board = make_board("0" * 16)
+    solvable = brute_force_count(board, rules, limit=1) == 1
+    solution = Solver(board, *rules).get_solution()
+    assert (solution is not None) == solvable
+    if solution is not None:
+        assert solution.find_empty_cell() is None
+        assert all(rule.is_valid(solution) for rule in rules)
+
+
+def test_list_coordinates_are_accepted():
+    # 坐标为列表时与元组等价
+    thermometer = ThermometerRule()
+    thermometer.set([[0, 0], [0, 1], [1, 1]])
+    killer = KillerRule()
+    killer.set(3, [[0, 0], [1, 0]])
+    assert thermometer.thermometers == [[(0, 0), (0, 1), (1, 1)]]
+    assert killer.cages == [[(0, 0), (1, 0)]]
+
+    rules = [RowRule(), ColumnRule(), thermometer, killer]
+    board = make_board("0" * 16)
+    solver = Solver(board, *rules)
+    assert solver.solve()
+    assert all(rule.is_valid(solver.board) for rule in rules)
+    assert Solver(board, *rules).count_solutions() == brute_force_count(board, rules)
+
+
+@pytest.mark.parametrize("size", [4, 6, 9])
+def test_cage_combinations_match_enumeration(size):
+    for cage_size in range(1, 5):
+        for cage_sum in range(1, size * cage_size + 1):
+            expected = {sum(1 << digit for digit in digits)
+                        for digits in combinations(range(1, size + 1), cage_size) if sum(digits) == cage_sum}
+            assert set(_cage_combinations(size, cage_size, cage_sum)) == expected
+
+
+@pytest.mark.parametrize("propagation", [True, False])
+def test_killer_solution_is_valid(propagation):
+    board = make_board("0" * 16)
+    rules = [RowRule(), ColumnRule(), killer_rule()]
+    assert brute_force_count(board, rules, limit=1) == 1
+    solution = Solver(board, *rules, propagation=propagation).get_solution()
+    assert solution is not None
+    assert all(rule.is_valid(solution) for rule in rules)
+    assert all(solution.get_digit(row, col) for row in range(4) for col in range(4))
+
+
+def test_non_consecutive_propagation_uses_new_placements():
+    rule = NonConsecutiveRule()
+    board = make_board("2000" "0000" "0000" "0000")
+    state = CandidateState(board, [])
+    # placed为None时检查所有已填的单元格
+    assert rule.propagate(board, state)
+    assert [state.candidates(cell) & 0b1010 for cell in (1, 4)] == [0, 0]
+
+    # 否则只处理列出的单元格：(3, 3)的4不在placed中，不排除其相邻单元格的3
+    state.place(10, 1)
+    state.place(15, 4)
+    state.placed = [10]
+    assert rule.propagate(board, state)
+    assert [state.candidates(cell) & 0b100 for cell in (6, 9, 11, 14)] == [0, 0, 0, 0]
+    assert [state.candidates(cell) & 0b1000 for cell in (11, 14)] == [0b1000, 0b1000]
+
+
+def test_thermometer_static_bounds():
+    # 长度为4的温度计在4×4棋盘上只能是1、2、3、4
+    assert [ThermometerRule.static_bounds(4, 4, position) for position in range(4)] == [(1, 1), (2, 2), (3, 3), (4, 4)]
+    assert ThermometerRule.static_bounds(9, 3, 1) == (2, 8)
+
+
+def test_thermometer_propagation_narrows_candidates():
+    thermometer = ThermometerRule()
+    thermometer.set([(0, 0), (0, 1)])
+    thermometer.set([(1, 0), (1, 1), (1, 2)])
+    board = make_board("0" * 16)
+    solver = Solver(board, RowRule(), ColumnRule(), thermometer)
+    assert solver.propagate()
+    # 灯泡不能取最大值，末端不能取最小值
+    assert solver.state.candidates(0) == 0b01110
+    assert solver.state.candidates(1) == 0b11100
+    assert [solver.state.candidates(cell) for cell in (4, 5, 6)] == [0b00110, 0b01100, 0b11000]
+
+
+@pytest.mark.parametrize("propagation", [True, False])
+def test_thermometer_solution_is_valid(propagation):
+    board = make_board("0" * 16)
+    rules = [RowRule(), ColumnRule(), thermometer_rule()]
+    assert brute_force_count(board, rules, limit=1) == 1
+    solution = Solver(board, *rules, propagation=propagation).get_solution()
+    assert solution is not None
+    assert all(rule.is_valid(solution) for rule in rules)
+    assert all(solution.get_digit(row, col) for row in range(4) for col in range(4))
+
+
+def test_empty_cage_rejected():
+    killer = KillerRule()
+    with pytest.raises(SudokuError):
+        killer.set(0, [])
+    assert killer.cages == [] and killer.cell_index == {}
@@ -0,0 +1,70 @@
+# tests/test_solver.py
+"""
+求解器测试：显式栈搜索可以按预算暂停和继续，结果与一次性求解相同；解的计数与唯一性检查。
+"""
+
+import sys
+import pytest
+from sudoku import Board, ColumnRule, NonConsecutiveRule, Normal9x9BlockRule, RowRule, Solver
+from helpers import brute_force_count, killer_rule, make_board, thermometer_rule
+
+HARD_9X9 = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+
+
+@pytest.mark.parametrize("budget", [1, 7, 100])
+def test_budgeted_run_matches_solve(budget):
+    board = make_board(HARD_9X9)
+    reference = Solver(board, RowRule(), ColumnRule(), Normal9x9BlockRule())
+    assert reference.solve()
+
+    solver = Solver(board, RowRule(), ColumnRule(), Normal9x9BlockRule())
+    pauses = 0
+    while (result := solver.run(budget)) is None:
+        pauses += 1
+    assert result
+    assert pauses >= reference.steps // budget - 1
+    assert solver.steps == reference.steps
+    assert solver.board.data == reference.board.data
+
+
+def test_search_depth_is_not_limited_by_recursion():
+    # 空白的25×25拉丁方需要六百多层搜索，远超降低后的递归深度限制
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(200)
+    try:
+        solver = Solver(Board(25), RowRule(), ColumnRule(), propagation=False)
+        assert solver.solve()
+    finally:
+        sys.setrecursionlimit(limit)
+    assert solver.is_valid()
+    assert 0 not in solver.board.data
+
+
+@pytest.mark.parametrize("make_rules", [
+    lambda: [RowRule(), ColumnRule()],
+    lambda: [RowRule(), ColumnRule(), NonConsecutiveRule()],
+    lambda: [RowRule(), ColumnRule(), thermometer_rule(), killer_rule()],
+])
+def test_count_solutions_matches_brute_force(make_rules):
+    board = make_board("0" * 16)
+    expected = brute_force_count(board, make_rules())
+    assert Solver(board, *make_rules()).count_solutions() == expected
+    if expected > 1:
+        assert Solver(board, *make_rules()).count_solutions(limit=2) == 2
+
+
+def test_count_limit_stops_early():
+    board = Board(9)
+    full = Solver(board, RowRule(), ColumnRule(), Normal9x9BlockRule())
+    assert full.count_solutions(limit=3) == 3
+    single = Solver(board, RowRule(), ColumnRule(), Normal9x9BlockRule())
+    assert single.count_solutions(limit=1) == 1
+    assert single.steps < full.steps
+
+
+def test_is_unique():
+    assert Solver(make_board(HARD_9X9), RowRule(), ColumnRule(), Normal9x9BlockRule()).is_unique()
+    # 去掉一个提示数后不再唯一
+    assert not Solver(make_board("0" + HARD_9X9[1:]), RowRule(), ColumnRule(), Normal9x9BlockRule()).is_unique()
+    # 无解的谜题也不唯一
+    assert not Solver(make_board("11" + "0" * 14), RowRule(), ColumnRule()).is_unique()
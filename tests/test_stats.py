@@ -0,0 +1,83 @@
+# tests/test_stats.py
+"""
+求解统计测试：开启统计不改变搜索，候选数掩码的拒绝和约束图的拒绝记入所属的规则。
+"""
+
+import pytest
+from sudoku import BlockRule, ColumnRule, NonConsecutiveRule, RowRule, Solver
+from helpers import killer_rule, make_board, thermometer_rule
+
+HARD_9X9 = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+
+
+def classic() -> list:
+    """9×9标准数独规则"""
+    return [RowRule(), ColumnRule(), BlockRule()]
+
+
+def variant() -> list:
+    """4×4杀手与温度计数独规则"""
+    return [RowRule(), ColumnRule(), BlockRule(2, 2), killer_rule(), thermometer_rule()]
+
+
+@pytest.mark.parametrize("puzzle, make_rules", [(HARD_9X9, classic), ("0" * 16, variant)])
+@pytest.mark.parametrize("propagation", [True, False])
+def test_stats_do_not_change_search(puzzle, make_rules, propagation):
+    plain = Solver(make_board(puzzle), *make_rules(), propagation=propagation)
+    counted = Solver(make_board(puzzle), *make_rules(), propagation=propagation, stats=True)
+    assert plain.solve() == counted.solve()
+    assert list(counted.board.data) == list(plain.board.data)
+    assert counted.steps == plain.steps
+    assert counted.stats.nodes == counted.steps
+
+
+def test_unit_rules_credited_for_mask_rejections():
+    solver = Solver(make_board(HARD_9X9), *classic(), propagation=False, stats=True)
+    stats = solver.stats
+    assert list(stats.rules) == ["RowRule", "ColumnRule", "BlockRule"]
+    # (0, 0)是8：(0, 1)放8与行冲突，(1, 0)放8先与列冲突
+    assert not solver.place_digit(1, 8)
+    assert not solver.place_digit(9, 8)
+    assert [rule.rejections for rule in stats.rules.values()] == [1, 1, 0]
+
+    assert solver.solve()
+    for rule in stats.rules.values():
+        assert rule.eliminations > 0
+        assert sum(rule.rejections_by_depth.values()) == rule.rejections
+    assert stats.backtracks > 0
+
+
+def test_graph_rejections_credited_to_owner():
+    solver = Solver(make_board("0" * 16), *variant(), propagation=False, stats=True)
+    stats = solver.stats
+    killer = stats.rules["KillerRule"]
+    thermometer = stats.rules["ThermometerRule"]
+    assert killer.constraints and thermometer.constraints
+    # 笼子(0, 0)、(1, 0)的和为4：放1和2时行、列、宫都不冲突，只有笼子和值的约束拒绝
+    assert solver.place_digit(0, 1)
+    assert not solver.place_digit(4, 2)
+    assert (killer.rejections, thermometer.rejections) == (1, 0)
+    assert killer.rejections_by_depth[0] == 1
+
+    solver = Solver(make_board("0" * 16), *variant(), propagation=False, stats=True)
+    assert solver.solve()
+    stats = solver.stats
+    assert stats.rules["KillerRule"].checks > 0 and stats.rules["ThermometerRule"].checks > 0
+    # 约束图中每个约束只属于一条规则
+    assert sum(len(rule.constraints) for rule in stats.rules.values()) == len(solver.graph.owners)
+
+
+def test_residual_rule_calls_counted():
+    solver = Solver(make_board("0" * 81), *classic(), NonConsecutiveRule(), propagation=False, stats=True)
+    solver.run(200)
+    assert solver.stats.rules["NonConsecutiveRule"].checks > 0
+
+
+def test_duplicate_rule_names_and_report():
+    solver = Solver(make_board("0" * 16), RowRule(), ColumnRule(), BlockRule(2, 2), killer_rule(), killer_rule(),
+                    stats=True)
+    solver.solve()
+    assert "KillerRule#2" in solver.stats.rules
+    report = str(solver.stats)
+    assert "KillerRule#2" in report
+    assert f"节点数: {solver.stats.nodes}" in report
@@ -0,0 +1,46 @@
+# tests/test_strategies.py
+"""
+分支策略测试：MRV总是选择候选数最少的空格，且不同策略都能找到满足所有规则的解。
+"""
+
+import random
+import pytest
+from sudoku import ColumnRule, FirstEmptyStrategy, MRVStrategy, RowRule, Solver
+from helpers import brute_force_count, make_board
+
+PUZZLE_6X6 = "100000" "004000" "000020" "030000" "000500" "000006"
+
+
+def test_mrv_selects_fewest_candidates():
+    board = make_board("1000" "0020" "0300" "0004")
+    solver = Solver(board, RowRule(), ColumnRule())
+    state = solver.state
+    generator = random.Random(3)
+    for _ in range(5):
+        cell = solver.strategy.select_cell()
+        if cell is None:
+            break
+        counts = [bin(state.candidates(other)).count("1") for other in range(16) if state.values[other] == 0]
+        assert bin(state.candidates(cell)).count("1") == min(counts)
+        candidates = state.candidates(cell)
+        digits = [digit for digit in range(1, 5) if candidates >> digit & 1]
+        if not digits:
+            break
+        solver.try_set_digit(*divmod(cell, 4), generator.choice(digits))
+
+
+def test_first_empty_selects_row_major():
+    board = make_board("1200" "0000" "0000" "0000")
+    solver = Solver(board, RowRule(), ColumnRule(), strategy=FirstEmptyStrategy())
+    assert solver.strategy.select_cell() == 2
+
+
+@pytest.mark.parametrize("strategy", [FirstEmptyStrategy, MRVStrategy])
+def test_strategies_find_valid_solution(strategy):
+    board = make_board(PUZZLE_6X6)
+    rules = [RowRule(), ColumnRule()]
+    assert brute_force_count(board, rules, limit=1) == 1
+    solution = Solver(board, *rules, strategy=strategy()).get_solution()
+    assert solution is not None
+    assert all(solution.get_digit(row, col) for row in range(6) for col in range(6))
+    assert all(rule.is_valid(solution) for rule in rules)
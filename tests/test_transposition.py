@@ -0,0 +1,95 @@
+# tests/test_transposition.py
+"""
+置换表测试：使用置换表不改变找到的解，无解局面在规则相同的搜索之间复用，规则不同时清空，表满时按策略淘汰。
+"""
+
+import pytest
+from sudoku import BlockRule, Board, ColumnRule, FirstEmptyStrategy, RowRule, Solver, TranspositionTable
+from helpers import killer_rule, make_board, thermometer_rule
+
+# 6×6（2×3宫）无解谜题，不使用约束传播时需要上千次尝试才能证明
+UNSOLVABLE_6X6 = "600005000003006000000000050000040600"
+
+
+def rules() -> list:
+    """6×6标准数独规则"""
+    return [RowRule(), ColumnRule(), BlockRule(2, 3)]
+
+
+def search(table: TranspositionTable, puzzle: str = UNSOLVABLE_6X6) -> Solver:
+    """使用置换表、按顺序选择空格、不使用约束传播搜索谜题"""
+    solver = Solver(make_board(puzzle), *rules(), propagation=False, strategy=FirstEmptyStrategy(),
+                    transposition=table)
+    solver.solve()
+    return solver
+
+
+@pytest.mark.parametrize("make_rules", [
+    lambda: [RowRule(), ColumnRule(), BlockRule(2, 2)],
+    lambda: [RowRule(), ColumnRule(), BlockRule(2, 2), killer_rule(), thermometer_rule()],
+])
+@pytest.mark.parametrize("propagation", [True, False])
+def test_same_solutions(make_rules, propagation):
+    board = Board(4)
+    expected = [solution.to_bytes() for solution in Solver(board, *make_rules(), propagation=propagation)
+                .iter_solutions()]
+    table = TranspositionTable()
+    found = [solution.to_bytes() for solution in Solver(board, *make_rules(), propagation=propagation,
+                                                        transposition=table).iter_solutions()]
+    assert found == expected
+
+
+def test_table_reused_between_searches():
+    table = TranspositionTable()
+    first = search(table)
+    assert first.result is False
+    assert len(table) > 0 and table.hits == 0
+
+    second = search(table)
+    assert second.result is False
+    assert table.hits > 0
+    assert second.steps < first.steps / 100
+    assert 0 < table.hit_rate <= 1
+
+
+def test_table_cleared_for_different_rules():
+    table = TranspositionTable()
+    search(table)
+    assert len(table) > 0
+    Solver(Board(4), RowRule(), ColumnRule(), BlockRule(2, 2), transposition=table)
+    assert len(table) == 0
+
+
+def test_solution_stops_recording():
+    table = TranspositionTable()
+    solver = Solver(make_board("1" + "0" * 35), *rules(), propagation=False, strategy=FirstEmptyStrategy(),
+                    transposition=table)
+    assert solver.solve()
+    assert not table.recording
+    stored = len(table)
+    assert solver.next_solution()
+    assert len(table) == stored
+
+
+@pytest.mark.parametrize("policy", ["depth", "lru"])
+def test_capacity_and_eviction(policy):
+    table = TranspositionTable(capacity=50, policy=policy)
+    assert search(table).result is False
+    assert len(table) == 50
+    assert table.stores - table.evictions == 50
+    if policy == "depth":
+        # 不比表中局面更浅的新局面不记录
+        unlimited = TranspositionTable()
+        search(unlimited)
+        assert table.stores < unlimited.stores
+        assert sum(len(bucket) for bucket in table.by_depth.values()) == len(table)
+    assert table.memory > 0
+    assert "置换表" in str(table)
+
+    table.clear()
+    assert (len(table), table.probes, table.hits, table.stores, table.evictions) == (0, 0, 0, 0, 0)
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        TranspositionTable(policy="random")
@@ -0,0 +1,66 @@
+# tests/test_units.py
+"""
+宫与区域规则测试：2×3、3×2矩形宫和不规则区域的解个数与暴力计数一致，形状不兼容时报错。
+"""
+
+import pytest
+from sudoku import BlockRule, Board, ColumnRule, RegionRule, RowRule, Solver, SudokuError
+from sudoku.units import block_shape
+from helpers import brute_force_count, make_board
+
+JIGSAW = [
+    "AAAB",
+    "CABB",
+    "CCDB",
+    "CDDD",
+]
+
+
+@pytest.mark.parametrize("shape, puzzle", [
+    ((2, 3), "100400400100200500600300500200300600"),
+    ((3, 2), "100400300600500200200300400500600100"),
+])
+def test_rectangular_blocks_match_brute_force(shape, puzzle):
+    rules = [RowRule(), ColumnRule(), BlockRule(*shape)]
+    expected = brute_force_count(make_board(puzzle), rules)
+    assert expected > 1
+    assert Solver(make_board(puzzle), *rules).count_solutions() == expected
+
+
+def test_block_shapes_are_distinct():
+    # 同一盘面在2×3宫下合法，在3×2宫下违反宫规则
+    grid = "123456465123231564654312546231312645"
+    assert BlockRule(2, 3).is_valid(make_board(grid))
+    assert not BlockRule(3, 2).is_valid(make_board(grid))
+
+
+def test_region_rule_matches_brute_force():
+    rules = [RowRule(), ColumnRule(), RegionRule(JIGSAW)]
+    board = Board(4)
+    expected = brute_force_count(board, rules)
+    assert expected > 0
+    assert Solver(board, *rules).count_solutions() == expected
+    for solution in Solver(board, *rules).iter_solutions():
+        assert rules[2].is_valid(solution)
+
+
+def test_block_shape_inference():
+    assert block_shape(9) == (3, 3)
+    # 未指定形状时只能使用正方形宫
+    assert block_shape(6) is None
+    assert block_shape(6, 2) == (2, 3)
+    assert block_shape(6, box_cols=2) == (3, 2)
+    assert block_shape(12, 4) == (4, 3)
+    assert block_shape(6, 4) is None
+
+
+@pytest.mark.parametrize("size, rule", [
+    (6, BlockRule()),
+    (6, BlockRule(2, 2)),
+    (6, RegionRule(JIGSAW)),
+    # 区域A有5个单元格，区域D只有3个
+    (4, RegionRule(["AAAB", "CABB", "CCDB", "CDDA"])),
+])
+def test_incompatible_shapes_rejected(size, rule):
+    with pytest.raises(SudokuError):
+        Solver(Board(size), RowRule(), ColumnRule(), rule)
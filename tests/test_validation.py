@@ -0,0 +1,81 @@
+# tests/test_validation.py
+"""
+批量校验测试：向量化检查的结果与逐个调用is_valid相同，坐标越界的规则报错，核心包不依赖numpy。
+"""
+
+import os
+import random
+import subprocess
+import sys
+from itertools import permutations, product
+import pytest
+from sudoku import Board, ColumnRule, KillerRule, NonConsecutiveRule, Rule, RowRule, SudokuError, ThermometerRule
+from helpers import killer_rule, thermometer_rule
+
+np = pytest.importorskip("numpy")
+from sudoku.validation import INCOMPLETE, validate_boards
+
+
+class DiagonalRule(Rule):
+    """主对角线上的数字不能重复；没有向量化实现，走逐个检查的回退路径"""
+
+    def is_valid(self, board: Board) -> bool:
+        digits = [board.get_digit(i, i) for i in range(board.size) if board.get_digit(i, i)]
+        return len(digits) == len(set(digits))
+
+
+def latin_squares_4x4() -> list[list[int]]:
+    """所有4×4拉丁方"""
+    rows = list(permutations(range(1, 5)))
+    squares = []
+    for square in product(rows, repeat=4):
+        if all(len(set(column)) == 4 for column in zip(*square)):
+            squares.append([digit for row in square for digit in row])
+    return squares
+
+
+def test_validate_boards_matches_is_valid():
+    rules = [RowRule(), ColumnRule(), NonConsecutiveRule(), thermometer_rule(), killer_rule(), DiagonalRule()]
+    boards = latin_squares_4x4()
+    generator = random.Random(4)
+    boards += [[generator.randint(1, 4) for _ in range(16)] for _ in range(500)]
+    boards.append([0] * 16)
+
+    result = validate_boards(boards, rules)
+    for values, passed, failure in zip(boards, result.passed, result.first_failure):
+        board = Board(4)
+        board.load_puzzle(values)
+        if 0 in values:
+            assert failure == INCOMPLETE
+            continue
+        expected = next((index for index, rule in enumerate(rules) if not rule.is_valid(board)), -1)
+        assert failure == expected
+        assert passed == (expected == -1)
+
+
+def test_validate_boards_accepts_square_arrays():
+    boards = np.array([[[1, 2, 3, 4], [3, 4, 1, 2], [2, 1, 4, 3], [4, 3, 2, 1]]])
+    assert validate_boards(boards, [RowRule(), ColumnRule()]).passed.tolist() == [True]
+    with pytest.raises(ValueError):
+        validate_boards(np.zeros((2, 15)), [RowRule()])
+
+
+def test_core_package_does_not_import_numpy():
+    # 在新的解释器中使用核心功能，numpy只应在导入sudoku.validation时加载
+    code = ("import sys; from sudoku import Board, RowRule, Solver, SolutionCache, pack_bundles; "
+            "from sudoku import cli; Solver(Board(4), RowRule()).solve(); "
+            "assert 'numpy' not in sys.modules")
+    source = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=source)
+
+
+@pytest.mark.parametrize("cell", [(4, 0), (0, -1)])
+def test_out_of_board_coordinates_rejected(cell):
+    killer = KillerRule()
+    killer.set(5, [(0, 0), cell])
+    thermometer = ThermometerRule()
+    thermometer.set([(0, 0), cell])
+    boards = [[1, 2, 3, 4, 3, 4, 1, 2, 2, 1, 4, 3, 4, 3, 2, 1]]
+    for rule in (killer, thermometer):
+        with pytest.raises(SudokuError):
+            validate_boards(boards, [RowRule(), rule])